@@ -0,0 +1,57 @@
+"""
+Benchmark do modo concorrente de scrape_vagas contra o servidor stub.
+
+Roda o mesmo conjunto de palavras-chave no modo serial e no modo
+concorrente, confere se os contadores batem e mostra o ganho de tempo.
+
+Uso: python benchmarks/bench_concurrency.py --latency 0.05 --concurrency 8
+"""
+import argparse
+import contextlib
+import io
+import os
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', 'scrapers'))
+
+from stub_server import StubServer
+from vagas_scraper import JobScraper
+
+KEYWORDS = ["python", "dados", "java", "analista de sistemas", "ti", "TI", "bi", "BI"]
+
+
+def run(base_url, concurrency, pages):
+    with tempfile.TemporaryDirectory() as tmp:
+        scraper = JobScraper(os.path.join(tmp, "bench.db"), base_url=base_url)
+        start = time.perf_counter()
+        with contextlib.redirect_stdout(io.StringIO()):
+            result = scraper.scrape_vagas(KEYWORDS, pages=pages, concurrency=concurrency)
+        elapsed = time.perf_counter() - start
+        # As métricas de tempo mudam a cada execução: compara só os contadores
+        result.pop('metrics')
+        return elapsed, result
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser()
+    parser.add_argument('--latency', type=float, default=0.05)
+    parser.add_argument('--pages', type=int, default=5)
+    parser.add_argument('--concurrency', type=int, default=8)
+    args = parser.parse_args()
+    
+    with StubServer(latency=args.latency) as server:
+        serial_time, serial_result = run(server.base_url, 1, args.pages)
+        conc_time, conc_result = run(server.base_url, args.concurrency, args.pages)
+    
+    n_pages = len(KEYWORDS) * args.pages - serial_result['skipped_fetches']
+    print(f"Páginas: {n_pages} | latência simulada: {args.latency * 1000:.0f} ms")
+    print(f"Serial:       {serial_time:6.2f}s  {serial_result}")
+    print(f"Concorrente:  {conc_time:6.2f}s  {conc_result}  (concurrency={args.concurrency})")
+    print(f"Speedup: {serial_time / conc_time:.1f}x")
+    
+    if serial_result != conc_result:
+        print("❌ Contadores diferentes entre os modos!")
+        sys.exit(1)
+    print("✅ Contadores idênticos")
@@ -0,0 +1,107 @@
+"""
+Benchmark dos exportadores com 1M de vagas.
+
+Cada exportação roda em um subprocesso separado para medir o pico de
+memória (RSS) só dela. Compara o CSV antigo (fetchall + writerows) com os
+exportadores em streaming (CSV, JSONL, Parquet e Excel write-only).
+
+Uso: python benchmarks/bench_export.py --rows 1000000 --formats csv_legacy csv jsonl parquet xlsx
+"""
+import argparse
+import hashlib
+import os
+import resource
+import subprocess
+import sys
+import tempfile
+import time
+
+HERE = os.path.dirname(os.path.abspath(__file__))
+ROOT = os.path.join(HERE, '..')
+sys.path.insert(0, os.path.join(ROOT, 'scrapers'))
+sys.path.insert(0, ROOT)
+
+
+def legacy_csv(db_path, filename):
+    """Exportação antiga: carrega a tabela inteira com fetchall"""
+    import csv
+    import sqlite3
+    
+    conn = sqlite3.connect(db_path)
+    rows = conn.execute('''
+        SELECT source, title, company, link, created_at FROM jobs ORDER BY created_at DESC
+    ''').fetchall()
+    conn.close()
+    with open(filename, 'w', newline='', encoding='utf-8') as file:
+        writer = csv.writer(file)
+        writer.writerow(['Fonte', 'Título', 'Empresa', 'Link', 'Data'])
+        writer.writerows(rows)
+
+
+def run_export(fmt, db_path, out_dir):
+    """Executado no subprocesso: faz uma exportação"""
+    import contextlib
+    import io
+    
+    from vagas_scraper import JobScraper
+    
+    filename = os.path.join(out_dir, f"export.{fmt.split('_')[0]}")
+    with contextlib.redirect_stdout(io.StringIO()):
+        if fmt == 'csv_legacy':
+            legacy_csv(db_path, filename)
+        elif fmt == 'xlsx':
+            from query_db import SQLiteViewer
+            SQLiteViewer(db_path).export_to_excel(filename)
+        else:
+            scraper = JobScraper(db_path)
+            getattr(scraper, f"export_to_{fmt}")(filename)
+            scraper.close()
+    return filename
+
+
+def fill(db_path, rows):
+    from vagas_scraper import JobScraper
+    
+    scraper = JobScraper(db_path)
+    scraper.store.insert_many([
+        ("Vagas.com", f"Analista de Dados Pleno - Vaga {i}", f"Empresa {i % 5000}",
+         f"https://www.vagas.com.br/vagas/v{2000000 + i}/analista-de-dados-pleno",
+         hashlib.md5(str(i).encode()).hexdigest()) for i in range(rows)
+    ])
+    scraper.close()
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser()
+    parser.add_argument('--rows', type=int, default=1_000_000)
+    parser.add_argument('--formats', nargs='+', default=['csv_legacy', 'csv', 'jsonl', 'parquet', 'xlsx'])
+    parser.add_argument('--child', nargs=3, metavar=('FMT', 'DB', 'DIR'), help=argparse.SUPPRESS)
+    args = parser.parse_args()
+    
+    if args.child:
+        run_export(*args.child)
+        # Pico de memória do próprio processo (KB no Linux)
+        print(resource.getrusage(resource.RUSAGE_SELF).ru_maxrss)
+        sys.exit(0)
+    
+    with tempfile.TemporaryDirectory() as tmp:
+        db_path = os.path.join(tmp, "bench.db")
+        print(f"Gerando {args.rows:,} vagas...")
+        fill(db_path, args.rows)
+        
+        print(f"{'formato':>12} {'tempo (s)':>10} {'pico RSS (MB)':>14} {'arquivo (MB)':>13}")
+        for fmt in args.formats:
+            start = time.perf_counter()
+            result = subprocess.run(
+                [sys.executable, __file__, '--child', fmt, db_path, tmp],
+                capture_output=True, text=True
+            )
+            elapsed = time.perf_counter() - start
+            if result.returncode != 0:
+                print(f"{fmt:>12} falhou: {result.stderr.strip().splitlines()[-1]}")
+                continue
+            
+            peak_mb = int(result.stdout.strip().splitlines()[-1]) / 1024
+            path = os.path.join(tmp, f"export.{fmt.split('_')[0]}")
+            size_mb = os.path.getsize(path) / 2**20 if os.path.exists(path) else 0
+            print(f"{fmt:>12} {elapsed:10.2f} {peak_mb:14.1f} {size_mb:13.1f}")
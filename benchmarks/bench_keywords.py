@@ -0,0 +1,89 @@
+"""
+Microbenchmark do filtro de palavras-chave.
+
+Compara a implementação antiga de contains_keywords (uma regex por
+palavra-chave, a cada título) com o KeywordMatcher compilado, usando os
+títulos de minhas_vagas.csv e as DEFAULT_KEYWORDS do scraper.
+
+Uso: python benchmarks/bench_keywords.py --repeat 200
+"""
+import argparse
+import csv
+import os
+import re
+import sys
+import time
+
+ROOT = os.path.join(os.path.dirname(os.path.abspath(__file__)), '..')
+sys.path.insert(0, os.path.join(ROOT, 'scrapers'))
+
+from pipeline import KeywordMatcher
+from vagas_scraper import DEFAULT_KEYWORDS
+
+
+def contains_keywords_legacy(text, keywords):
+    """Implementação original (uma re.search por palavra-chave)"""
+    if not text or not keywords:
+        return False
+    
+    text_lower = text.lower()
+    
+    for keyword in keywords:
+        keyword_lower = keyword.lower().strip()
+        
+        if len(keyword_lower) <= 2:
+            pattern = r'\b' + re.escape(keyword_lower) + r'\b'
+            if re.search(pattern, text_lower):
+                return True
+        else:
+            pattern = r'(?<!\w)' + re.escape(keyword_lower) + r'(?!\w)'
+            if re.search(pattern, text_lower):
+                return True
+    
+    return False
+
+
+def load_titles(path):
+    with open(path, newline='', encoding='utf-8') as file:
+        return [row['Título'] for row in csv.DictReader(file)]
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser()
+    parser.add_argument('--csv', default=os.path.join(ROOT, 'minhas_vagas.csv'))
+    parser.add_argument('--repeat', type=int, default=200)
+    args = parser.parse_args()
+    
+    titles = load_titles(args.csv)
+    # Inclui títulos sem nenhuma palavra-chave (pior caso: testa todas)
+    titles += [t.lower().replace('dados', 'x').replace('ti', 'y') for t in titles]
+    keywords = [k.strip().lower() for k in DEFAULT_KEYWORDS]
+    
+    start = time.perf_counter()
+    matcher = KeywordMatcher(keywords)
+    build_time = time.perf_counter() - start
+    
+    legacy = [contains_keywords_legacy(t, keywords) for t in titles]
+    compiled = [matcher.search(t) is not None for t in titles]
+    if legacy != compiled:
+        diff = [t for t, a, b in zip(titles, legacy, compiled) if a != b]
+        print(f"❌ Resultados diferentes em {len(diff)} título(s), ex.: {diff[:3]}")
+        sys.exit(1)
+    
+    start = time.perf_counter()
+    for _ in range(args.repeat):
+        for title in titles:
+            contains_keywords_legacy(title, keywords)
+    legacy_time = time.perf_counter() - start
+    
+    start = time.perf_counter()
+    for _ in range(args.repeat):
+        for title in titles:
+            matcher.search(title)
+    compiled_time = time.perf_counter() - start
+    
+    n = len(titles) * args.repeat
+    print(f"Títulos: {len(titles)} x {args.repeat} | palavras-chave: {len(keywords)} | casam: {sum(compiled)}")
+    print(f"Antigo (regex por palavra):  {legacy_time / n * 1e6:8.2f} µs/título")
+    print(f"KeywordMatcher:              {compiled_time / n * 1e6:8.2f} µs/título (compilação: {build_time * 1000:.2f} ms)")
+    print(f"Speedup: {legacy_time / compiled_time:.1f}x")
@@ -0,0 +1,89 @@
+"""
+Benchmark do KnownHashIndex (deduplicação em memória) com 1M+ de vagas.
+
+Compara memória e tempo de consulta do índice compacto com um set de
+strings hexadecimais, e mede a carga inicial a partir de um banco SQLite.
+
+Uso: python benchmarks/bench_known_hashes.py --jobs 1000000
+"""
+import argparse
+import hashlib
+import os
+import random
+import sys
+import tempfile
+import time
+import tracemalloc
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', 'scrapers'))
+
+from job_store import KnownHashIndex, SQLiteJobStore, hash_key
+
+
+def make_hashes(n):
+    return [hashlib.md5(f"Vagas.com:vaga {i}:empresa {i % 5000}".encode('utf-8')).hexdigest() for i in range(n)]
+
+
+def measure(build):
+    tracemalloc.start()
+    start = time.perf_counter()
+    obj = build()
+    elapsed = time.perf_counter() - start
+    current, _ = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return obj, elapsed, current
+
+
+def lookups_per_sec(container, probes):
+    start = time.perf_counter()
+    hits = sum(1 for h in probes if h in container)
+    return len(probes) / (time.perf_counter() - start), hits
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser()
+    parser.add_argument('--jobs', type=int, default=1_000_000)
+    parser.add_argument('--probes', type=int, default=200_000)
+    args = parser.parse_args()
+    
+    hashes = make_hashes(args.jobs)
+    # Metade das consultas são duplicatas, metade vagas novas
+    probes = random.sample(hashes, args.probes // 2) + make_hashes(args.jobs + args.probes // 2)[args.jobs:]
+    random.shuffle(probes)
+    
+    # As strings são recriadas para que a memória delas entre na conta do set
+    hex_set, set_time, set_mem = measure(lambda: set(make_hashes(args.jobs)))
+    
+    def build_index():
+        index = KnownHashIndex()
+        index.load(sorted(hashes))
+        return index
+    index, index_time, index_mem = measure(build_index)
+    
+    set_rate, set_hits = lookups_per_sec(hex_set, probes)
+    index_rate, index_hits = lookups_per_sec(index, probes)
+    
+    print(f"Vagas: {args.jobs:,} | consultas: {len(probes):,}")
+    print(f"set de str:      {set_mem / 2**20:7.1f} MB  carga {set_time:5.2f}s  {set_rate:,.0f} consultas/s")
+    print(f"KnownHashIndex:  {index_mem / 2**20:7.1f} MB  carga {index_time:5.2f}s  {index_rate:,.0f} consultas/s")
+    assert set_hits == index_hits, "resultados diferentes!"
+    
+    # Carga a partir do banco (como acontece no início do scraping)
+    with tempfile.TemporaryDirectory() as tmp:
+        db_path = os.path.join(tmp, "bench.db")
+        store = SQLiteJobStore(db_path)
+        store.insert_many([('Vagas.com', 't', 'c', None, h) for h in hashes])
+        store.close()
+        store = SQLiteJobStore(db_path)
+        
+        start = time.perf_counter()
+        loaded = len(store.known_hashes)
+        print(f"Carga do banco:  {loaded:,} hashes em {time.perf_counter() - start:.2f}s")
+        
+        # Comparação com a consulta SQL por vaga (caminho antigo)
+        start = time.perf_counter()
+        for h in probes[:20000]:
+            store.conn.execute("SELECT id FROM job_records WHERE hash_key = ?", (hash_key(h),)).fetchone()
+        sql_rate = 20000 / (time.perf_counter() - start)
+        print(f"SELECT por vaga: {sql_rate:,.0f} consultas/s (mesma conexão)")
+        store.close()
@@ -0,0 +1,80 @@
+"""
+Benchmark do parsing das páginas de resultados.
+
+Compara o caminho antigo (BeautifulSoup(r.text, "html.parser") da página
+inteira + find_all) com o ListingParser (SoupStrainer, bytes crus e lxml
+quando instalado) sobre as páginas salvas em benchmarks/fixtures, e confere
+se título/empresa/link extraídos são os mesmos.
+
+Uso: python benchmarks/bench_parse.py --repeat 20
+"""
+import argparse
+import glob
+import os
+import sys
+import time
+
+HERE = os.path.dirname(os.path.abspath(__file__))
+sys.path.insert(0, os.path.join(HERE, '..', 'scrapers'))
+
+from bs4 import BeautifulSoup
+from vagas_scraper import DEFAULT_HTML_PARSER, ListingParser
+
+
+def extract(resultados):
+    """Mesma extração de campos feita em extract_listing (vagas_scraper)"""
+    jobs = []
+    for vaga in resultados:
+        title_tag = vaga.find("a", class_="link-detalhes-vaga")
+        company_tag = vaga.find("span", class_="emprVaga")
+        jobs.append((
+            " ".join(title_tag.get_text().split()) if title_tag else None,
+            " ".join(company_tag.get_text().split()) if company_tag else None,
+            title_tag.get("href") if title_tag else None,
+        ))
+    return jobs
+
+
+def legacy_parse(content):
+    soup = BeautifulSoup(content.decode('utf-8'), "html.parser")
+    return soup.find_all("div", class_="informacoes-header")
+
+
+def timed(parse, pages, repeat):
+    start = time.perf_counter()
+    for _ in range(repeat):
+        for content in pages:
+            parse(content)
+    return (time.perf_counter() - start) / (repeat * len(pages))
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser()
+    parser.add_argument('--fixtures', default=os.path.join(HERE, 'fixtures'))
+    parser.add_argument('--repeat', type=int, default=20)
+    args = parser.parse_args()
+    
+    pages = []
+    for path in sorted(glob.glob(os.path.join(args.fixtures, 'vagas-de-*.html'))):
+        with open(path, 'rb') as file:
+            pages.append(file.read())
+    
+    backends = ["html.parser"] + (["lxml"] if DEFAULT_HTML_PARSER == "lxml" else [])
+    expected = [extract(legacy_parse(content)) for content in pages]
+    
+    base = timed(legacy_parse, pages, args.repeat)
+    print(f"Páginas: {len(pages)} | tamanho médio: {sum(map(len, pages)) / len(pages) / 1024:.0f} KB")
+    print(f"{'antigo (texto, html.parser, página inteira)':50s} {base * 1000:7.2f} ms/página")
+    
+    for backend in backends:
+        listing_parser = ListingParser(backend)
+        if [extract(listing_parser.parse(content)) for content in pages] != expected:
+            print(f"❌ {backend}: extração diferente do caminho antigo!")
+            sys.exit(1)
+        
+        elapsed = timed(listing_parser.parse, pages, args.repeat)
+        label = f"ListingParser ({backend}, SoupStrainer, bytes)"
+        print(f"{label:50s} {elapsed * 1000:7.2f} ms/página  ({base / elapsed:.1f}x)")
+    
+    if "lxml" not in backends:
+        print("ℹ️ lxml não instalado: pip install lxml para o backend mais rápido")
@@ -0,0 +1,97 @@
+"""
+Benchmark de scrape_vagas_parallel (vários processos) contra o servidor stub.
+
+O servidor stub roda em um processo separado, servindo as páginas gravadas
+em benchmarks/fixtures (e geradas para os demais termos), para não disputar
+CPU com o processo que grava no banco. Mede o tempo com 1, 2, 4 e 8
+processos e confere se os contadores batem com os do modo serial.
+
+Uso: python benchmarks/bench_processes.py --pages 3 --workers 1 2 4 8
+"""
+import argparse
+import contextlib
+import io
+import os
+import socket
+import subprocess
+import sys
+import tempfile
+import time
+
+import requests
+
+BENCH_DIR = os.path.dirname(os.path.abspath(__file__))
+sys.path.insert(0, os.path.join(BENCH_DIR, '..', 'scrapers'))
+
+from vagas_scraper import DEFAULT_KEYWORDS, JobScraper
+
+
+def free_port():
+    with socket.socket() as sock:
+        sock.bind(('127.0.0.1', 0))
+        return sock.getsockname()[1]
+
+
+@contextlib.contextmanager
+def stub_process(latency):
+    """Sobe o stub_server.py em outro processo e espera ele responder"""
+    port = free_port()
+    base_url = f"http://127.0.0.1:{port}"
+    proc = subprocess.Popen([
+        sys.executable, os.path.join(BENCH_DIR, 'stub_server.py'), '--port', str(port),
+        '--latency', str(latency), '--fixtures', os.path.join(BENCH_DIR, 'fixtures'),
+    ], stdout=subprocess.DEVNULL)
+    try:
+        for _ in range(100):
+            try:
+                requests.get(f"{base_url}/vagas-de-python?pagina=1", timeout=1)
+                break
+            except requests.ConnectionError:
+                time.sleep(0.05)
+        yield base_url
+    finally:
+        proc.terminate()
+        proc.wait()
+
+
+def run(base_url, pages, workers):
+    with tempfile.TemporaryDirectory() as tmp:
+        scraper = JobScraper(os.path.join(tmp, "bench.db"), base_url=base_url)
+        start = time.perf_counter()
+        with contextlib.redirect_stdout(io.StringIO()):
+            if workers:
+                result = scraper.scrape_vagas_parallel(DEFAULT_KEYWORDS, pages=pages, workers=workers)
+            else:
+                result = scraper.scrape_vagas(DEFAULT_KEYWORDS, pages=pages)
+        elapsed = time.perf_counter() - start
+        scraper.close()
+        # As métricas de tempo mudam a cada execução: compara só os contadores
+        result.pop('metrics')
+        return elapsed, result
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser()
+    parser.add_argument('--latency', type=float, default=0.0)
+    parser.add_argument('--pages', type=int, default=3)
+    parser.add_argument('--workers', type=int, nargs='+', default=[1, 2, 4, 8])
+    args = parser.parse_args()
+    
+    with stub_process(args.latency) as base_url:
+        serial_time, serial_result = run(base_url, args.pages, 0)
+        print(f"Páginas: {serial_result['pages']} | latência simulada: {args.latency * 1000:.0f} ms "
+              f"| CPUs: {os.cpu_count()}")
+        print(f"Serial:          {serial_time:6.2f}s")
+        
+        ok = True
+        for workers in args.workers:
+            elapsed, result = run(base_url, args.pages, workers)
+            same = result == serial_result
+            ok = ok and same
+            print(f"{workers} processo(s):  {elapsed:6.2f}s  speedup {serial_time / elapsed:4.1f}x  "
+                  f"{'✅' if same else '❌ contadores diferentes'}")
+    
+    if not ok:
+        print(f"Serial: {serial_result}")
+        sys.exit(1)
+    print("✅ Contadores idênticos ao modo serial")
@@ -0,0 +1,68 @@
+"""
+Benchmark da busca: LIKE '%kw%' (caminho antigo) x índice FTS5.
+
+Monta bancos com quantidades crescentes de vagas sintéticas e mede a
+latência de cada busca, para mostrar que o FTS5 não cresce junto com a
+tabela. As duas buscas retornam a primeira página (20 vagas).
+
+Uso: python benchmarks/bench_search.py --sizes 10000 100000 1000000
+"""
+import argparse
+import hashlib
+import os
+import random
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', 'scrapers'))
+
+from vagas_scraper import JobScraper
+
+PALAVRAS = ["Analista", "Desenvolvedor", "Engenheiro", "Assistente", "Coordenador", "Técnico",
+            "Dados", "Python", "Java", "Sistemas", "Inteligência", "Vendas", "Logística",
+            "Financeiro", "Suporte", "Pleno", "Sênior", "Júnior", "Cloud", "Marketing"]
+EMPRESAS = ["Rede D'Or", "Manpower", "Banco Exemplo", "Tech Brasil", "Grupo Varejo", "Confidencial"]
+BUSCAS = ["python", "inteligencia", "analista de dados", "manpower", "kubernetes"]
+
+LIKE_SQL = '''
+    SELECT * FROM jobs WHERE (title LIKE ? OR company LIKE ?)
+    ORDER BY created_at DESC LIMIT 20
+'''
+
+
+def fill(scraper, n, seed=42):
+    rng = random.Random(seed)
+    rows = []
+    for i in range(n):
+        title = " ".join(rng.sample(PALAVRAS, 4)) + f" {i}"
+        company = rng.choice(EMPRESAS)
+        rows.append(("Vagas.com", title, company, None, hashlib.md5(f"{i}".encode()).hexdigest()))
+    scraper.store.insert_many(rows)
+
+
+def timed(fn, repeat):
+    start = time.perf_counter()
+    for _ in range(repeat):
+        fn()
+    return (time.perf_counter() - start) / repeat * 1000
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser()
+    parser.add_argument('--sizes', type=int, nargs='+', default=[10_000, 100_000, 500_000])
+    parser.add_argument('--repeat', type=int, default=5)
+    args = parser.parse_args()
+    
+    print(f"{'vagas':>10} {'busca':>20} {'LIKE (ms)':>10} {'FTS5 (ms)':>10}")
+    for size in args.sizes:
+        with tempfile.TemporaryDirectory() as tmp:
+            scraper = JobScraper(os.path.join(tmp, "bench.db"))
+            fill(scraper, size)
+            conn = scraper.store.conn
+            
+            for keyword in BUSCAS:
+                like = timed(lambda: conn.execute(LIKE_SQL, (f"%{keyword}%", f"%{keyword}%")).fetchall(), args.repeat)
+                fts = timed(lambda: scraper.search_jobs(keyword, limit=20), args.repeat)
+                print(f"{size:>10,} {keyword:>20} {like:10.2f} {fts:10.2f}")
+            scraper.close()
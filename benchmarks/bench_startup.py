@@ -0,0 +1,104 @@
+"""
+Benchmark do tempo de partida da linha de comando do query_db.py.
+
+Roda cada comando rápido (check, summary, view, search) em um processo novo
+com python -X importtime e mostra a soma dos imports feitos pelo query_db (os
+da partida do próprio interpretador, como site, medidos com "python -c pass",
+ficam de fora), se o pandas foi carregado e o tempo total do processo. A meta
+é ficar abaixo de --budget milissegundos de imports; o export entra só para
+comparação (carrega o openpyxl).
+
+Uso: python benchmarks/bench_startup.py --rows 5000 --repeat 5
+"""
+import argparse
+import os
+import re
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+
+HERE = os.path.dirname(os.path.abspath(__file__))
+QUERY_DB = os.path.join(HERE, '..', 'query_db.py')
+sys.path.insert(0, os.path.join(HERE, '..', 'scrapers'))
+
+from vagas_scraper import JobScraper
+
+COMMANDS = [
+    ('check', ['check']),
+    ('summary', ['summary']),
+    ('view', ['view', '--limit', '10']),
+    ('search', ['search', 'python', '--limit', '10']),
+    ('export', ['export', '{tmp}/vagas.xlsx']),
+]
+QUICK = {'check', 'summary', 'view', 'search'}
+
+# "import time: self [us] | cumulative | imported package"
+IMPORT_LINE = re.compile(r'import time:\s+(\d+) \|\s+(\d+) \|( *)(\S+)')
+
+
+def import_stats(stderr, skip=()):
+    """Soma dos imports de primeiro nível fora de skip (ms) e nomes de todos os módulos importados"""
+    total_us = 0
+    modules = set()
+    for line in stderr.splitlines():
+        match = IMPORT_LINE.match(line)
+        if not match:
+            continue
+        _, cumulative, indent, name = match.groups()
+        modules.add(name)
+        if len(indent) == 1 and name not in skip:
+            total_us += int(cumulative)
+    return total_us / 1000, modules
+
+
+def interpreter_startup():
+    """Imports da partida do interpretador: (ms, módulos)"""
+    proc = subprocess.run([sys.executable, '-X', 'importtime', '-c', 'pass'],
+                          capture_output=True, text=True, check=True)
+    return import_stats(proc.stderr)
+
+
+def run(command, db_path, tmp, skip):
+    args = [arg.format(tmp=tmp) for arg in command]
+    start = time.perf_counter()
+    proc = subprocess.run([sys.executable, '-X', 'importtime', QUERY_DB, '--db', db_path] + args,
+                          capture_output=True, text=True, check=True)
+    wall = (time.perf_counter() - start) * 1000
+    imports_ms, modules = import_stats(proc.stderr, skip)
+    return imports_ms, wall, modules
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser()
+    parser.add_argument('--rows', type=int, default=5000)
+    parser.add_argument('--repeat', type=int, default=5)
+    parser.add_argument('--budget', type=float, default=50.0, help="meta de imports por comando rápido (ms)")
+    args = parser.parse_args()
+    
+    with tempfile.TemporaryDirectory() as tmp:
+        db_path = os.path.join(tmp, "jobs.db")
+        scraper = JobScraper(db_path, verbosity=0)
+        scraper.insert_jobs([("Vagas.com", f"Desenvolvedor Python {i}", f"Empresa {i % 97}", f"/vagas/v{i}")
+                             for i in range(args.rows)])
+        scraper.close()
+        
+        startup_ms, startup_modules = interpreter_startup()
+        print(f"Vagas no banco: {args.rows:,} | execuções por comando: {args.repeat} "
+              f"| partida do Python (fora da conta): {startup_ms:.1f} ms")
+        print(f"{'comando':10s} {'imports (ms)':>13s} {'processo (ms)':>14s}  pandas")
+        ok = True
+        for name, command in COMMANDS:
+            runs = [run(command, db_path, tmp, startup_modules) for _ in range(args.repeat)]
+            imports_ms = statistics.median(r[0] for r in runs)
+            wall = statistics.median(r[1] for r in runs)
+            pandas = 'pandas' in runs[0][2]
+            within = name not in QUICK or (imports_ms <= args.budget and not pandas)
+            ok = ok and within
+            print(f"{name:10s} {imports_ms:13.1f} {wall:14.1f}  {'sim' if pandas else 'não':6s}"
+                  f"{'' if within else '  ❌ acima da meta'}")
+    
+    if not ok:
+        sys.exit(1)
+    print(f"✅ Comandos rápidos abaixo de {args.budget:.0f} ms de imports e sem pandas")
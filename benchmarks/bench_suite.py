@@ -0,0 +1,248 @@
+"""
+Suíte de benchmarks por etapa do scraper, com saída em JSON.
+
+Mede, sem acessar o site real:
+  • fetch: download das páginas no servidor stub (latência e taxa de erros configuráveis)
+  • parse: BeautifulSoup + extração dos campos nas páginas gravadas em fixtures/
+  • contains_keywords e generate_job_hash: por chamada, com os títulos das fixtures
+  • insert_job e insert_jobs: gravação de vagas novas (uma a uma e em lote)
+  • search_jobs: busca em um banco com --rows vagas
+  • export_csv / export_jsonl / export_parquet: exportação do mesmo banco
+
+O JSON (um objeto com "meta" e "stages") vai para a saída padrão ou para
+--output, para comparar execuções ao longo do tempo.
+
+Uso: python benchmarks/bench_suite.py --rows 100000 --latency 0.01 --error-rate 0.05 --output antes.json
+"""
+import argparse
+import contextlib
+import glob
+import io
+import json
+import os
+import platform
+import sqlite3
+import subprocess
+import sys
+import tempfile
+import time
+from datetime import datetime, timezone
+
+HERE = os.path.dirname(os.path.abspath(__file__))
+sys.path.insert(0, os.path.join(HERE, '..', 'scrapers'))
+
+from bench_search import BUSCAS, fill
+from stub_server import StubServer
+from http_client import HttpClient
+from vagas_scraper import DEFAULT_HTML_PARSER, DEFAULT_KEYWORDS, JobScraper, ListingParser, extract_listing
+
+FIXTURES_DIR = os.path.join(HERE, 'fixtures')
+
+
+def stage(n, seconds, unit, **extra):
+    """Resultado de uma etapa: total, tempo por operação e vazão"""
+    result = {
+        'n': n,
+        'unit': unit,
+        'seconds': round(seconds, 6),
+        'us_per_op': round(seconds / n * 1e6, 3) if n else None,
+        'ops_per_s': round(n / seconds, 1) if seconds else None,
+    }
+    result.update(extra)
+    return result
+
+
+def timed(fn, repeat=1):
+    start = time.perf_counter()
+    for _ in range(repeat):
+        fn()
+    return time.perf_counter() - start
+
+
+def load_fixtures():
+    pages = []
+    for path in sorted(glob.glob(os.path.join(FIXTURES_DIR, 'vagas-de-*.html'))):
+        with open(path, 'rb') as file:
+            pages.append(file.read())
+    return pages
+
+
+def bench_fetch(args):
+    """Baixa --fetch-pages páginas do stub, uma de cada vez, pela mesma sessão"""
+    http = HttpClient(pool_size=1, backoff_factor=0.01, max_backoff=0.05)
+    status = {}
+    downloaded = 0
+    
+    with StubServer(latency=args.latency, error_rate=args.error_rate, fixtures_dir=FIXTURES_DIR) as server:
+        terms = ["python", "dados", "analista-de-sistemas", "ti"]
+        urls = [f"{server.base_url}/vagas-de-{terms[i % len(terms)]}?pagina={i // len(terms) + 1}"
+                for i in range(args.fetch_pages)]
+        
+        start = time.perf_counter()
+        for url in urls:
+            r = http.get(url)
+            status[r.status_code] = status.get(r.status_code, 0) + 1
+            downloaded += len(r.content)
+        seconds = time.perf_counter() - start
+    
+    http.close()
+    return stage(len(urls), seconds, 'página', bytes=downloaded, retries=http.retries,
+                 status={str(code): count for code, count in sorted(status.items())},
+                 latency_s=args.latency, error_rate=args.error_rate)
+
+
+def bench_parse(pages, args):
+    """ListingParser (BeautifulSoup) + extract_listing em todas as fixtures"""
+    parser = ListingParser()
+    listings = 0
+    
+    def run():
+        nonlocal listings
+        listings = 0
+        for content in pages:
+            for vaga in parser.parse(content):
+                extract_listing(vaga, "https://www.vagas.com.br")
+                listings += 1
+    
+    seconds = timed(run, args.repeat)
+    return stage(len(pages) * args.repeat, seconds, 'página', backend=parser.backend,
+                 listings_per_round=listings)
+
+
+def fixture_titles(pages):
+    parser = ListingParser()
+    titles = []
+    for content in pages:
+        for vaga in parser.parse(content):
+            _, title, company, _ = extract_listing(vaga, "")
+            titles.append((title, company))
+    return titles
+
+
+def bench_keywords(scraper, titles, args):
+    keywords = DEFAULT_KEYWORDS
+    scraper.contains_keywords("aquecimento", keywords)
+    
+    def run():
+        for title, _ in titles:
+            scraper.contains_keywords(title, keywords)
+    
+    seconds = timed(run, args.repeat)
+    return stage(len(titles) * args.repeat, seconds, 'título', keywords=len(keywords))
+
+
+def bench_hash(scraper, titles, args):
+    def run():
+        for title, company in titles:
+            scraper.generate_job_hash(title, company, "Vagas.com")
+    
+    seconds = timed(run, args.repeat)
+    return stage(len(titles) * args.repeat, seconds, 'vaga')
+
+
+def bench_insert(tmp, args):
+    """Vagas novas gravadas com insert_job (uma transação cada) e com insert_jobs (um lote)"""
+    jobs = [("Vagas.com", f"Desenvolvedor Python {i}", f"Empresa {i % 97}", f"/vagas/v{i}")
+            for i in range(args.inserts)]
+    results = {}
+    
+    scraper = JobScraper(os.path.join(tmp, "insert_one.db"))
+    seconds = timed(lambda: [scraper.insert_job(*job) for job in jobs])
+    results['insert_job'] = stage(len(jobs), seconds, 'vaga')
+    scraper.close()
+    
+    scraper = JobScraper(os.path.join(tmp, "insert_batch.db"))
+    seconds = timed(lambda: scraper.insert_jobs(jobs))
+    results['insert_jobs'] = stage(len(jobs), seconds, 'vaga')
+    scraper.close()
+    
+    return results
+
+
+def bench_search_and_export(tmp, args):
+    """search_jobs e exportações em um banco com --rows vagas"""
+    results = {}
+    scraper = JobScraper(os.path.join(tmp, "search.db"))
+    fill(scraper, args.rows)
+    
+    scraper.search_jobs(BUSCAS[0], limit=20)
+    seconds = timed(lambda: [scraper.search_jobs(keyword, limit=20) for keyword in BUSCAS], args.repeat)
+    results['search_jobs'] = stage(len(BUSCAS) * args.repeat, seconds, 'busca', rows=args.rows)
+    
+    exporters = [('export_csv', scraper.export_to_csv, 'csv'),
+                 ('export_jsonl', scraper.export_to_jsonl, 'jsonl'),
+                 ('export_parquet', scraper.export_to_parquet, 'parquet')]
+    for name, export, ext in exporters:
+        filename = os.path.join(tmp, f"export.{ext}")
+        try:
+            with contextlib.redirect_stdout(io.StringIO()):
+                seconds = timed(lambda: export(filename))
+        except ImportError as e:
+            results[name] = {'skipped': str(e)}
+            continue
+        results[name] = stage(args.rows, seconds, 'linha', bytes=os.path.getsize(filename))
+    
+    scraper.close()
+    return results
+
+
+def git_commit():
+    try:
+        return subprocess.run(['git', 'rev-parse', '--short', 'HEAD'], cwd=HERE, capture_output=True,
+                              text=True, check=True).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser()
+    parser.add_argument('--rows', type=int, default=100_000, help="vagas no banco de busca/exportação")
+    parser.add_argument('--inserts', type=int, default=2_000)
+    parser.add_argument('--fetch-pages', type=int, default=40)
+    parser.add_argument('--latency', type=float, default=0.0, help="atraso do stub por resposta (s)")
+    parser.add_argument('--error-rate', type=float, default=0.0, help="fração de respostas 503 do stub")
+    parser.add_argument('--repeat', type=int, default=5)
+    parser.add_argument('--output', help="grava o JSON neste arquivo em vez da saída padrão")
+    args = parser.parse_args()
+    
+    pages = load_fixtures()
+    titles = fixture_titles(pages)
+    stages = {}
+    
+    with tempfile.TemporaryDirectory() as tmp:
+        scraper = JobScraper(os.path.join(tmp, "funcs.db"))
+        stages['fetch'] = bench_fetch(args)
+        stages['parse'] = bench_parse(pages, args)
+        stages['contains_keywords'] = bench_keywords(scraper, titles, args)
+        stages['generate_job_hash'] = bench_hash(scraper, titles, args)
+        scraper.close()
+        stages.update(bench_insert(tmp, args))
+        stages.update(bench_search_and_export(tmp, args))
+    
+    report = {
+        'meta': {
+            'timestamp': datetime.now(timezone.utc).isoformat(timespec='seconds'),
+            'commit': git_commit(),
+            'python': platform.python_version(),
+            'sqlite': sqlite3.sqlite_version,
+            'platform': platform.platform(),
+            'cpus': os.cpu_count(),
+            'html_parser': DEFAULT_HTML_PARSER,
+            'fixtures': len(pages),
+            'args': vars(args),
+        },
+        'stages': stages,
+    }
+    
+    if args.output:
+        with open(args.output, 'w', encoding='utf-8') as file:
+            json.dump(report, file, ensure_ascii=False, indent=2)
+        for name, result in stages.items():
+            if 'skipped' in result:
+                print(f"{name:20s} pulado ({result['skipped']})")
+            else:
+                print(f"{name:20s} {result['us_per_op']:12.2f} µs/{result['unit']}  {result['ops_per_s']:12,.1f}/s")
+        print(f"💾 {args.output}")
+    else:
+        json.dump(report, sys.stdout, ensure_ascii=False, indent=2)
+        print()
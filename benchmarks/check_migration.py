@@ -0,0 +1,85 @@
+"""
+Checagem da migração do esquema antigo (tabela jobs) para o compacto.
+
+Copia um banco no formato antigo (por padrão o jobs.db do repositório) para
+uma pasta temporária, abre o JobScraper sobre a cópia e confere:
+  • a cópia de segurança foi criada e ainda tem a tabela jobs original, igual;
+  • a view jobs devolve as mesmas vagas (ids, textos e datas), com job_hash
+    igual aos 16 primeiros dígitos do MD5 original;
+  • o sqlite_sequence continua de onde estava (ids novos não reaproveitam).
+
+Uso: python benchmarks/check_migration.py [--db jobs.db]
+"""
+import argparse
+import glob
+import os
+import shutil
+import sqlite3
+import sys
+import tempfile
+
+ROOT = os.path.join(os.path.dirname(os.path.abspath(__file__)), '..')
+sys.path.insert(0, os.path.join(ROOT, 'scrapers'))
+
+from vagas_scraper import JobScraper
+
+COLUMNS = "id, source, title, company, link, job_hash, created_at, updated_at"
+
+
+def read_jobs(path):
+    conn = sqlite3.connect(path)
+    try:
+        rows = conn.execute(f"SELECT {COLUMNS} FROM jobs ORDER BY id").fetchall()
+        seq = conn.execute("SELECT seq FROM sqlite_sequence WHERE name = 'jobs'").fetchone()
+        kind = conn.execute("SELECT type FROM sqlite_master WHERE name = 'jobs'").fetchone()[0]
+    finally:
+        conn.close()
+    return rows, seq, kind
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser()
+    parser.add_argument('--db', default=os.path.join(ROOT, 'jobs.db'))
+    args = parser.parse_args()
+    
+    original, original_seq, kind = read_jobs(args.db)
+    if kind != 'table':
+        print(f"❌ {args.db} já está no esquema compacto")
+        sys.exit(1)
+    
+    problems = []
+    with tempfile.TemporaryDirectory() as tmp:
+        path = os.path.join(tmp, 'jobs.db')
+        shutil.copyfile(args.db, path)
+        
+        scraper = JobScraper(db_path=path, verbosity=0)
+        scraper.store.conn.close()
+        
+        backups = glob.glob(os.path.join(tmp, 'jobs.antes-da-migracao-*.db'))
+        if len(backups) != 1:
+            problems.append(f"esperada 1 cópia de segurança, encontradas {len(backups)}")
+        else:
+            saved, saved_seq, saved_kind = read_jobs(backups[0])
+            if saved_kind != 'table' or saved != original or saved_seq != original_seq:
+                problems.append("a cópia de segurança não é igual ao banco original")
+        
+        migrated, migrated_seq, migrated_kind = read_jobs(path)
+        expected = [row[:5] + (row[5][:16],) + row[6:] for row in original]
+        if migrated_kind != 'view':
+            problems.append(f"jobs deveria ser uma view, é {migrated_kind}")
+        if migrated != expected:
+            diff = sum(1 for a, b in zip(migrated, expected) if a != b) + abs(len(migrated) - len(expected))
+            problems.append(f"{diff} vagas diferentes na view jobs ({len(migrated)} de {len(expected)})")
+        
+        conn = sqlite3.connect(path)
+        seq = conn.execute("SELECT seq FROM sqlite_sequence WHERE name = 'job_records'").fetchone()
+        conn.close()
+        if seq != original_seq:
+            problems.append(f"sqlite_sequence {seq}, esperado {original_seq}")
+    
+    print(f"Vagas migradas: {len(original)} | sequência: {original_seq[0] if original_seq else None}")
+    if problems:
+        for problem in problems:
+            print(f"❌ {problem}")
+        sys.exit(1)
+    print("✅ Migração preserva as vagas e deixa uma cópia do banco original")
@@ -0,0 +1,132 @@
+"""
+Checagem da normalização de títulos usada pelas quase-duplicatas (MinHasher).
+
+Confere que só sufixos de local (cidade curta + UF de verdade, ou Remoto /
+Home Office / Híbrido) saem do título, com casos fixos e com todos os
+títulos de minhas_vagas.csv:
+  • o trecho removido de cada título tem no máximo 5 palavras e termina em
+    UF ou regime de trabalho;
+  • títulos diferentes da mesma empresa não viram o mesmo texto normalizado
+    (iriam para o mesmo grupo de quase-duplicatas).
+
+E indexa pares de vagas da mesma empresa no NearDuplicateIndex: níveis
+diferentes (I/II/III, Jr/Pl/Sr) ficam em grupos separados, e o mesmo
+título com e sem o local fica no mesmo grupo.
+
+Uso: python benchmarks/check_near_duplicates.py
+"""
+import argparse
+import csv
+import os
+import re
+import sys
+import tempfile
+from collections import defaultdict
+
+ROOT = os.path.join(os.path.dirname(os.path.abspath(__file__)), '..')
+sys.path.insert(0, os.path.join(ROOT, 'scrapers'))
+
+from near_duplicates import MinHasher
+from vagas_scraper import JobScraper
+
+# (título, título sem o sufixo de local)
+CASES = [
+    ("Desenvolvedor Python - São Paulo/SP", "Desenvolvedor Python"),
+    ("Desenvolvedor Python (Campinas SP)", "Desenvolvedor Python"),
+    ("Desenvolvedor Python - Remoto", "Desenvolvedor Python"),
+    ("Analista - Home Office", "Analista"),
+    ("Analista de Dados - São José dos Campos / SP", "Analista de Dados"),
+    ("Líder Técnico TI - Alto do Rodrigues/RN", "Líder Técnico TI"),
+    ("Analista de Suporte - TI", "Analista de Suporte - TI"),
+    ("Analista de Suporte - RH", "Analista de Suporte - RH"),
+    ("Analista de Dados - Power BI", "Analista de Dados - Power BI"),
+    ("Designer UX, UI", "Designer UX, UI"),
+    ("Analista de Validação de Sistemas Computadorizados Sr (VSC)",
+     "Analista de Validação de Sistemas Computadorizados Sr (VSC)"),
+    ("Analista de Recursos Humanos Jr - Desenvolvimento de Sistemas de RH",
+     "Analista de Recursos Humanos Jr - Desenvolvimento de Sistemas de RH"),
+]
+
+# Pares (título, título) da mesma empresa que não podem virar quase-duplicatas
+DISTINCT = [
+    ("Engenheiro de Dados II", "Engenheiro de Dados III"),
+    ("Desenvolvedor Sistemas I", "Desenvolvedor Sistemas III"),
+    ("Analista de Dados Jr", "Analista de Dados Sr"),
+    ("Analista de Dados Júnior", "Analista de Dados Pleno"),
+    ("Desenvolvedor Python Pleno", "Desenvolvedor Python Sênior"),
+]
+
+# Pares que devem cair no mesmo grupo
+SAME = [
+    ("Engenheiro de Dados II", "Engenheiro de Dados II - Remoto"),
+    ("Desenvolvedor Python Sênior", "Desenvolvedor Python Sênior - São Paulo/SP"),
+]
+
+LOCATION_END = re.compile(r'(?:\b(?:' + '|'.join(MinHasher.UFS) + r')|(?i:remoto|home office|h[íi]brido))\W*$')
+
+
+def check_clusters():
+    """Indexa cada par (com uma empresa por par) e confere os grupos"""
+    problems = []
+    with tempfile.TemporaryDirectory() as tmp:
+        scraper = JobScraper(db_path=os.path.join(tmp, 'jobs.db'))
+        pairs = [(pair, False) for pair in DISTINCT] + [(pair, True) for pair in SAME]
+        for number, ((first, second), same) in enumerate(pairs):
+            scraper.insert_jobs([("check", first, f"Empresa {number}", None),
+                                 ("check", second, f"Empresa {number}", None)])
+        scraper.near_duplicates.index_pending()
+        
+        clusters = scraper.store.conn.execute(
+            "SELECT cluster_id FROM job_minhash ORDER BY job_id").fetchall()
+        scraper.close()
+    
+    for number, ((first, second), same) in enumerate(pairs):
+        joined = clusters[2 * number] == clusters[2 * number + 1]
+        if joined != same:
+            problems.append(f"{first!r} e {second!r} {'ficaram separadas' if same else 'viraram quase-duplicatas'}")
+    return problems
+
+
+def load_jobs(path):
+    with open(path, newline='', encoding='utf-8') as file:
+        return [(row['Título'], row['Empresa']) for row in csv.DictReader(file)]
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser()
+    parser.add_argument('--csv', default=os.path.join(ROOT, 'minhas_vagas.csv'))
+    args = parser.parse_args()
+    
+    hasher = MinHasher()
+    problems = []
+    
+    for title, expected in CASES:
+        stripped = hasher.LOCATION_SUFFIX_RE.sub('', title)
+        if stripped != expected:
+            problems.append(f"{title!r}: virou {stripped!r}, esperado {expected!r}")
+    
+    jobs = load_jobs(args.csv)
+    by_company = defaultdict(dict)
+    stripped_count = 0
+    for title, company in jobs:
+        stripped = hasher.LOCATION_SUFFIX_RE.sub('', title)
+        if stripped != title:
+            stripped_count += 1
+            removed = title[len(stripped):]
+            if len(re.findall(r'\w+', removed)) > 5 or not LOCATION_END.search(removed):
+                problems.append(f"{title!r}: removeu {removed!r}, que não é um local")
+        
+        normalized = hasher.normalize(title)
+        other = by_company[company].setdefault(normalized, title)
+        if other != title:
+            problems.append(f"{title!r} e {other!r} ({company}) viram o mesmo texto: {normalized!r}")
+    
+    problems += check_clusters()
+    
+    print(f"Casos fixos: {len(CASES)} | pares indexados: {len(DISTINCT) + len(SAME)} | "
+          f"títulos do CSV: {len(jobs)} ({stripped_count} com sufixo de local)")
+    if problems:
+        for problem in problems:
+            print(f"❌ {problem}")
+        sys.exit(1)
+    print("✅ Só sufixos de local são removidos dos títulos e níveis diferentes não são agrupados")
@@ -0,0 +1,275 @@
+"""
+Servidor HTTP local que imita as páginas de busca do Vagas.com.
+
+Usado pelos benchmarks para medir o scraper sem depender do site real.
+Cada URL /vagas-de-<termo>?pagina=<n> devolve uma página de resultados
+determinística com blocos "informacoes-header" no mesmo formato do site
+(ou a página gravada em fixtures, se houver), e cada /vagas/v<id>/... a
+página de detalhe da vaga, com latência e taxa de erros (503) configuráveis.
+"""
+import argparse
+import hashlib
+import os
+import random
+import re
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import parse_qs, urlsplit
+
+JOBS_PER_PAGE = 40
+FIXTURE_TERMS = ["python", "dados", "analista-de-sistemas", "ti"]
+
+CARGOS = [
+    "Analista de Dados", "Desenvolvedor Python", "Engenheiro de Dados",
+    "Programador Java", "Analista de Sistemas", "Cientista de Dados",
+    "Desenvolvedor Full Stack", "Analista de BI", "Técnico de TI",
+    "Assistente Administrativo", "Vendedor Externo", "Auxiliar de Logística",
+]
+NIVEIS = ["Júnior", "Pleno", "Sênior", "Estágio"]
+EMPRESAS = [
+    "Rede D'Or", "Epimed Solutions", "Equatorial Energia", "Banco Exemplo S.A.",
+    "Tech Brasil Ltda", "Grupo Varejo", "Consultoria Alfa", "Empresa Confidencial",
+]
+
+
+def render_results_page(search_term, page, jobs_per_page=JOBS_PER_PAGE, max_pages=None):
+    """Gera o HTML de uma página de resultados para o termo e a página pedidos"""
+    keyword = search_term.replace('-', ' ')
+    items = []
+    # Depois da última página o site devolve a página sem nenhuma vaga
+    if max_pages is not None and page > max_pages:
+        jobs_per_page = 0
+    for i in range(jobs_per_page):
+        seed = hashlib.md5(f"{search_term}:{page}:{i}".encode('utf-8')).digest()
+        cargo = CARGOS[seed[0] % len(CARGOS)]
+        nivel = NIVEIS[seed[1] % len(NIVEIS)]
+        empresa = EMPRESAS[seed[2] % len(EMPRESAS)]
+        # Metade das vagas cita a palavra-chave no título, como no site real
+        title = f"{cargo} {nivel} - {keyword}" if seed[6] % 2 else f"{cargo} {nivel}"
+        # A mesma vaga (título + empresa) tem sempre o mesmo id, em qualquer busca
+        vaga_key = hashlib.md5(f"{title}:{empresa}".encode('utf-8')).digest()
+        vaga_id = 2000000 + int.from_bytes(vaga_key[:4], 'big') % 8000000
+        slug = title.lower().replace(' ', '-')
+        items.append(f'''
+    <li class="vaga odd ">
+      <div class="informacoes-header">
+        <h2 class="cargo">
+          <a class="link-detalhes-vaga" data-id-vaga="{vaga_id}" title="{title}" href="/vagas/v{vaga_id}/{slug}">
+            {title}
+          </a>
+        </h2>
+        <span class="emprVaga">
+          {empresa}
+        </span>
+      </div>
+      <div class="detalhes"><p>Descrição resumida da vaga {vaga_id}.</p></div>
+      <footer><span class="vaga-local">São Paulo / SP</span></footer>
+    </li>''')
+    
+    return PAGE_TEMPLATE.format(
+        keyword=keyword,
+        page=page,
+        header=PAGE_HEADER,
+        filters=PAGE_FILTERS,
+        items="".join(items),
+        footer=PAGE_FOOTER,
+    )
+
+
+def render_detail_page(vaga_id):
+    """Gera o HTML da página de detalhe de uma vaga (/vagas/v<id>/...)"""
+    seed = hashlib.md5(f"detalhe:{vaga_id}".encode('utf-8')).digest()
+    cidade = ["São Paulo / SP", "Rio de Janeiro / RJ", "Belo Horizonte / MG", "Remoto"][seed[0] % 4]
+    nivel = NIVEIS[seed[1] % len(NIVEIS)]
+    salario = "A combinar" if seed[2] % 3 == 0 else f"R$ {3000 + seed[3] * 40:,}".replace(',', '.')
+    publicada = f"{1 + seed[4] % 28:02d}/{1 + seed[5] % 12:02d}/2026"
+    descricao = " ".join(f"Responsabilidade {i} da vaga {vaga_id}." for i in range(1 + seed[6] % 8))
+    
+    return DETAIL_TEMPLATE.format(
+        vaga_id=vaga_id, cidade=cidade, nivel=nivel, salario=salario,
+        publicada=publicada, descricao=descricao, header=PAGE_HEADER, footer=PAGE_FOOTER,
+    )
+
+
+# Marcação que cerca os resultados. As páginas reais têm bem mais HTML fora
+# das vagas (menus, filtros, scripts) do que dentro delas, e é isso que pesa no parse
+PAGE_HEADER = "".join(
+    f'<li class="menu-item"><a href="/vagas-de-area-{i}" data-track="menu-{i}">Área {i}</a></li>'
+    for i in range(120)
+)
+PAGE_FILTERS = "".join(
+    f'''<div class="filtro"><h3>Filtro {i}</h3><ul>{"".join(
+        f'<li><a href="?f={i}-{j}" class="filtro-opcao">Opção {j} <span class="qtd">({i * j})</span></a></li>'
+        for j in range(12))}</ul></div>'''
+    for i in range(25)
+)
+PAGE_FOOTER = (
+    "<script>" + "var dataLayer = dataLayer || []; dataLayer.push({'event': 'pageview'});" * 200 + "</script>"
+    + "".join(f'<p class="rodape"><a href="/institucional/{i}">Link institucional {i}</a></p>' for i in range(80))
+)
+PAGE_TEMPLATE = '''<!DOCTYPE html>
+<html lang="pt-BR">
+<head><meta charset="utf-8"><title>Vagas de {keyword} - página {page}</title></head>
+<body>
+  <header><nav><ul>{header}</ul></nav></header>
+  <aside id="filtros">{filters}</aside>
+  <section id="todasVagas" class="resultado-busca">
+    <ul>{items}
+    </ul>
+  </section>
+  <footer>{footer}</footer>
+</body>
+</html>'''
+
+
+DETAIL_TEMPLATE = '''<!DOCTYPE html>
+<html lang="pt-BR">
+<head><meta charset="utf-8"><title>Vaga {vaga_id}</title></head>
+<body>
+  <header><nav><ul>{header}</ul></nav></header>
+  <ul class="job-breadcrumb">
+    <li class="job-breadcrumb__item job-breadcrumb__item--id">Vaga v{vaga_id}</li>
+    <li class="job-breadcrumb__item job-breadcrumb__item--published">Publicada em {publicada}</li>
+  </ul>
+  <div class="job-shortdescription">
+    <ul class="job-hierarchylist">
+      <li><span class="job-hierarchylist__item job-hierarchylist__item--level">{nivel}</span></li>
+    </ul>
+  </div>
+  <div class="infoVaga">
+    <span class="info-localizacao">{cidade}</span>
+    <span class="info-salario">{salario}</span>
+  </div>
+  <div class="job-description"><div class="job-description__text texto"><p>{descricao}</p></div></div>
+  <footer>{footer}</footer>
+</body>
+</html>'''
+
+
+class StubHandler(BaseHTTPRequestHandler):
+    latency = 0.0
+    max_pages = None
+    etags = True
+    fixtures_dir = None
+    error_rate = 0.0
+    rng = random.Random(0)
+    bodies = {}
+    
+    def page_body(self, search_term, page):
+        """Corpo da página: a gravada em fixtures_dir, se existir, ou a gerada (ambas guardadas em memória)"""
+        key = (search_term, page)
+        if key not in self.bodies:
+            path = None
+            if self.fixtures_dir:
+                path = os.path.join(self.fixtures_dir, f"vagas-de-{search_term}_pagina-{page}.html")
+            if path and os.path.exists(path):
+                with open(path, 'rb') as file:
+                    self.bodies[key] = file.read()
+            else:
+                self.bodies[key] = render_results_page(search_term, page, max_pages=self.max_pages).encode('utf-8')
+        return self.bodies[key]
+    
+    def do_GET(self):
+        parts = urlsplit(self.path)
+        detail = re.match(r'/vagas/v(\d+)', parts.path)
+        if not parts.path.startswith('/vagas-de-') and not detail:
+            self.send_error(404)
+            return
+        
+        if self.latency:
+            time.sleep(self.latency)
+        
+        # Falhas intermitentes, como as do site sob carga
+        if self.error_rate and self.rng.random() < self.error_rate:
+            self.send_error(503)
+            return
+        
+        if detail:
+            vaga_id = int(detail.group(1))
+            # Uma em cada 50 vagas já saiu do ar
+            if vaga_id % 50 == 0:
+                self.send_error(404)
+                return
+            body = render_detail_page(vaga_id).encode('utf-8')
+        else:
+            search_term = parts.path[len('/vagas-de-'):]
+            page = int(parse_qs(parts.query).get('pagina', ['1'])[0])
+            body = self.page_body(search_term, page)
+        etag = '"' + hashlib.md5(body).hexdigest() + '"'
+        
+        # As páginas são determinísticas, então a requisição condicional sempre casa
+        if self.etags and self.headers.get('If-None-Match') == etag:
+            self.send_response(304)
+            self.send_header('ETag', etag)
+            self.end_headers()
+            return
+        
+        self.send_response(200)
+        if self.etags:
+            self.send_header('ETag', etag)
+        self.send_header('Content-Type', 'text/html; charset=utf-8')
+        self.send_header('Content-Length', str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+    
+    def log_message(self, format, *args):
+        pass
+
+
+class StubServer:
+    """Sobe o servidor em uma thread; use como context manager"""
+    
+    def __init__(self, latency=0.0, max_pages=None, etags=True, fixtures_dir=None,
+                 error_rate=0.0, seed=0, host='127.0.0.1', port=0):
+        handler = type('Handler', (StubHandler,), {
+            'latency': latency, 'max_pages': max_pages, 'etags': etags,
+            'fixtures_dir': fixtures_dir, 'error_rate': error_rate,
+            'rng': random.Random(seed), 'bodies': {},
+        })
+        self.httpd = ThreadingHTTPServer((host, port), handler)
+        self.httpd.daemon_threads = True
+        self.thread = threading.Thread(target=self.httpd.serve_forever, daemon=True)
+    
+    @property
+    def base_url(self):
+        host, port = self.httpd.server_address[:2]
+        return f"http://{host}:{port}"
+    
+    def __enter__(self):
+        self.thread.start()
+        return self
+    
+    def __exit__(self, *exc):
+        self.httpd.shutdown()
+        self.httpd.server_close()
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Servidor stub do Vagas.com")
+    parser.add_argument('--port', type=int, default=8000)
+    parser.add_argument('--latency', type=float, default=0.0, help="atraso por resposta em segundos")
+    parser.add_argument('--max-pages', type=int, help="páginas com vagas por busca (as seguintes vêm vazias)")
+    parser.add_argument('--error-rate', type=float, default=0.0, help="fração das respostas que voltam 503")
+    parser.add_argument('--fixtures', metavar='DIR', help="serve as páginas gravadas em DIR quando existirem")
+    parser.add_argument('--dump', metavar='DIR', help="só grava algumas páginas em DIR (fixtures) e sai")
+    args = parser.parse_args()
+    
+    if args.dump:
+        os.makedirs(args.dump, exist_ok=True)
+        for search_term in FIXTURE_TERMS:
+            for page in (1, 2):
+                path = os.path.join(args.dump, f"vagas-de-{search_term}_pagina-{page}.html")
+                with open(path, 'w', encoding='utf-8') as file:
+                    file.write(render_results_page(search_term, page))
+                print(f"💾 {path}")
+        raise SystemExit
+    
+    with StubServer(latency=args.latency, max_pages=args.max_pages, fixtures_dir=args.fixtures,
+                    error_rate=args.error_rate, port=args.port) as server:
+        print(f"🧪 Servidor stub em {server.base_url}")
+        try:
+            while True:
+                time.sleep(1)
+        except KeyboardInterrupt:
+            pass
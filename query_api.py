@@ -0,0 +1,192 @@
+"""
+API HTTP/JSON local para consultar o banco de vagas.
+
+Um único processo atende vários clientes (dashboards, scripts) com um
+SQLiteViewer em modo compartilhado: as conexões somente leitura ficam abertas
+e com o cache quente entre as requisições, em vez de cada consulta subir um
+processo Python e abrir o banco de novo. As listas de vagas saem em streaming
+(Transfer-Encoding: chunked), à medida que são lidas do banco.
+
+Rotas (GET):
+  /jobs?limit=20&after=<next>                  vagas mais recentes (limit=0: todas)
+  /search?q=python&source=&limit=20&offset=0   busca por palavra-chave
+  /summary                                     resumo estatístico
+  /duplicates?limit=10                         grupos de quase-duplicatas
+
+Uso: python query_db.py serve --port 8765
+"""
+import json
+import sqlite3
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import parse_qs, urlsplit
+
+from query_db import SQLiteViewer
+
+JOB_FIELDS = ('id', 'source', 'title', 'company', 'link', 'created_at')
+
+# Vagas lidas do cursor (e enviadas ao cliente) por vez
+STREAM_CHUNK = 500
+
+
+class QueryHandler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"
+    
+    def do_GET(self):
+        url = urlsplit(self.path)
+        params = {key: values[-1] for key, values in parse_qs(url.query).items()}
+        route = self.ROUTES.get(url.path)
+        self._streaming = False
+        
+        if route is None:
+            self._send_json({'error': f"rota desconhecida: {url.path}"}, 404)
+            return
+        
+        try:
+            route(self, params)
+        except (BrokenPipeError, ConnectionResetError):
+            self.close_connection = True
+        except (ValueError, sqlite3.Error) as e:
+            if self._streaming:
+                # Cabeçalho já enviado: só resta interromper a resposta
+                self.close_connection = True
+                return
+            self._send_json({'error': str(e)}, 400 if isinstance(e, ValueError) else 500)
+    
+    def _send_json(self, payload, status=200):
+        body = json.dumps(payload, ensure_ascii=False).encode('utf-8')
+        self.send_response(status)
+        self.send_header('Content-Type', 'application/json; charset=utf-8')
+        self.send_header('Content-Length', str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+    
+    def _write_chunk(self, text):
+        data = text.encode('utf-8')
+        if data:
+            self.wfile.write(f"{len(data):X}\r\n".encode('ascii') + data + b"\r\n")
+    
+    def _stream_jobs(self, cursor, head, limit=None):
+        """
+        Envia {head..., "jobs": [...] em blocos, no máximo limit vagas (None =
+        todas); retorna (quantidade, última linha enviada, se sobrou alguma)
+        """
+        self.send_response(200)
+        self.send_header('Content-Type', 'application/json; charset=utf-8')
+        self.send_header('Transfer-Encoding', 'chunked')
+        self.end_headers()
+        self._streaming = True
+        
+        self._write_chunk(json.dumps(head, ensure_ascii=False)[:-1] + (', ' if head else '') + '"jobs": [')
+        count = 0
+        last = None
+        more = False
+        while True:
+            rows = cursor.fetchmany(STREAM_CHUNK)
+            if limit and count + len(rows) > limit:
+                rows = rows[:limit - count]
+                more = True
+            if not rows:
+                break
+            self._write_chunk((',' if count else '') + ','.join(
+                json.dumps(dict(zip(JOB_FIELDS, row)), ensure_ascii=False) for row in rows
+            ))
+            count += len(rows)
+            last = rows[-1]
+            if more:
+                break
+        return count, last, more
+    
+    def _end_stream(self, tail):
+        self._write_chunk('], ' + json.dumps(tail, ensure_ascii=False)[1:])
+        self.wfile.write(b"0\r\n\r\n")
+    
+    def _int(self, params, name, default):
+        try:
+            return int(params.get(name, default))
+        except ValueError:
+            raise ValueError(f"parâmetro {name} deve ser um número inteiro")
+    
+    def jobs(self, params):
+        limit = self._int(params, 'limit', 20)
+        after = None
+        if params.get('after'):
+            created_at, _, job_id = params['after'].rpartition('|')
+            if not created_at or not job_id.isdigit():
+                raise ValueError("parâmetro after inválido (use o valor de next)")
+            after = (created_at, int(job_id))
+        
+        viewer = self.server.viewer
+        with viewer.connection() as conn:
+            # Uma vaga a mais só para saber se existe próxima página (limit <= 0 = todas)
+            limit = limit if limit > 0 else None
+            cursor = viewer.jobs_cursor(conn, after, limit + 1 if limit else None)
+            count, last, more = self._stream_jobs(cursor, {}, limit)
+        
+        # Cursor da próxima página: created_at e id da última vaga enviada
+        next_cursor = f"{last[6]}|{last[0]}" if more else None
+        self._end_stream({'count': count, 'next': next_cursor})
+    
+    def search(self, params):
+        keyword = params.get('q', '').strip()
+        if not keyword:
+            raise ValueError("informe a busca em q")
+        limit = self._int(params, 'limit', 20)
+        offset = self._int(params, 'offset', 0)
+        
+        viewer = self.server.viewer
+        with viewer.connection() as conn:
+            cursor, total = viewer.search_cursor(conn, keyword, params.get('source') or None, limit, offset)
+            count, _, _ = self._stream_jobs(cursor, {'q': keyword, 'total': total})
+        self._end_stream({'count': count, 'offset': offset})
+    
+    def summary(self, params):
+        summary = self.server.viewer.summary()
+        self._send_json({
+            'total': summary['total'],
+            'last_24h': summary['last_24h'],
+            'by_source': dict(summary['by_source']),
+            'by_day': dict(summary['by_day']),
+            'top_companies': dict(summary['top_companies']),
+        })
+    
+    def duplicates(self, params):
+        clusters = self.server.viewer.duplicate_clusters(limit=self._int(params, 'limit', 10))
+        if clusters is None:
+            self._send_json({'error': "índice de quase-duplicatas não encontrado"}, 404)
+            return
+        self._send_json([
+            {'cluster_id': cluster_id,
+             'jobs': [dict(zip(('id', 'source', 'title', 'company'), job)) for job in jobs]}
+            for cluster_id, jobs in clusters
+        ])
+    
+    ROUTES = {
+        '/jobs': jobs,
+        '/search': search,
+        '/summary': summary,
+        '/duplicates': duplicates,
+    }
+
+
+class QueryServer(ThreadingHTTPServer):
+    """Servidor HTTP (uma thread por conexão) com um SQLiteViewer compartilhado"""
+    
+    daemon_threads = True
+    
+    def __init__(self, db_path="jobs.db", host="127.0.0.1", port=8765, pool_size=4, cache_mb=64, mmap_mb=256):
+        self.viewer = SQLiteViewer(db_path, shared=True, pool_size=pool_size, cache_mb=cache_mb, mmap_mb=mmap_mb)
+        super().__init__((host, port), QueryHandler)
+    
+    def server_close(self):
+        super().server_close()
+        self.viewer.close()
+
+
+def serve(db_path="jobs.db", host="127.0.0.1", port=8765, pool_size=4):
+    """Atende a API até Ctrl+C"""
+    with QueryServer(db_path, host, port, pool_size) as server:
+        print(f"🌐 API de vagas em http://{host}:{server.server_port} ({pool_size} conexões, Ctrl+C encerra)")
+        try:
+            server.serve_forever()
+        except KeyboardInterrupt:
+            print("\n👋 Até logo!")
@@ -1,16 +1,144 @@
 import sqlite3
-import pandas as pd
-from datetime import datetime
 import os
+import queue
+import sys
+import threading
+from contextlib import contextmanager
+from urllib.parse import quote
+
+from scrapers.job_search import fts_match_sql, fts_query, rank_window, ranked_search_sql
+
+# pandas e openpyxl são importados só nas opções que os usam (view_with_pandas e
+# export_to_excel): as consultas rápidas e a linha de comando abrem sem eles
+
+class ReadOnlyPool:
+    """
+    Pequeno pool de conexões somente leitura (mode=ro + query_only) reaproveitadas.
+    
+    Cada conexão guarda entre uma consulta e outra o cache de páginas
+    (cache_size), os comandos já preparados (cached_statements) e o mapeamento
+    do arquivo (mmap_size). Cada empréstimo é uma transação de leitura: com o
+    banco em WAL, todas as consultas dela enxergam a mesma foto do banco,
+    mesmo com o scraper gravando ao mesmo tempo.
+    """
+    
+    def __init__(self, db_path, size=4, cache_mb=64, mmap_mb=256, cached_statements=256):
+        self.db_path = db_path
+        self.size = size
+        self.cache_mb = cache_mb
+        self.mmap_mb = mmap_mb
+        self.cached_statements = cached_statements
+        # LIFO: a conexão devolvida por último (cache mais quente) sai primeiro
+        self._idle = queue.LifoQueue()
+        self._opened = []
+        self._lock = threading.Lock()
+    
+    def _open(self):
+        uri = f"file:{quote(os.path.abspath(self.db_path))}?mode=ro"
+        conn = sqlite3.connect(uri, uri=True, isolation_level=None, check_same_thread=False,
+                               cached_statements=self.cached_statements)
+        conn.execute("PRAGMA query_only = ON")
+        conn.execute(f"PRAGMA cache_size = -{self.cache_mb * 1024}")
+        conn.execute(f"PRAGMA mmap_size = {self.mmap_mb * 1024 * 1024}")
+        return conn
+    
+    def _acquire(self):
+        try:
+            return self._idle.get_nowait()
+        except queue.Empty:
+            pass
+        with self._lock:
+            if len(self._opened) < self.size:
+                conn = self._open()
+                self._opened.append(conn)
+                return conn
+        return self._idle.get()
+    
+    @contextmanager
+    def connection(self):
+        """Empresta uma conexão dentro de uma transação de leitura"""
+        conn = self._acquire()
+        try:
+            conn.execute("BEGIN")
+            yield conn
+        finally:
+            if conn.in_transaction:
+                conn.execute("COMMIT")
+            self._idle.put(conn)
+    
+    def close(self):
+        with self._lock:
+            for conn in self._opened:
+                conn.close()
+            self._opened.clear()
+        self._idle = queue.LifoQueue()
+
 
 class SQLiteViewer:
-    def __init__(self, db_path="jobs.db"):
+    def __init__(self, db_path="jobs.db", shared=False, pool_size=4, cache_mb=64, mmap_mb=256):
+        """
+        Args:
+            shared: usa um ReadOnlyPool (conexões somente leitura mantidas abertas
+                entre as consultas) em vez de abrir uma conexão por consulta
+            pool_size, cache_mb, mmap_mb: tamanho do pool e cache/mmap por conexão
+        """
         self.db_path = db_path
+        self.pool = ReadOnlyPool(db_path, pool_size, cache_mb, mmap_mb) if shared else None
+        self._list_index_ready = False
     
-    def view_all_jobs(self, limit=None):
-        """Mostra todas as vagas de forma organizada"""
+    @contextmanager
+    def connection(self):
+        """Conexão para uma consulta: emprestada do pool ou aberta e fechada na hora"""
+        if self.pool:
+            with self.pool.connection() as conn:
+                yield conn
+            return
+        
         conn = sqlite3.connect(self.db_path)
+        try:
+            yield conn
+        finally:
+            conn.close()
+    
+    def close(self):
+        """Fecha as conexões do pool (modo compartilhado)"""
+        if self.pool:
+            self.pool.close()
+    
+    def _ensure_list_index(self, conn):
+        """Cria (uma vez) o índice usado na paginação por created_at/id"""
+        if self._list_index_ready or self.pool:
+            return
+        try:
+            # No esquema compacto jobs é uma view e o scraper já cria o índice em job_records
+            if conn.execute("SELECT 1 FROM sqlite_master WHERE type = 'table' AND name = 'jobs'").fetchone():
+                conn.execute("CREATE INDEX IF NOT EXISTS idx_jobs_created_at ON jobs(created_at DESC, id DESC)")
+                conn.commit()
+        except sqlite3.OperationalError:
+            pass  # banco somente leitura: segue sem o índice
+        self._list_index_ready = True
+    
+    def fetch_jobs_page(self, after=None, page_size=20):
+        """
+        Busca uma página de vagas, das mais recentes para as mais antigas (keyset)
+        
+        Em vez de OFFSET, continua a partir do cursor (created_at, id) da última
+        vaga da página anterior, o que vira uma leitura de intervalo no índice
+        idx_jobs_created_at. Retorna (vagas, cursor da próxima página ou None).
+        """
+        with self.connection() as conn:
+            self._ensure_list_index(conn)
+            # Uma vaga a mais só para saber se existe próxima página
+            rows = self.jobs_cursor(conn, after, page_size + 1).fetchall()
         
+        next_cursor = None
+        if len(rows) > page_size:
+            rows = rows[:page_size]
+            next_cursor = (rows[-1][6], rows[-1][0])
+        return [row[:6] for row in rows], next_cursor
+    
+    def jobs_cursor(self, conn, after=None, limit=None):
+        """Cursor das vagas mais recentes depois de after (created_at, id); limit None = todas"""
         query = """
         SELECT 
             id,
@@ -18,58 +146,151 @@ class SQLiteViewer:
             title,
             company,
             link,
-            datetime(created_at, 'localtime') as created_at
+            datetime(created_at, 'localtime'),
+            created_at
         FROM jobs 
-        ORDER BY created_at DESC
         """
+        params = []
         
+        if after:
+            query += " WHERE (created_at, id) < (?, ?)"
+            params += list(after)
+        
+        query += " ORDER BY created_at DESC, id DESC LIMIT ?"
+        params.append(limit if limit else -1)
+        
+        return conn.execute(query, params)
+    
+    def iter_job_pages(self, page_size=20):
+        """Gerador com as páginas de vagas (lista de tuplas), da mais recente à mais antiga"""
+        cursor = None
+        while True:
+            jobs, cursor = self.fetch_jobs_page(cursor, page_size)
+            if jobs:
+                yield jobs
+            if cursor is None:
+                break
+    
+    def _print_jobs(self, jobs):
+        """Escreve uma página de vagas de uma vez só (um único write no terminal)"""
+        lines = []
+        for id_job, source, title, company, link, created_at in jobs:
+            lines += [
+                f"ID: {id_job}",
+                f"📍 Fonte: {source}",
+                f"💼 Título: {title}",
+                f"🏢 Empresa: {company}",
+                f"🔗 Link: {link if link else 'N/A'}",
+                f"📅 Data: {created_at}",
+                "-" * 100,
+            ]
+        sys.stdout.write("\n".join(lines) + "\n")
+        sys.stdout.flush()
+    
+    def view_all_jobs(self, limit=None):
+        """Mostra as vagas mais recentes (todas, página a página, se limit for None)"""
         if limit:
-            query += f" LIMIT {limit}"
+            jobs, _ = self.fetch_jobs_page(page_size=limit)
+            pages = [jobs] if jobs else []
+        else:
+            pages = self.iter_job_pages(page_size=500)
         
-        cursor = conn.cursor()
-        cursor.execute(query)
-        jobs = cursor.fetchall()
-        conn.close()
+        shown = 0
+        for jobs in pages:
+            if not shown:
+                print(f"📊 Vagas mais recentes{f' (até {limit})' if limit else ''}:")
+                print("=" * 100)
+            self._print_jobs(jobs)
+            shown += len(jobs)
         
-        if not jobs:
+        if not shown:
             print("❌ Nenhuma vaga encontrada no banco!")
             return
         
-        print(f"📊 Total de vagas encontradas: {len(jobs)}")
-        print("=" * 100)
-        
-        for job in jobs:
-            id_job, source, title, company, link, created_at = job
-            print(f"ID: {id_job}")
-            print(f"📍 Fonte: {source}")
-            print(f"💼 Título: {title}")
-            print(f"🏢 Empresa: {company}")
-            print(f"🔗 Link: {link if link else 'N/A'}")
-            print(f"📅 Data: {created_at}")
-            print("-" * 100)
+        print(f"📊 Total de vagas mostradas: {shown}")
     
-    def view_summary(self):
-        """Mostra um resumo estatístico das vagas"""
-        conn = sqlite3.connect(self.db_path)
-        cursor = conn.cursor()
+    def browse_jobs(self, page_size=20):
+        """Navegação interativa página a página (próxima/anterior)"""
+        # Pilha com o cursor de início de cada página já vista
+        starts = [None]
+        page_number = 1
         
-        # Total geral
-        cursor.execute("SELECT COUNT(*) FROM jobs")
-        total = cursor.fetchone()[0]
+        while True:
+            jobs, next_cursor = self.fetch_jobs_page(starts[-1], page_size)
+            if not jobs:
+                print("❌ Nenhuma vaga encontrada no banco!")
+                return
+            
+            print(f"\n📄 Página {page_number} ({len(jobs)} vagas)")
+            print("=" * 100)
+            self._print_jobs(jobs)
+            
+            options = []
+            if next_cursor:
+                options.append("[p]róxima")
+            if len(starts) > 1:
+                options.append("[a]nterior")
+            options.append("[s]air")
+            
+            choice = input(" / ".join(options) + ": ").strip().lower()
+            if choice == 'p' and next_cursor:
+                starts.append(next_cursor)
+                page_number += 1
+            elif choice == 'a' and len(starts) > 1:
+                starts.pop()
+                page_number -= 1
+            elif choice == 's':
+                return
+    
+    def summary(self):
+        """Resumo estatístico: total, últimas 24h, por fonte, por dia e top 10 empresas"""
+        with self.connection() as conn:
+            return self._summary(conn.cursor())
+    
+    def _summary(self, cursor):
+        cursor.execute("SELECT 1 FROM sqlite_master WHERE type = 'table' AND name = 'stats_by_source'")
+        has_stats = cursor.fetchone() is not None
         
-        # Por fonte
-        cursor.execute("SELECT source, COUNT(*) FROM jobs GROUP BY source ORDER BY COUNT(*) DESC")
-        by_source = cursor.fetchall()
+        if has_stats:
+            # Tabelas de estatísticas mantidas por triggers: não varre a tabela jobs
+            cursor.execute("SELECT source, count FROM stats_by_source ORDER BY count DESC")
+            by_source = cursor.fetchall()
+            total = sum(count for _, count in by_source)
+            
+            cursor.execute("SELECT company, count FROM stats_by_company ORDER BY count DESC LIMIT 10")
+            top_companies = cursor.fetchall()
+            
+            cursor.execute("SELECT day, count FROM stats_by_day ORDER BY day DESC LIMIT 7")
+            by_day = cursor.fetchall()
+        else:
+            # Banco antigo (sem as tabelas de estatísticas)
+            cursor.execute("SELECT COUNT(*) FROM jobs")
+            total = cursor.fetchone()[0]
+            
+            cursor.execute("SELECT source, COUNT(*) FROM jobs GROUP BY source ORDER BY COUNT(*) DESC")
+            by_source = cursor.fetchall()
+            
+            cursor.execute("SELECT company, COUNT(*) as count FROM jobs GROUP BY company ORDER BY count DESC LIMIT 10")
+            top_companies = cursor.fetchall()
+            by_day = []
         
-        # Últimas 24 horas
-        cursor.execute("SELECT COUNT(*) FROM jobs WHERE datetime(created_at) > datetime('now', '-1 day')")
+        # Últimas 24 horas: comparação direta com created_at (usa o índice idx_jobs_created_at)
+        cursor.execute("SELECT COUNT(*) FROM jobs WHERE created_at > datetime('now', '-1 day')")
         last_24h = cursor.fetchone()[0]
         
-        # Empresas mais ativas
-        cursor.execute("SELECT company, COUNT(*) as count FROM jobs GROUP BY company ORDER BY count DESC LIMIT 10")
-        top_companies = cursor.fetchall()
-        
-        conn.close()
+        return {
+            'total': total,
+            'last_24h': last_24h,
+            'by_source': by_source,
+            'by_day': by_day,
+            'top_companies': top_companies,
+        }
+    
+    def view_summary(self):
+        """Mostra um resumo estatístico das vagas"""
+        summary = self.summary()
+        total, last_24h = summary['total'], summary['last_24h']
+        by_source, by_day, top_companies = summary['by_source'], summary['by_day'], summary['top_companies']
         
         print("📈 RESUMO DAS VAGAS")
         print("=" * 50)
@@ -82,40 +303,129 @@ class SQLiteViewer:
             print(f"  {source}: {count} vagas")
         print()
         
+        if by_day:
+            print("📅 Por dia (últimos 7 com vagas):")
+            for day, count in by_day:
+                print(f"  {day}: {count} vagas")
+            print()
+        
         print("🏢 Top 10 empresas:")
         for company, count in top_companies:
             print(f"  {company}: {count} vagas")
     
-    def search_jobs(self, keyword, source=None):
-        """Busca vagas por palavra-chave"""
-        conn = sqlite3.connect(self.db_path)
+    def duplicate_clusters(self, limit=10, min_size=2):
+        """
+        Maiores grupos de vagas quase-duplicadas (índice MinHash do scraper):
+        [(cluster_id, [(id, source, title, company), ...])], ou None sem o índice
+        """
+        with self.connection() as conn:
+            cursor = conn.cursor()
+            cursor.execute("SELECT 1 FROM sqlite_master WHERE type = 'table' AND name = 'job_minhash'")
+            if cursor.fetchone() is None:
+                return None
+            
+            cursor.execute("""
+                SELECT cluster_id FROM job_minhash
+                GROUP BY cluster_id HAVING COUNT(*) >= ?
+                ORDER BY COUNT(*) DESC, cluster_id
+                LIMIT ?
+            """, (min_size, limit))
+            clusters = []
+            for (cluster_id,) in cursor.fetchall():
+                cursor.execute("""
+                    SELECT j.id, j.source, j.title, j.company
+                    FROM job_minhash m JOIN jobs j ON j.id = m.job_id
+                    WHERE m.cluster_id = ?
+                    ORDER BY j.id
+                """, (cluster_id,))
+                clusters.append((cluster_id, cursor.fetchall()))
+        return clusters
+    
+    def view_duplicate_clusters(self, limit=10, min_size=2):
+        """Mostra os maiores grupos de vagas quase-duplicadas (índice MinHash do scraper)"""
+        clusters = self.duplicate_clusters(limit, min_size)
+        if clusters is None:
+            print("❌ Índice de quase-duplicatas não encontrado. Rode o scraper para criá-lo.")
+            return
+        
+        print(f"🧬 GRUPOS DE QUASE-DUPLICATAS (até {limit})")
+        print("=" * 80)
+        if not clusters:
+            print("Nenhum grupo encontrado.")
+        
+        for cluster_id, jobs in clusters:
+            print(f"\n📦 Grupo {cluster_id} ({len(jobs)} vagas):")
+            for job_id, source, title, company in jobs:
+                print(f"  [{job_id}] {title} | {company} ({source})")
+    
+    def _has_fts(self, cursor):
+        """Verifica se o banco já tem o índice FTS5 (criado pelo scraper)"""
+        cursor.execute("SELECT 1 FROM sqlite_master WHERE type = 'table' AND name = 'jobs_fts'")
+        return cursor.fetchone() is not None
+    
+    def find_jobs(self, keyword, source=None, limit=20, offset=0):
+        """Busca vagas por palavra-chave: (vagas, total de resultados)"""
+        with self.connection() as conn:
+            cursor, total = self.search_cursor(conn, keyword, source, limit, offset)
+            return cursor.fetchall(), total
+    
+    def search_cursor(self, conn, keyword, source=None, limit=20, offset=0):
+        """
+        Executa a busca e devolve (cursor com as vagas, total de resultados)
+        
+        Usa o índice FTS5, que ignora acentos e maiúsculas; sem o índice (banco
+        antigo) ou com termos como "c++", usa LIKE.
+        """
         cursor = conn.cursor()
         
-        if source:
-            query = """
-            SELECT id, source, title, company, link, datetime(created_at, 'localtime') as created_at
-            FROM jobs 
-            WHERE (title LIKE ? OR company LIKE ?) AND source = ?
-            ORDER BY created_at DESC
-            """
-            cursor.execute(query, (f"%{keyword}%", f"%{keyword}%", source))
+        match = fts_query(keyword)
+        columns = """
+        SELECT jobs.id, jobs.source, jobs.title, jobs.company, jobs.link,
+               datetime(jobs.created_at, 'localtime') as created_at
+        """
+        
+        if match and self._has_fts(cursor):
+            params = [match] + ([source] if source else [])
+            
+            cursor.execute("SELECT COUNT(*) " + fts_match_sql(source), params)
+            total = cursor.fetchone()[0]
+            
+            # Relevância (bm25) entre as vagas mais recentes que casam com a busca
+            cursor.execute(ranked_search_sql(columns, source),
+                           params + [rank_window(limit, offset), limit if limit else -1, offset])
         else:
-            query = """
-            SELECT id, source, title, company, link, datetime(created_at, 'localtime') as created_at
-            FROM jobs 
-            WHERE title LIKE ? OR company LIKE ?
-            ORDER BY created_at DESC
+            base = """
+            FROM jobs
+            WHERE (title LIKE ? OR company LIKE ?)
             """
-            cursor.execute(query, (f"%{keyword}%", f"%{keyword}%"))
+            params = [f"%{keyword}%", f"%{keyword}%"]
+            
+            if source:
+                base += " AND jobs.source = ?"
+                params.append(source)
+            
+            cursor.execute("SELECT COUNT(*) " + base, params)
+            total = cursor.fetchone()[0]
+            
+            cursor.execute(columns + base + " ORDER BY jobs.created_at DESC LIMIT ? OFFSET ?",
+                           params + [limit if limit else -1, offset])
         
-        results = cursor.fetchall()
-        conn.close()
+        return cursor, total
+    
+    def search_jobs(self, keyword, source=None, limit=20, offset=0):
+        """
+        Busca vagas por palavra-chave (mais relevantes primeiro, paginado)
+        
+        Mostra uma página de resultados e retorna o total de resultados.
+        """
+        results, total = self.find_jobs(keyword, source, limit, offset)
         
         if not results:
             print(f"❌ Nenhuma vaga encontrada para '{keyword}'")
-            return
+            return total
         
-        print(f"🔍 Resultados para '{keyword}': {len(results)} vagas")
+        print(f"🔍 Resultados para '{keyword}': {total} vagas "
+              f"(mostrando {offset + 1}-{offset + len(results)})")
         print("=" * 100)
         
         for job in results:
@@ -127,54 +437,88 @@ class SQLiteViewer:
             if link:
                 print(f"🔗 {link}")
             print("-" * 100)
+        
+        return total
+    
+    # Limite de linhas de uma planilha do Excel (sem contar o cabeçalho)
+    EXCEL_MAX_ROWS = 1048575
     
-    def export_to_excel(self, filename="vagas.xlsx"):
-        """Exporta para Excel usando pandas"""
+    def export_to_excel(self, filename="vagas.xlsx", chunk_size=5000):
+        """
+        Exporta para Excel em modo streaming (openpyxl write-only)
+        
+        As vagas são lidas do cursor em blocos e escritas direto no arquivo,
+        então a memória não cresce com o tamanho da tabela. Acima do limite de
+        linhas do Excel, continua em novas abas.
+        """
+        try:
+            from openpyxl import Workbook
+        except ImportError:
+            print("❌ Para exportar Excel, instale: pip install openpyxl")
+            return
+        
+        header = ['Fonte', 'Título', 'Empresa', 'Link', 'Data Criação']
+        
         try:
-            conn = sqlite3.connect(self.db_path)
-            
-            # Carrega dados em DataFrame
-            df = pd.read_sql_query("""
-                SELECT 
-                    source as 'Fonte',
-                    title as 'Título',
-                    company as 'Empresa',
-                    link as 'Link',
-                    datetime(created_at, 'localtime') as 'Data Criação'
-                FROM jobs 
-                ORDER BY created_at DESC
-            """, conn)
+            workbook = Workbook(write_only=True)
+            sheet = None
+            sheet_rows = 0
+            total = 0
             
-            conn.close()
+            with self.connection() as conn:
+                cursor = conn.cursor()
+                cursor.execute("""
+                    SELECT 
+                        source,
+                        title,
+                        company,
+                        link,
+                        datetime(created_at, 'localtime')
+                    FROM jobs 
+                    ORDER BY created_at DESC
+                """)
+                
+                while True:
+                    rows = cursor.fetchmany(chunk_size)
+                    if not rows:
+                        break
+                    
+                    for row in rows:
+                        if sheet is None or sheet_rows >= self.EXCEL_MAX_ROWS:
+                            sheet = workbook.create_sheet(f"Vagas {len(workbook.worksheets) + 1}")
+                            sheet.append(header)
+                            sheet_rows = 0
+                        sheet.append(row)
+                        sheet_rows += 1
+                    total += len(rows)
+            
+            if sheet is None:
+                workbook.create_sheet("Vagas 1").append(header)
             
-            # Salva em Excel
-            df.to_excel(filename, index=False, engine='openpyxl')
+            workbook.save(filename)
             print(f"✅ Dados exportados para {filename}")
-            print(f"📊 Total de {len(df)} vagas exportadas")
+            print(f"📊 Total de {total} vagas exportadas")
             
-        except ImportError:
-            print("❌ Para exportar Excel, instale: pip install pandas openpyxl")
         except Exception as e:
             print(f"❌ Erro ao exportar: {e}")
     
     def view_with_pandas(self):
         """Visualiza usando pandas (mais bonito)"""
         try:
-            conn = sqlite3.connect(self.db_path)
-            
-            df = pd.read_sql_query("""
-                SELECT 
-                    id as 'ID',
-                    source as 'Fonte',
-                    title as 'Título',
-                    company as 'Empresa',
-                    datetime(created_at, 'localtime') as 'Data'
-                FROM jobs 
-                ORDER BY created_at DESC
-                LIMIT 20
-            """, conn)
+            import pandas as pd
             
-            conn.close()
+            with self.connection() as conn:
+                df = pd.read_sql_query("""
+                    SELECT 
+                        id as 'ID',
+                        source as 'Fonte',
+                        title as 'Título',
+                        company as 'Empresa',
+                        datetime(created_at, 'localtime') as 'Data'
+                    FROM jobs 
+                    ORDER BY created_at DESC
+                    LIMIT 20
+                """, conn)
             
             print("📋 ÚLTIMAS 20 VAGAS (com pandas):")
             print("=" * 100)
@@ -202,7 +546,8 @@ class SQLiteViewer:
             print("3. Buscar vagas por palavra-chave")
             print("4. Ver com pandas (bonito)")
             print("5. Exportar para Excel")
-            print("6. Ver todas (sem limite)")
+            print("6. Ver todas (página a página)")
+            print("7. Ver vagas quase-duplicadas")
             print("0. Sair")
             print("-"*50)
             
@@ -219,7 +564,16 @@ class SQLiteViewer:
                 if keyword:
                     source = input("Fonte específica (Enter para todas): ").strip()
                     source = source if source else None
-                    self.search_jobs(keyword, source)
+                    
+                    offset = 0
+                    while True:
+                        total = self.search_jobs(keyword, source, limit=20, offset=offset)
+                        offset += 20
+                        if offset >= total:
+                            break
+                        more = input(f"Ver próximas vagas ({offset}/{total})? (s/N): ")
+                        if more.lower() != 's':
+                            break
             
             elif choice == "4":
                 self.view_with_pandas()
@@ -230,9 +584,10 @@ class SQLiteViewer:
                 self.export_to_excel(filename)
             
             elif choice == "6":
-                confirm = input("⚠️  Isso pode mostrar muitas vagas. Continuar? (s/N): ")
-                if confirm.lower() == 's':
-                    self.view_all_jobs()
+                self.browse_jobs()
+            
+            elif choice == "7":
+                self.view_duplicate_clusters()
             
             elif choice == "0":
                 print("👋 Até logo!")
@@ -248,20 +603,26 @@ class SQLiteViewer:
 # FUNÇÕES RÁPIDAS PARA USAR NO TERMINAL
 # ============================================
 
+_shared_viewers = {}
+
+def shared_viewer(db_path="jobs.db"):
+    """Viewer em modo compartilhado (conexões somente leitura abertas), um por banco"""
+    viewer = _shared_viewers.get(db_path)
+    if viewer is None:
+        viewer = _shared_viewers[db_path] = SQLiteViewer(db_path, shared=True)
+    return viewer
+
 def quick_view(db_path="jobs.db", limit=10):
     """Visualização rápida - use: quick_view()"""
-    viewer = SQLiteViewer(db_path)
-    viewer.view_all_jobs(limit)
+    shared_viewer(db_path).view_all_jobs(limit)
 
 def quick_search(keyword, db_path="jobs.db"):
     """Busca rápida - use: quick_search('python')"""
-    viewer = SQLiteViewer(db_path)
-    viewer.search_jobs(keyword)
+    shared_viewer(db_path).search_jobs(keyword)
 
 def quick_summary(db_path="jobs.db"):
     """Resumo rápido - use: quick_summary()"""
-    viewer = SQLiteViewer(db_path)
-    viewer.view_summary()
+    shared_viewer(db_path).view_summary()
 
 def check_database(db_path="jobs.db"):
     """Verifica se o banco existe e tem dados"""
@@ -292,18 +653,81 @@ def check_database(db_path="jobs.db"):
         return False
 
 
+# ============================================
+# LINHA DE COMANDO
+# ============================================
+
+def main(argv=None):
+    """
+    Linha de comando: python query_db.py [--db jobs.db] <comando>
+    
+    Comandos: view, search, summary, check, export, duplicates e serve (API
+    HTTP/JSON, em query_api.py); sem comando, abre o menu interativo. Só export
+    carrega o openpyxl.
+    """
+    import argparse
+    
+    parser = argparse.ArgumentParser(description="Consulta o banco de vagas do scraper")
+    parser.add_argument('--db', default="jobs.db", help="arquivo do banco (padrão: jobs.db)")
+    commands = parser.add_subparsers(dest='command')
+    
+    view = commands.add_parser('view', help="últimas vagas")
+    view.add_argument('--limit', type=int, default=10, help="quantas vagas (0 = todas)")
+    
+    search = commands.add_parser('search', help="busca por palavra-chave")
+    search.add_argument('keyword')
+    search.add_argument('--source', help="só vagas desta fonte")
+    search.add_argument('--limit', type=int, default=20)
+    search.add_argument('--offset', type=int, default=0)
+    
+    commands.add_parser('summary', help="resumo estatístico")
+    commands.add_parser('check', help="confere se o banco existe e tem vagas")
+    
+    export = commands.add_parser('export', help="exporta para Excel")
+    export.add_argument('filename', nargs='?', default="vagas.xlsx")
+    
+    duplicates = commands.add_parser('duplicates', help="grupos de vagas quase-duplicadas")
+    duplicates.add_argument('--limit', type=int, default=10)
+    
+    serve = commands.add_parser('serve', help="API HTTP/JSON com conexões somente leitura compartilhadas")
+    serve.add_argument('--host', default="127.0.0.1")
+    serve.add_argument('--port', type=int, default=8765)
+    serve.add_argument('--pool', type=int, default=4, help="conexões abertas com o banco")
+    
+    args = parser.parse_args(argv)
+    
+    # Banco inexistente: só avisa (sqlite3.connect criaria um arquivo vazio)
+    if args.command == 'check' or not os.path.exists(args.db):
+        return 0 if check_database(args.db) else 1
+    
+    viewer = SQLiteViewer(args.db)
+    if args.command == 'view':
+        viewer.view_all_jobs(limit=args.limit or None)
+    elif args.command == 'search':
+        viewer.search_jobs(args.keyword, args.source, limit=args.limit, offset=args.offset)
+    elif args.command == 'summary':
+        viewer.view_summary()
+    elif args.command == 'export':
+        viewer.export_to_excel(args.filename)
+    elif args.command == 'duplicates':
+        viewer.view_duplicate_clusters(limit=args.limit)
+    elif args.command == 'serve':
+        from query_api import serve
+        serve(args.db, args.host, args.port, args.pool)
+    elif check_database(args.db):
+        viewer.interactive_menu()
+    return 0
+
+
 # ============================================
 # EXEMPLO DE USO
 # ============================================
 
 if __name__ == "__main__":
-    # Verifica se o banco existe
-    if check_database():
-        # Inicia o menu interativo
-        viewer = SQLiteViewer()
-        viewer.interactive_menu()
-    
+    # Sem argumentos abre o menu interativo; veja python query_db.py --help
+    # (ex.: python query_db.py search python --limit 5)
     # Ou use as funções rápidas:
     # quick_view()           # Ver últimas 10 vagas
     # quick_search("python") # Buscar vagas com "python"
-    # quick_summary()        # Ver estatísticas
\ No newline at end of file
+    # quick_summary()        # Ver estatísticas
+    sys.exit(main())
@@ -0,0 +1 @@
+"""Scrapers de vagas e o código compartilhado por eles (busca, banco, HTTP)."""
@@ -0,0 +1,269 @@
+"""
+Acesso HTTP compartilhado pelos scrapers: sessão com pool de conexões,
+novas tentativas e limite de taxa por host (HttpClient, TokenBucket), e o
+cache em disco dos validadores das páginas de busca (ResponseCache).
+"""
+import requests
+from requests.adapters import HTTPAdapter
+import hashlib
+import json
+from collections import namedtuple
+from datetime import datetime, timezone
+from email.utils import parsedate_to_datetime
+import os
+import random
+import threading
+import time
+from urllib.parse import urlsplit
+
+# Página baixada; content é None quando ela não mudou desde a última coleta (cache)
+FetchedPage = namedtuple('FetchedPage', 'url content etag last_modified content_hash not_modified filter_key')
+
+
+class TokenBucket:
+    """Limitador de taxa no estilo token bucket (thread-safe)"""
+    
+    def __init__(self, rate, capacity=None):
+        self.rate = float(rate)
+        self.capacity = float(capacity or max(1.0, rate))
+        self.tokens = self.capacity
+        self.updated = time.monotonic()
+        self.lock = threading.Lock()
+    
+    def acquire(self):
+        """Bloqueia até existir um token disponível e o consome"""
+        while True:
+            with self.lock:
+                now = time.monotonic()
+                self.tokens = min(self.capacity, self.tokens + (now - self.updated) * self.rate)
+                self.updated = now
+                
+                if self.tokens >= 1:
+                    self.tokens -= 1
+                    return
+                
+                wait = (1 - self.tokens) / self.rate
+            time.sleep(wait)
+
+
+class HttpClient:
+    """
+    Camada de download com sessão persistente (keep-alive e pool de conexões),
+    novas tentativas com backoff exponencial + jitter em 429/5xx/timeouts,
+    respeito ao cabeçalho Retry-After e limite de taxa por host.
+    """
+    
+    DEFAULT_HEADERS = {
+        'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36'
+    }
+    RETRY_STATUSES = {429, 500, 502, 503, 504}
+    
+    def __init__(self, pool_size=10, max_retries=3, backoff_factor=0.5, max_backoff=30.0,
+                 rate_limit=None, burst=None, timeout=10):
+        """
+        Args:
+            pool_size: conexões mantidas abertas por host
+            max_retries: novas tentativas após a primeira falha
+            backoff_factor: espera base (s) do backoff exponencial
+            max_backoff: espera máxima (s) entre tentativas, inclusive via Retry-After
+            rate_limit: requisições por segundo permitidas por host (None = sem limite)
+            burst: rajada máxima do token bucket (padrão: igual a rate_limit)
+            timeout: timeout (s) de cada requisição
+        """
+        self.max_retries = max_retries
+        self.backoff_factor = backoff_factor
+        self.max_backoff = max_backoff
+        self.rate_limit = rate_limit
+        self.burst = burst
+        self.timeout = timeout
+        
+        self.session = requests.Session()
+        self.session.headers.update(self.DEFAULT_HEADERS)
+        self.pool_size = 0
+        self.resize_pool(pool_size)
+        
+        self._buckets = {}
+        self._lock = threading.Lock()
+        self.retries = 0
+        
+        # Respostas recebidas por código HTTP (inclusive as que geraram nova tentativa)
+        self.status_counts = {}
+    
+    def resize_pool(self, pool_size):
+        """Ajusta o tamanho do pool de conexões (só cresce)"""
+        if pool_size <= self.pool_size:
+            return
+        
+        self.pool_size = pool_size
+        # As novas tentativas são feitas aqui, não pelo urllib3
+        adapter = HTTPAdapter(pool_connections=pool_size, pool_maxsize=pool_size, max_retries=0)
+        self.session.mount('http://', adapter)
+        self.session.mount('https://', adapter)
+    
+    def _bucket(self, url):
+        """Retorna o token bucket do host da URL (ou None se não houver limite)"""
+        if not self.rate_limit:
+            return None
+        
+        host = urlsplit(url).netloc
+        with self._lock:
+            if host not in self._buckets:
+                self._buckets[host] = TokenBucket(self.rate_limit, self.burst)
+            return self._buckets[host]
+    
+    def _backoff(self, attempt):
+        """Espera exponencial com jitter para a tentativa informada"""
+        delay = min(self.max_backoff, self.backoff_factor * (2 ** attempt))
+        return random.uniform(delay / 2, delay)
+    
+    def _retry_after(self, response):
+        """Lê o cabeçalho Retry-After (segundos ou data HTTP), se existir"""
+        value = response.headers.get('Retry-After')
+        if not value:
+            return None
+        
+        try:
+            delay = float(value)
+        except ValueError:
+            try:
+                retry_at = parsedate_to_datetime(value)
+            except (TypeError, ValueError):
+                return None
+            delay = (retry_at - datetime.now(timezone.utc)).total_seconds()
+        
+        return min(self.max_backoff, max(0.0, delay))
+    
+    def get(self, url, **kwargs):
+        """GET com limite de taxa e novas tentativas; devolve a última resposta obtida"""
+        kwargs.setdefault('timeout', self.timeout)
+        bucket = self._bucket(url)
+        
+        for attempt in range(self.max_retries + 1):
+            if bucket:
+                bucket.acquire()
+            
+            try:
+                response = self.session.get(url, **kwargs)
+            except (requests.Timeout, requests.ConnectionError):
+                if attempt == self.max_retries:
+                    raise
+                delay = self._backoff(attempt)
+            else:
+                with self._lock:
+                    self.status_counts[response.status_code] = self.status_counts.get(response.status_code, 0) + 1
+                if response.status_code not in self.RETRY_STATUSES or attempt == self.max_retries:
+                    return response
+                
+                delay = self._retry_after(response)
+                if delay is None:
+                    delay = self._backoff(attempt)
+                response.close()
+            
+            with self._lock:
+                self.retries += 1
+            time.sleep(delay)
+    
+    def close(self):
+        """Fecha as conexões abertas da sessão"""
+        self.session.close()
+
+
+class ResponseCache:
+    """
+    Cache em disco dos validadores das páginas de busca, para requisições condicionais.
+    
+    Para cada URL guarda só um .json com ETag, Last-Modified, o hash do
+    conteúdo e o do filtro (site e palavras-chave) com que ela foi
+    processada: uma página que não mudou nem é processada de novo com o
+    mesmo filtro, então o corpo não precisa ficar no disco. Entradas sem uso há mais de max_age
+    segundos são apagadas, e as mais antigas saem primeiro quando o cache
+    passa de max_bytes.
+    """
+    
+    def __init__(self, cache_dir, max_bytes=16 * 1024 * 1024, max_age=7 * 24 * 3600):
+        self.cache_dir = cache_dir
+        self.max_bytes = max_bytes
+        self.max_age = max_age
+        self._lock = threading.Lock()
+        os.makedirs(cache_dir, exist_ok=True)
+    
+    def _path(self, url):
+        key = hashlib.sha1(url.encode('utf-8')).hexdigest()
+        return os.path.join(self.cache_dir, key + '.json')
+    
+    def get(self, url):
+        """Retorna os metadados da URL (etag, last_modified, content_hash, filter_key) ou None"""
+        meta_path = self._path(url)
+        try:
+            if time.time() - os.path.getmtime(meta_path) > self.max_age:
+                return None
+            with open(meta_path, encoding='utf-8') as file:
+                return json.load(file)
+        except (OSError, ValueError):
+            return None
+    
+    def put(self, url, content_hash, etag=None, last_modified=None, filter_key=None):
+        """Grava os metadados da URL"""
+        meta_path = self._path(url)
+        meta = {
+            'url': url,
+            'etag': etag,
+            'last_modified': last_modified,
+            'content_hash': content_hash,
+            'filter_key': filter_key,
+        }
+        
+        with self._lock:
+            # Grava em um .tmp e troca: nunca fica um .json pela metade
+            tmp_path = meta_path + '.tmp'
+            with open(tmp_path, 'w', encoding='utf-8') as file:
+                json.dump(meta, file)
+            os.replace(tmp_path, meta_path)
+    
+    def touch(self, url):
+        """Marca a entrada como revalidada agora (renova a idade dela)"""
+        try:
+            os.utime(self._path(url))
+        except OSError:
+            pass
+    
+    def evict(self):
+        """Aplica a política de idade e tamanho; retorna quantas entradas foram apagadas"""
+        with self._lock:
+            entries = []
+            for name in os.listdir(self.cache_dir):
+                if not name.endswith('.json'):
+                    continue
+                path = os.path.join(self.cache_dir, name)
+                try:
+                    mtime = os.path.getmtime(path)
+                    size = os.path.getsize(path)
+                except OSError:
+                    size = 0
+                    mtime = 0
+                entries.append((mtime, size, path))
+            
+            # Mais antigas primeiro
+            entries.sort()
+            total = sum(entry[1] for entry in entries)
+            now = time.time()
+            removed = 0
+            
+            for mtime, size, path in entries:
+                if now - mtime <= self.max_age and total <= self.max_bytes:
+                    break
+                try:
+                    os.remove(path)
+                except OSError:
+                    pass
+                total -= size
+                removed += 1
+            
+            return removed
+    
+    def clear(self):
+        """Apaga todo o cache"""
+        with self._lock:
+            for name in os.listdir(self.cache_dir):
+                if name.endswith(('.json', '.tmp')):
+                    os.remove(os.path.join(self.cache_dir, name))
@@ -0,0 +1,65 @@
+"""
+Busca de vagas por palavra-chave no índice FTS5 (jobs_fts), usada pelo
+scraper (JobScraper.search_jobs) e pelo visualizador (query_db.py).
+
+Só depende de re: o query_db importa este módulo na partida, que precisa
+continuar rápida.
+"""
+import re
+
+# Quantas vagas (as mais recentes que casam com a busca) são ordenadas por relevância
+SEARCH_RANK_WINDOW = 2000
+
+
+def fts_query(keyword):
+    """
+    Monta a expressão MATCH do FTS5 para o texto buscado: cada palavra vira
+    um prefixo entre aspas, todas obrigatórias. Retorna None quando o texto
+    tem símbolos que o tokenizer descartaria ("c++", "c#"), para usar LIKE.
+    """
+    if not keyword or re.search(r'[^\w\s-]', keyword):
+        return None
+    
+    tokens = re.findall(r'\w+', keyword)
+    if not tokens:
+        return None
+    return ' '.join(f'"{token}"*' for token in tokens)
+
+
+def fts_match_sql(source=None):
+    """
+    Trecho FROM/WHERE das vagas que casam com a busca (e com a fonte, se
+    source for informada). Parâmetros: expressão MATCH e, com source, a fonte.
+    """
+    source_join = "JOIN jobs ON jobs.id = jobs_fts.rowid" if source else ""
+    source_filter = "AND jobs.source = ?" if source else ""
+    return f"FROM jobs_fts {source_join} WHERE jobs_fts MATCH ? {source_filter}"
+
+
+def ranked_search_sql(columns, source=None):
+    """
+    Consulta da busca ordenada por relevância (bm25) entre as vagas mais
+    recentes que casam, para o tempo não crescer com a tabela.
+    
+    columns é o SELECT sobre jobs. Parâmetros: os de fts_match_sql, a janela
+    (rank_window), LIMIT e OFFSET.
+    """
+    return f"""
+        {columns}
+        FROM (
+            SELECT jobs_fts.rowid AS id, jobs_fts.rank AS rank
+            {fts_match_sql(source)}
+            ORDER BY jobs_fts.rowid DESC
+            LIMIT ?
+        ) AS matches
+        JOIN jobs ON jobs.id = matches.id
+        ORDER BY matches.rank, jobs.id DESC
+        LIMIT ? OFFSET ?
+    """
+
+
+def rank_window(limit, offset=0):
+    """Vagas ranqueadas por busca: pelo menos SEARCH_RANK_WINDOW (-1 = todas, quando limit é None ou 0)"""
+    if not limit:
+        return -1
+    return max(SEARCH_RANK_WINDOW, offset + limit)
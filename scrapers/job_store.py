@@ -0,0 +1,802 @@
+"""
+Banco SQLite das vagas (SQLiteJobStore): esquema compacto, gravação em
+lote, deduplicação por hash (KnownHashIndex), diário de coletas, marcas
+d'água, detalhes das vagas e agenda do modo daemon.
+"""
+import sqlite3
+import hashlib
+import heapq
+import json
+import re
+from array import array
+from bisect import bisect_left
+from contextlib import contextmanager
+from datetime import datetime
+import os
+
+
+def job_hash(title, company, source):
+    """
+    Gera um hash único baseado no título, empresa e fonte (MD5, 32 dígitos).
+    
+    O banco guarda só hash_key(job_hash): a coluna job_hash da view jobs
+    mostra os 16 primeiros dígitos deste valor, não ele inteiro.
+    """
+    # Normaliza os textos para evitar duplicatas por diferenças mínimas
+    normalized_title = re.sub(r'\s+', ' ', title.lower().strip())
+    normalized_company = re.sub(r'\s+', ' ', company.lower().strip())
+    
+    hash_input = f"{source}:{normalized_title}:{normalized_company}"
+    return hashlib.md5(hash_input.encode('utf-8')).hexdigest()
+
+
+def hash_key(job_hash):
+    """
+    Chave gravada no banco para o hash: os primeiros 64 bits, como inteiro
+    com sinal (o formato de INTEGER do SQLite). A view jobs mostra a mesma
+    chave em hexadecimal, com 16 dígitos.
+    """
+    key = int(job_hash[:16], 16)
+    return key - (1 << 64) if key >= 1 << 63 else key
+
+
+class KnownHashIndex:
+    """
+    Conjunto compacto, em memória, dos job_hash já gravados.
+    
+    Guarda só os primeiros 64 bits de cada hash MD5 (a mesma chave inteira
+    gravada em job_records.hash_key) em um array ordenado (8 bytes por vaga,
+    ~8 MB para 1 milhão de vagas) e usa busca binária.
+    As vagas inseridas durante a execução ficam em um set pequeno que é
+    incorporado ao array quando passa de merge_threshold. A chance de duas
+    vagas diferentes colidirem nos 64 bits é desprezível (~1e-7 com 10 milhões).
+    """
+    
+    def __init__(self, merge_threshold=50000):
+        self.merge_threshold = merge_threshold
+        self._sorted = array('q')
+        self._recent = set()
+    
+    @staticmethod
+    def key(job_hash):
+        """Converte o hash hexadecimal na chave inteira de 64 bits"""
+        return hash_key(job_hash)
+    
+    def load(self, hashes):
+        """Carrega os hashes hexadecimais"""
+        self.load_keys(self.key(job_hash) for job_hash in hashes)
+    
+    def load_keys(self, hash_keys):
+        """Carrega as chaves inteiras (de preferência já em ordem crescente)"""
+        keys = array('q')
+        ordered = True
+        last = None
+        for key in hash_keys:
+            if last is not None and key < last:
+                ordered = False
+            keys.append(key)
+            last = key
+        
+        if not ordered:
+            keys = array('q', sorted(keys))
+        
+        self._sorted = keys
+        self._recent.clear()
+    
+    def __contains__(self, job_hash):
+        key = self.key(job_hash)
+        if key in self._recent:
+            return True
+        
+        i = bisect_left(self._sorted, key)
+        return i < len(self._sorted) and self._sorted[i] == key
+    
+    def __len__(self):
+        return len(self._sorted) + len(self._recent)
+    
+    def add(self, job_hash):
+        """Registra um hash recém-inserido"""
+        self._recent.add(self.key(job_hash))
+        if len(self._recent) >= self.merge_threshold:
+            self._merge()
+    
+    def _merge(self):
+        """Incorpora os hashes recentes ao array ordenado"""
+        merged = array('q', heapq.merge(self._sorted, sorted(self._recent)))
+        self._sorted = merged
+        self._recent.clear()
+    
+    def clear(self):
+        self._sorted = array('q')
+        self._recent.clear()
+
+
+class SQLiteJobStore:
+    """
+    Camada de armazenamento com uma única conexão SQLite de longa duração.
+    
+    Usa WAL + synchronous=NORMAL e grava as vagas em lote, uma transação por
+    página (ou a cada batch_size vagas), em vez de um commit por vaga.
+    Os hashes já gravados ficam em um KnownHashIndex carregado na primeira
+    gravação, então duplicatas são descartadas sem consultar o banco.
+    
+    As vagas ficam em job_records, com fonte e empresa em tabelas de nomes
+    (sources, companies) referenciadas por id e o hash como inteiro de 64
+    bits; a view jobs junta tudo com as mesmas colunas da tabela antiga,
+    para as consultas de leitura.
+    """
+    
+    INSERT_SQL = '''
+        INSERT INTO job_records (source_id, title, company_id, link, hash_key)
+        VALUES ((SELECT id FROM sources WHERE name = ?1), ?2, (SELECT id FROM companies WHERE name = ?3), ?4, ?5)
+        ON CONFLICT(hash_key) DO NOTHING
+    '''
+    
+    # Mesmas colunas da antiga tabela jobs (job_hash com os 16 dígitos de hash_key).
+    # Os nomes vêm de subconsultas em vez de JOIN: só são buscados quando a
+    # consulta usa a coluna, então COUNT(*) e filtros por data ficam no índice
+    JOBS_VIEW_SQL = """CREATE VIEW jobs AS
+        SELECT r.id,
+               (SELECT name FROM sources WHERE id = r.source_id) AS source,
+               r.title,
+               (SELECT name FROM companies WHERE id = r.company_id) AS company,
+               r.link, printf('%016x', r.hash_key) AS job_hash, r.created_at, r.updated_at
+        FROM job_records r"""
+    
+    def __init__(self, db_path, synchronous="NORMAL", batch_size=500, preload_hashes=True):
+        self.db_path = db_path
+        self.batch_size = batch_size
+        self.preload_hashes = preload_hashes
+        self._known = None
+        
+        # isolation_level=None: as transações são abertas explicitamente
+        self.conn = sqlite3.connect(db_path, isolation_level=None)
+        self.conn.execute("PRAGMA journal_mode=WAL")
+        self.conn.execute(f"PRAGMA synchronous={synchronous}")
+        self.init_schema()
+    
+    def init_schema(self):
+        """Cria as tabelas e índices, se ainda não existirem"""
+        cursor = self.conn.cursor()
+        
+        # Nomes de fontes e empresas, gravados uma vez e referenciados por id
+        cursor.execute('''
+            CREATE TABLE IF NOT EXISTS sources (
+                id INTEGER PRIMARY KEY,
+                name TEXT UNIQUE NOT NULL
+            )
+        ''')
+        cursor.execute('''
+            CREATE TABLE IF NOT EXISTS companies (
+                id INTEGER PRIMARY KEY,
+                name TEXT UNIQUE NOT NULL
+            )
+        ''')
+        
+        # hash_key: primeiros 64 bits do hash MD5 (o UNIQUE já é o índice de busca)
+        legacy = cursor.execute(
+            "SELECT 1 FROM sqlite_master WHERE type = 'table' AND name = 'jobs'"
+        ).fetchone()
+        cursor.execute('''
+            CREATE TABLE IF NOT EXISTS job_records (
+                id INTEGER PRIMARY KEY AUTOINCREMENT,
+                source_id INTEGER NOT NULL REFERENCES sources(id),
+                company_id INTEGER NOT NULL REFERENCES companies(id),
+                title TEXT NOT NULL,
+                link TEXT,
+                hash_key INTEGER UNIQUE NOT NULL,
+                created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+                updated_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+            )
+        ''')
+        if legacy:
+            self.migrate_legacy_jobs()
+        
+        # Recria a view se a definição mudou (o sqlite_master guarda o texto do CREATE)
+        view = cursor.execute("SELECT sql FROM sqlite_master WHERE type = 'view' AND name = 'jobs'").fetchone()
+        if view is None or view[0] != self.JOBS_VIEW_SQL:
+            cursor.execute("DROP VIEW IF EXISTS jobs")
+            cursor.execute(self.JOBS_VIEW_SQL)
+        
+        # Listagem paginada (keyset) das vagas mais recentes
+        cursor.execute('''
+            CREATE INDEX IF NOT EXISTS idx_jobs_created_at ON job_records(created_at DESC, id DESC)
+        ''')
+        
+        # Marca d'água do modo incremental: maior id de vaga já visto por busca ("<site>:<palavra-chave>")
+        cursor.execute('''
+            CREATE TABLE IF NOT EXISTS crawl_watermarks (
+                keyword TEXT PRIMARY KEY,
+                max_listing_id INTEGER NOT NULL,
+                updated_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+            )
+        ''')
+        
+        # Marca d'água das exportações incrementais: último id exportado por destino
+        cursor.execute('''
+            CREATE TABLE IF NOT EXISTS export_state (
+                target TEXT PRIMARY KEY,
+                last_id INTEGER NOT NULL,
+                last_rows INTEGER NOT NULL DEFAULT 0,
+                exported_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+            )
+        ''')
+        
+        # Agenda do modo daemon: intervalo atual e próxima coleta de cada palavra-chave
+        cursor.execute('''
+            CREATE TABLE IF NOT EXISTS crawl_schedule (
+                keyword TEXT PRIMARY KEY,
+                interval_seconds REAL NOT NULL,
+                next_run_at TIMESTAMP NOT NULL,
+                avg_new_jobs REAL NOT NULL DEFAULT 0,
+                last_new_jobs INTEGER NOT NULL DEFAULT 0,
+                runs INTEGER NOT NULL DEFAULT 0,
+                last_run_at TIMESTAMP
+            )
+        ''')
+        
+        # Diário das coletas: cada página (site, palavra-chave, página) de uma
+        # execução, gravada na mesma transação das vagas dela, para retomar
+        # uma coleta interrompida sem baixar de novo o que já foi gravado
+        cursor.execute('''
+            CREATE TABLE IF NOT EXISTS crawl_runs (
+                id INTEGER PRIMARY KEY,
+                signature TEXT NOT NULL,
+                started_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+                finished_at TIMESTAMP
+            )
+        ''')
+        cursor.execute('''
+            CREATE TABLE IF NOT EXISTS crawl_journal (
+                run_id INTEGER NOT NULL REFERENCES crawl_runs(id),
+                source TEXT NOT NULL,
+                keyword TEXT NOT NULL,
+                page INTEGER NOT NULL,
+                status TEXT NOT NULL,
+                stop INTEGER NOT NULL DEFAULT 0,
+                counters TEXT NOT NULL,
+                listing_ids TEXT,
+                error TEXT,
+                updated_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+                PRIMARY KEY (run_id, source, keyword, page)
+            ) WITHOUT ROWID
+        ''')
+        
+        self.init_fts()
+        self.init_stats()
+        self.init_details()
+    
+    def migrate_legacy_jobs(self):
+        """
+        Converte a tabela jobs do esquema antigo (fonte, empresa e hash MD5
+        em texto em cada linha, e um índice repetindo o UNIQUE do hash) para
+        job_records + sources + companies.
+        
+        Os ids são mantidos, então jobs_fts, job_details, job_minhash e as
+        marcas d'água continuam valendo. Os triggers da tabela antiga somem
+        com ela e são recriados em job_records logo depois. No fim, o VACUUM
+        devolve ao sistema o espaço liberado.
+        
+        Antes de mexer em qualquer coisa, o banco inteiro é copiado para um
+        arquivo ao lado dele (veja backup); se a cópia falhar, nada é migrado.
+        A coluna job_hash passa a mostrar só os 16 primeiros dígitos do MD5.
+        """
+        print("🔧 Migrando o banco para o esquema compacto (fontes e empresas por id)...")
+        backup_path = self.backup("antes-da-migracao")
+        if backup_path:
+            print(f"💾 Cópia do banco original em {backup_path}")
+        self.conn.create_function("hash_key", 1, hash_key, deterministic=True)
+        
+        self.conn.execute("BEGIN IMMEDIATE")
+        try:
+            self.conn.execute("INSERT OR IGNORE INTO sources (name) SELECT DISTINCT source FROM jobs")
+            self.conn.execute("INSERT OR IGNORE INTO companies (name) SELECT DISTINCT company FROM jobs")
+            self.conn.execute('''
+                INSERT INTO job_records (id, source_id, company_id, title, link, hash_key, created_at, updated_at)
+                SELECT j.id, s.id, c.id, j.title, j.link, hash_key(j.job_hash), j.created_at, j.updated_at
+                FROM jobs j
+                JOIN sources s ON s.name = j.source
+                JOIN companies c ON c.name = j.company
+                ORDER BY j.id
+            ''')
+            # Ids de vagas apagadas continuam sem ser reutilizados (AUTOINCREMENT)
+            self.conn.execute("DELETE FROM sqlite_sequence WHERE name = 'job_records'")
+            self.conn.execute('''
+                INSERT INTO sqlite_sequence (name, seq) SELECT 'job_records', seq FROM sqlite_sequence WHERE name = 'jobs'
+            ''')
+            self.conn.execute("DROP TABLE jobs")
+            self.conn.execute("COMMIT")
+        except BaseException:
+            self.conn.execute("ROLLBACK")
+            raise
+        
+        self.conn.execute("VACUUM")
+        print("✅ Migração concluída")
+    
+    def backup(self, label):
+        """
+        Copia o banco para "<nome>.<label>-<data e hora>.db", na mesma pasta,
+        com a API de backup do SQLite (cópia consistente, inclusive do WAL).
+        Retorna o caminho da cópia (None para bancos em memória).
+        """
+        if self.db_path == ':memory:' or str(self.db_path).startswith('file::memory:'):
+            return None
+        
+        root, ext = os.path.splitext(self.db_path)
+        path = f"{root}.{label}-{datetime.now().strftime('%Y%m%d-%H%M%S')}{ext or '.db'}"
+        target = sqlite3.connect(path)
+        try:
+            self.conn.backup(target)
+        finally:
+            target.close()
+        return path
+    
+    def init_details(self):
+        """
+        Cria a tabela job_details (campos da página de detalhe de cada vaga).
+        
+        Toda vaga nova com link entra na fila com status 'pending', por
+        trigger, na mesma transação da inserção; as vagas gravadas antes
+        desta tabela existir não entram. Status: pending, done, gone (página
+        removida), failed (esgotou as tentativas) e unsupported (o site não
+        tem parser de detalhe).
+        """
+        cursor = self.conn.cursor()
+        cursor.execute('''
+            CREATE TABLE IF NOT EXISTS job_details (
+                job_id INTEGER PRIMARY KEY,
+                status TEXT NOT NULL DEFAULT 'pending',
+                attempts INTEGER NOT NULL DEFAULT 0,
+                description TEXT,
+                location TEXT,
+                seniority TEXT,
+                salary TEXT,
+                posted_at TEXT,
+                error TEXT,
+                fetched_at TIMESTAMP
+            )
+        ''')
+        cursor.execute('''
+            CREATE INDEX IF NOT EXISTS idx_job_details_pending ON job_details(job_id) WHERE status = 'pending'
+        ''')
+        cursor.execute('''
+            CREATE TRIGGER IF NOT EXISTS jobs_details_ai AFTER INSERT ON job_records WHEN new.link IS NOT NULL BEGIN
+                INSERT OR IGNORE INTO job_details (job_id) VALUES (new.id);
+            END
+        ''')
+        cursor.execute('''
+            CREATE TRIGGER IF NOT EXISTS jobs_details_ad AFTER DELETE ON job_records BEGIN
+                DELETE FROM job_details WHERE job_id = old.id;
+            END
+        ''')
+    
+    def init_stats(self):
+        """
+        Cria as tabelas de estatísticas mantidas por triggers (vagas por
+        fonte, por empresa e por dia), para o resumo não varrer a tabela jobs.
+        """
+        cursor = self.conn.cursor()
+        exists = cursor.execute(
+            "SELECT 1 FROM sqlite_master WHERE type = 'table' AND name = 'stats_by_source'"
+        ).fetchone()
+        
+        cursor.execute('''
+            CREATE TABLE IF NOT EXISTS stats_by_source (
+                source TEXT PRIMARY KEY,
+                count INTEGER NOT NULL
+            )
+        ''')
+        cursor.execute('''
+            CREATE TABLE IF NOT EXISTS stats_by_company (
+                company TEXT PRIMARY KEY,
+                count INTEGER NOT NULL
+            )
+        ''')
+        cursor.execute('''
+            CREATE INDEX IF NOT EXISTS idx_stats_company_count ON stats_by_company(count DESC)
+        ''')
+        cursor.execute('''
+            CREATE TABLE IF NOT EXISTS stats_by_day (
+                day TEXT PRIMARY KEY,
+                count INTEGER NOT NULL
+            )
+        ''')
+        
+        cursor.execute('''
+            CREATE TRIGGER IF NOT EXISTS jobs_stats_ai AFTER INSERT ON job_records BEGIN
+                INSERT INTO stats_by_source (source, count) VALUES ((SELECT name FROM sources WHERE id = new.source_id), 1)
+                    ON CONFLICT(source) DO UPDATE SET count = count + 1;
+                INSERT INTO stats_by_company (company, count) VALUES ((SELECT name FROM companies WHERE id = new.company_id), 1)
+                    ON CONFLICT(company) DO UPDATE SET count = count + 1;
+                INSERT INTO stats_by_day (day, count) VALUES (date(new.created_at), 1)
+                    ON CONFLICT(day) DO UPDATE SET count = count + 1;
+            END
+        ''')
+        cursor.execute('''
+            CREATE TRIGGER IF NOT EXISTS jobs_stats_ad AFTER DELETE ON job_records BEGIN
+                UPDATE stats_by_source SET count = count - 1 WHERE source = (SELECT name FROM sources WHERE id = old.source_id);
+                UPDATE stats_by_company SET count = count - 1 WHERE company = (SELECT name FROM companies WHERE id = old.company_id);
+                UPDATE stats_by_day SET count = count - 1 WHERE day = date(old.created_at);
+                DELETE FROM stats_by_source WHERE source = (SELECT name FROM sources WHERE id = old.source_id) AND count <= 0;
+                DELETE FROM stats_by_company WHERE company = (SELECT name FROM companies WHERE id = old.company_id) AND count <= 0;
+                DELETE FROM stats_by_day WHERE day = date(old.created_at) AND count <= 0;
+            END
+        ''')
+        cursor.execute('''
+            CREATE TRIGGER IF NOT EXISTS jobs_stats_au AFTER UPDATE OF source_id, company_id, created_at ON job_records BEGIN
+                UPDATE stats_by_source SET count = count - 1 WHERE source = (SELECT name FROM sources WHERE id = old.source_id);
+                UPDATE stats_by_company SET count = count - 1 WHERE company = (SELECT name FROM companies WHERE id = old.company_id);
+                UPDATE stats_by_day SET count = count - 1 WHERE day = date(old.created_at);
+                DELETE FROM stats_by_source WHERE source = (SELECT name FROM sources WHERE id = old.source_id) AND count <= 0;
+                DELETE FROM stats_by_company WHERE company = (SELECT name FROM companies WHERE id = old.company_id) AND count <= 0;
+                DELETE FROM stats_by_day WHERE day = date(old.created_at) AND count <= 0;
+                INSERT INTO stats_by_source (source, count) VALUES ((SELECT name FROM sources WHERE id = new.source_id), 1)
+                    ON CONFLICT(source) DO UPDATE SET count = count + 1;
+                INSERT INTO stats_by_company (company, count) VALUES ((SELECT name FROM companies WHERE id = new.company_id), 1)
+                    ON CONFLICT(company) DO UPDATE SET count = count + 1;
+                INSERT INTO stats_by_day (day, count) VALUES (date(new.created_at), 1)
+                    ON CONFLICT(day) DO UPDATE SET count = count + 1;
+            END
+        ''')
+        
+        # Banco criado antes das estatísticas: calcula a partir das vagas existentes
+        if not exists:
+            cursor.execute("BEGIN IMMEDIATE")
+            cursor.execute("INSERT INTO stats_by_source SELECT source, COUNT(*) FROM jobs GROUP BY source")
+            cursor.execute("INSERT INTO stats_by_company SELECT company, COUNT(*) FROM jobs GROUP BY company")
+            cursor.execute("INSERT INTO stats_by_day SELECT date(created_at), COUNT(*) FROM jobs GROUP BY 1")
+            cursor.execute("COMMIT")
+    
+    def init_fts(self):
+        """
+        Cria o índice de texto completo (FTS5) sobre título e empresa.
+        
+        O tokenizer unicode61 com remove_diacritics ignora acentos e
+        maiúsculas ("inteligencia" encontra "Inteligência"). O conteúdo vem
+        da view jobs e os triggers de job_records mantêm o índice em dia.
+        """
+        cursor = self.conn.cursor()
+        exists = cursor.execute(
+            "SELECT 1 FROM sqlite_master WHERE type = 'table' AND name = 'jobs_fts'"
+        ).fetchone()
+        
+        cursor.execute('''
+            CREATE VIRTUAL TABLE IF NOT EXISTS jobs_fts USING fts5(
+                title, company,
+                content='jobs', content_rowid='id',
+                tokenize='unicode61 remove_diacritics 2'
+            )
+        ''')
+        
+        cursor.execute('''
+            CREATE TRIGGER IF NOT EXISTS jobs_fts_ai AFTER INSERT ON job_records BEGIN
+                INSERT INTO jobs_fts (rowid, title, company)
+                VALUES (new.id, new.title, (SELECT name FROM companies WHERE id = new.company_id));
+            END
+        ''')
+        cursor.execute('''
+            CREATE TRIGGER IF NOT EXISTS jobs_fts_ad AFTER DELETE ON job_records BEGIN
+                INSERT INTO jobs_fts (jobs_fts, rowid, title, company)
+                VALUES ('delete', old.id, old.title, (SELECT name FROM companies WHERE id = old.company_id));
+            END
+        ''')
+        cursor.execute('''
+            CREATE TRIGGER IF NOT EXISTS jobs_fts_au AFTER UPDATE OF title, company_id ON job_records BEGIN
+                INSERT INTO jobs_fts (jobs_fts, rowid, title, company)
+                VALUES ('delete', old.id, old.title, (SELECT name FROM companies WHERE id = old.company_id));
+                INSERT INTO jobs_fts (rowid, title, company)
+                VALUES (new.id, new.title, (SELECT name FROM companies WHERE id = new.company_id));
+            END
+        ''')
+        
+        # Banco criado antes do FTS: indexa as vagas que já existem
+        if not exists:
+            cursor.execute("INSERT INTO jobs_fts (jobs_fts) VALUES ('rebuild')")
+    
+    @property
+    def known_hashes(self):
+        """Índice em memória dos hashes gravados (carregado sob demanda)"""
+        if self._known is None:
+            self._known = KnownHashIndex()
+            # O índice UNIQUE devolve as chaves já ordenadas
+            cursor = self.conn.execute("SELECT hash_key FROM job_records ORDER BY hash_key")
+            self._known.load_keys(row[0] for row in cursor)
+        return self._known
+    
+    def is_known(self, job_hash):
+        """Verifica se o hash já foi gravado (em memória, se o índice estiver ativo)"""
+        if self.preload_hashes:
+            return job_hash in self.known_hashes
+        return job_hash in self.existing_hashes([job_hash])
+    
+    def existing_hashes(self, hashes):
+        """Retorna, entre os hashes informados, os que já estão no banco"""
+        by_key = {hash_key(job_hash): job_hash for job_hash in hashes}
+        keys = list(by_key)
+        found = set()
+        
+        # Consulta em blocos para não passar do limite de parâmetros do SQLite
+        for start in range(0, len(keys), 500):
+            chunk = keys[start:start + 500]
+            placeholders = ','.join('?' * len(chunk))
+            cursor = self.conn.execute(
+                f"SELECT hash_key FROM job_records WHERE hash_key IN ({placeholders})", chunk
+            )
+            found.update(by_key[row[0]] for row in cursor)
+        
+        return found
+    
+    @contextmanager
+    def transaction(self):
+        """
+        Transação de escrita (BEGIN IMMEDIATE ... COMMIT, ROLLBACK se algo falhar).
+        
+        Dentro de outra transação, só participa dela: quem abriu a de fora
+        decide o COMMIT. Num ROLLBACK, o índice em memória é descartado (é
+        recarregado na próxima gravação), pois pode ter hashes que não
+        chegaram ao banco.
+        """
+        if self.conn.in_transaction:
+            yield
+            return
+        
+        self.conn.execute("BEGIN IMMEDIATE")
+        try:
+            yield
+            self.conn.execute("COMMIT")
+        except BaseException:
+            self.conn.execute("ROLLBACK")
+            self._known = None
+            raise
+    
+    def insert_many(self, records):
+        """
+        Insere as vagas (source, title, company, link, job_hash) em lote.
+        
+        Retorna uma lista de booleanos na mesma ordem dos registros:
+        True para vaga nova, False para duplicata (no banco ou no próprio lote).
+        """
+        results = []
+        for start in range(0, len(records), self.batch_size):
+            results.extend(self._insert_batch(records[start:start + self.batch_size]))
+        return results
+    
+    def _insert_batch(self, records):
+        """Grava um lote dentro de uma única transação"""
+        if not records:
+            return []
+        
+        if self.preload_hashes:
+            known = self.known_hashes
+            
+            # Duplicatas já conhecidas são descartadas sem tocar no banco
+            results = []
+            new_records = []
+            batch_hashes = set()
+            for record in records:
+                is_new = record[4] not in batch_hashes and record[4] not in known
+                if is_new:
+                    batch_hashes.add(record[4])
+                    new_records.append(record)
+                results.append(is_new)
+            
+            if not new_records:
+                return results
+            
+            with self.transaction():
+                last_id = self.conn.execute("SELECT COALESCE(MAX(id), 0) FROM job_records").fetchone()[0]
+                cursor = self._write_records(new_records)
+                
+                if cursor.rowcount != len(new_records):
+                    # Outro processo gravou parte destas vagas e o índice ficou
+                    # desatualizado: vale o que o banco realmente inseriu
+                    ours = {row[0] for row in self.conn.execute(
+                        "SELECT hash_key FROM job_records WHERE id > ?", (last_id,)
+                    )}
+                    results = [is_new and hash_key(record[4]) in ours for record, is_new in zip(records, results)]
+                    self._known = None
+            
+            if self._known is not None:
+                for record in new_records:
+                    known.add(record[4])
+            
+            return results
+        
+        # BEGIN IMMEDIATE trava a escrita já no início, então a checagem de
+        # existentes abaixo continua válida até o COMMIT
+        with self.transaction():
+            existing = self.existing_hashes({record[4] for record in records})
+            
+            results = []
+            new_records = []
+            for record in records:
+                is_new = record[4] not in existing
+                if is_new:
+                    existing.add(record[4])
+                    new_records.append(record)
+                results.append(is_new)
+            
+            self._write_records(new_records)
+        
+        return results
+    
+    def _write_records(self, records):
+        """Grava fontes e empresas novas e depois as vagas (dentro da transação aberta)"""
+        self.conn.executemany("INSERT INTO sources (name) VALUES (?) ON CONFLICT(name) DO NOTHING",
+                              [(name,) for name in {record[0] for record in records}])
+        self.conn.executemany("INSERT INTO companies (name) VALUES (?) ON CONFLICT(name) DO NOTHING",
+                              [(name,) for name in {record[2] for record in records}])
+        return self.conn.executemany(self.INSERT_SQL, [
+            (source, title, company, link, hash_key(job_hash))
+            for source, title, company, link, job_hash in records
+        ])
+    
+    def get_watermarks(self):
+        """Retorna {palavra-chave: maior id de vaga já visto}"""
+        return dict(self.conn.execute("SELECT keyword, max_listing_id FROM crawl_watermarks"))
+    
+    def update_watermark(self, keyword, max_listing_id):
+        """Avança a marca d'água da palavra-chave (nunca volta para trás)"""
+        self.conn.execute('''
+            INSERT INTO crawl_watermarks (keyword, max_listing_id) VALUES (?, ?)
+            ON CONFLICT(keyword) DO UPDATE SET
+                max_listing_id = MAX(max_listing_id, excluded.max_listing_id),
+                updated_at = CURRENT_TIMESTAMP
+        ''', (keyword, max_listing_id))
+    
+    def start_crawl_run(self, signature, resume=False, max_age=None):
+        """Abre (ou, com resume=True, retoma) uma execução no diário de coletas; retorna (run_id, páginas concluídas)"""
+        if resume:
+            row = self.conn.execute('''
+                SELECT id FROM crawl_runs
+                WHERE signature = ?1 AND finished_at IS NULL
+                  AND (?2 IS NULL OR started_at >= datetime('now', '-' || ?2 || ' seconds'))
+                ORDER BY id DESC LIMIT 1
+            ''', (signature, max_age)).fetchone()
+            if row:
+                units = [
+                    (source, keyword, page, bool(stop), json.loads(counters), json.loads(listing_ids or '[]'))
+                    for source, keyword, page, stop, counters, listing_ids in self.conn.execute('''
+                        SELECT source, keyword, page, stop, counters, listing_ids
+                        FROM crawl_journal WHERE run_id = ? AND status = 'done'
+                    ''', (row[0],))
+                ]
+                return row[0], units
+        
+        with self.transaction():
+            old_runs = '''
+                SELECT id FROM crawl_runs WHERE finished_at IS NOT NULL OR signature = ?
+            '''
+            self.conn.execute(f"DELETE FROM crawl_journal WHERE run_id IN ({old_runs})", (signature,))
+            self.conn.execute(f"DELETE FROM crawl_runs WHERE id IN ({old_runs})", (signature,))
+            run_id = self.conn.execute("INSERT INTO crawl_runs (signature) VALUES (?)", (signature,)).lastrowid
+        return run_id, []
+    
+    def journal_page(self, run_id, source, keyword, page, status, counters, listing_ids=None,
+                     stop=False, error=None):
+        """
+        Registra o estado de uma página no diário ('done' ou 'failed').
+        
+        Chamado dentro da transação que grava as vagas da página, entra no
+        mesmo COMMIT: ou a página fica gravada e marcada como concluída, ou
+        nenhuma das duas coisas.
+        """
+        self.conn.execute('''
+            INSERT INTO crawl_journal
+                (run_id, source, keyword, page, status, stop, counters, listing_ids, error)
+            VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)
+            ON CONFLICT(run_id, source, keyword, page) DO UPDATE SET
+                status = excluded.status,
+                stop = excluded.stop,
+                counters = excluded.counters,
+                listing_ids = excluded.listing_ids,
+                error = excluded.error,
+                updated_at = CURRENT_TIMESTAMP
+        ''', (run_id, source, keyword, page, status, int(stop), json.dumps(counters),
+              json.dumps(listing_ids) if listing_ids is not None else None, error))
+    
+    def finish_crawl_run(self, run_id):
+        """Marca a execução como terminada (não é mais retomada)"""
+        self.conn.execute("UPDATE crawl_runs SET finished_at = CURRENT_TIMESTAMP WHERE id = ?", (run_id,))
+    
+    def get_export_watermark(self, target):
+        """Último id exportado para o destino (None se nunca foi exportado)"""
+        row = self.conn.execute("SELECT last_id FROM export_state WHERE target = ?", (target,)).fetchone()
+        return row[0] if row else None
+    
+    def set_export_watermark(self, target, last_id, rows):
+        """Registra o último id exportado para o destino"""
+        self.conn.execute('''
+            INSERT INTO export_state (target, last_id, last_rows) VALUES (?, ?, ?)
+            ON CONFLICT(target) DO UPDATE SET
+                last_id = excluded.last_id,
+                last_rows = excluded.last_rows,
+                exported_at = CURRENT_TIMESTAMP
+        ''', (target, last_id, rows))
+    
+    def iter_pending_details(self, limit=None, chunk_size=500):
+        """Vagas na fila de detalhes, em ordem de id: (job_id, source, link)"""
+        last_id = 0
+        remaining = limit
+        while remaining is None or remaining > 0:
+            size = chunk_size if remaining is None else min(chunk_size, remaining)
+            rows = self.conn.execute('''
+                SELECT d.job_id, j.source, j.link
+                FROM job_details d JOIN jobs j ON j.id = d.job_id
+                WHERE d.status = 'pending' AND d.job_id > ?
+                ORDER BY d.job_id
+                LIMIT ?
+            ''', (last_id, size)).fetchall()
+            if not rows:
+                return
+            yield from rows
+            last_id = rows[-1][0]
+            if remaining is not None:
+                remaining -= len(rows)
+    
+    def save_details(self, done, failed, max_attempts=3):
+        """
+        Grava um lote de páginas de detalhe em uma transação.
+        
+        Args:
+            done: (job_id, description, location, seniority, salary, posted_at) das que deram certo
+            failed: (job_id, status, error); status None volta para a fila até
+                esgotar max_attempts (aí vira 'failed')
+        """
+        self.conn.execute("BEGIN IMMEDIATE")
+        try:
+            self.conn.executemany('''
+                UPDATE job_details SET
+                    status = 'done', attempts = attempts + 1, description = ?, location = ?,
+                    seniority = ?, salary = ?, posted_at = ?, error = NULL, fetched_at = CURRENT_TIMESTAMP
+                WHERE job_id = ?
+            ''', [row[1:] + row[:1] for row in done])
+            self.conn.executemany('''
+                UPDATE job_details SET
+                    attempts = attempts + 1,
+                    status = COALESCE(?, CASE WHEN attempts + 1 >= ? THEN 'failed' ELSE 'pending' END),
+                    error = ?, fetched_at = CURRENT_TIMESTAMP
+                WHERE job_id = ?
+            ''', [(status, max_attempts, error, job_id) for job_id, status, error in failed])
+            self.conn.execute("COMMIT")
+        except BaseException:
+            self.conn.execute("ROLLBACK")
+            raise
+    
+    def get_schedule(self):
+        """Retorna {palavra-chave: {coluna: valor}} com a agenda do modo daemon"""
+        cursor = self.conn.execute("SELECT * FROM crawl_schedule")
+        columns = [column[0] for column in cursor.description]
+        return {row[0]: dict(zip(columns, row)) for row in cursor}
+    
+    def save_schedule(self, keyword, interval_seconds, next_run_at, avg_new_jobs, last_new_jobs):
+        """Grava o resultado de uma coleta agendada e a próxima execução da palavra-chave"""
+        self.conn.execute('''
+            INSERT INTO crawl_schedule
+                (keyword, interval_seconds, next_run_at, avg_new_jobs, last_new_jobs, runs, last_run_at)
+            VALUES (?, ?, ?, ?, ?, 1, CURRENT_TIMESTAMP)
+            ON CONFLICT(keyword) DO UPDATE SET
+                interval_seconds = excluded.interval_seconds,
+                next_run_at = excluded.next_run_at,
+                avg_new_jobs = excluded.avg_new_jobs,
+                last_new_jobs = excluded.last_new_jobs,
+                runs = runs + 1,
+                last_run_at = CURRENT_TIMESTAMP
+        ''', (keyword, interval_seconds, next_run_at, avg_new_jobs, last_new_jobs))
+    
+    def clear(self):
+        """Apaga todas as vagas (e as marcas d'água, a agenda e o diário) e zera o índice em memória"""
+        self.conn.execute("DELETE FROM job_records")
+        self.conn.execute("DELETE FROM companies")
+        self.conn.execute("DELETE FROM sources")
+        self.conn.execute("DELETE FROM crawl_watermarks")
+        self.conn.execute("DELETE FROM export_state")
+        self.conn.execute("DELETE FROM crawl_schedule")
+        self.conn.execute("DELETE FROM crawl_journal")
+        self.conn.execute("DELETE FROM crawl_runs")
+        if self._known is not None:
+            self._known.clear()
+    
+    def close(self):
+        """Fecha a conexão"""
+        self.conn.close()
@@ -0,0 +1,274 @@
+"""
+Quase-duplicatas: assinaturas MinHash dos títulos (MinHasher) e o índice
+LSH persistido no banco ao lado das vagas (NearDuplicateIndex).
+"""
+import hashlib
+import operator
+import re
+from array import array
+import unicodedata
+
+
+class MinHasher:
+    """
+    Assinaturas MinHash de títulos de vaga.
+    
+    O título é normalizado (sem sufixo de cidade/UF, sem acentos, sem
+    pontuação, minúsculo) e quebrado em trigramas de caracteres; a fração
+    de posições iguais entre duas assinaturas estima o Jaccard dos trigramas.
+    Cada trigrama passa uma vez pelo SHAKE-128, que devolve de uma só vez os
+    num_perm valores de 32 bits (um por "permutação").
+    """
+    
+    # Versão de normalize() e level(): ao mudar, as assinaturas gravadas são refeitas
+    NORMALIZATION = 3
+    
+    # Siglas das 27 unidades da federação
+    UFS = ('AC', 'AL', 'AP', 'AM', 'BA', 'CE', 'DF', 'ES', 'GO', 'MA', 'MT', 'MS', 'MG', 'PA',
+           'PB', 'PR', 'PE', 'PI', 'RJ', 'RN', 'RS', 'RO', 'RR', 'SC', 'SP', 'SE', 'TO')
+    
+    # "... - São Paulo/SP", "... (Campinas SP)", "... - Remoto" no fim do título:
+    # cidade de no máximo 4 palavras seguida de uma UF de verdade, ou só o
+    # regime de trabalho ("Suporte - TI" e "Designer UX, UI" ficam como estão)
+    LOCATION_SUFFIX_RE = re.compile(
+        r"\s*(?:[-–|,(]|\bem\s)\s*"
+        r"(?:(?:[^\W\d_][\w.']*\s+){0,3}[^\W\d_][\w.']*(?:\s*/\s*|\s+))?"
+        r"(?:(?:" + '|'.join(UFS) + r")\b|(?i:remoto|home\s+office|h[íi]brido))\)?\s*$"
+    )
+    
+    # Marcadores de nível (palavra normalizada -> forma canônica): "Engenheiro de
+    # Dados II" e "III" têm trigramas quase iguais, mas são vagas diferentes
+    LEVELS = {'i': 'i', 'ii': 'ii', 'iii': 'iii', 'iv': 'iv', 'jr': 'jr', 'junior': 'jr',
+              'pl': 'pl', 'pleno': 'pl', 'sr': 'sr', 'senior': 'sr'}
+    
+    def __init__(self, num_perm=64, shingle_size=3, seed=1):
+        self.num_perm = num_perm
+        self.shingle_size = shingle_size
+        self.seed = seed
+        self._salt = f"{seed}:".encode('ascii')
+    
+    def normalize(self, text):
+        """Forma canônica do texto usada para comparar títulos e empresas"""
+        text = self.LOCATION_SUFFIX_RE.sub('', text or '')
+        text = unicodedata.normalize('NFKD', text)
+        text = ''.join(c for c in text if not unicodedata.combining(c)).lower()
+        return ' '.join(re.findall(r'[^\W_]+', text))
+    
+    def level(self, text):
+        """Marcadores de nível do título ("ii", "jr", "pl sr"...); vazio se não houver"""
+        return ' '.join(sorted({self.LEVELS[word] for word in self.normalize(text).split() if word in self.LEVELS}))
+    
+    def shingles(self, text):
+        """Trigramas de caracteres do texto normalizado"""
+        text = self.normalize(text)
+        if len(text) <= self.shingle_size:
+            return {text}
+        return {text[i:i + self.shingle_size] for i in range(len(text) - self.shingle_size + 1)}
+    
+    def signature(self, text):
+        """Assinatura MinHash (num_perm inteiros) do texto"""
+        # hashlib em vez de hash(): precisa dar o mesmo valor em todas as execuções
+        size = 4 * self.num_perm
+        rows = [array('I', hashlib.shake_128(self._salt + shingle.encode('utf-8')).digest(size))
+                for shingle in self.shingles(text)]
+        return array('I', map(min, zip(*rows)))
+
+
+class NearDuplicateIndex:
+    """
+    Índice LSH de quase-duplicatas persistido no banco, ao lado de jobs.
+    
+    Cada vaga ganha uma assinatura MinHash do título (job_minhash) e entra em
+    um balde por faixa da assinatura (job_lsh), com a empresa e o nível do
+    título (MinHasher.level) na chave do balde: só vagas da mesma empresa e
+    do mesmo nível que caem juntas em alguma faixa são comparadas, em vez de
+    todos os pares. Uma vaga com similaridade estimada
+    >= threshold com outra entra no grupo (cluster_id) dela; se não, abre um
+    grupo com o próprio id.
+    """
+    
+    def __init__(self, conn, threshold=0.8, num_perm=64):
+        self.conn = conn
+        self.threshold = threshold
+        self.hasher = MinHasher(num_perm)
+        self.bands, self.rows = self.lsh_params(threshold, num_perm)
+        self.init_schema()
+    
+    @staticmethod
+    def lsh_params(threshold, num_perm):
+        """Faixas x linhas cujo limiar aproximado (1/b)^(1/r) fica mais perto do pedido"""
+        best = None
+        for bands in range(1, num_perm + 1):
+            rows = num_perm // bands
+            error = abs((1 / bands) ** (1 / rows) - threshold)
+            if best is None or error < best[0]:
+                best = (error, bands, rows)
+        return best[1], best[2]
+    
+    def init_schema(self):
+        cursor = self.conn.cursor()
+        cursor.execute('''
+            CREATE TABLE IF NOT EXISTS job_minhash (
+                job_id INTEGER PRIMARY KEY,
+                cluster_id INTEGER NOT NULL,
+                signature BLOB NOT NULL
+            )
+        ''')
+        cursor.execute('''
+            CREATE INDEX IF NOT EXISTS idx_job_minhash_cluster ON job_minhash(cluster_id)
+        ''')
+        cursor.execute('''
+            CREATE TABLE IF NOT EXISTS job_lsh (
+                band INTEGER NOT NULL,
+                bucket INTEGER NOT NULL,
+                job_id INTEGER NOT NULL,
+                PRIMARY KEY (band, bucket, job_id)
+            ) WITHOUT ROWID
+        ''')
+        cursor.execute('''
+            CREATE TABLE IF NOT EXISTS lsh_config (
+                key TEXT PRIMARY KEY,
+                value TEXT NOT NULL
+            )
+        ''')
+        # Baldes de vagas apagadas ficam para trás, mas as buscas só consideram job_minhash
+        cursor.execute('''
+            CREATE TRIGGER IF NOT EXISTS jobs_minhash_ad AFTER DELETE ON job_records BEGIN
+                DELETE FROM job_minhash WHERE job_id = old.id;
+            END
+        ''')
+        self._check_config()
+    
+    def _check_config(self):
+        """Refaz o índice se os parâmetros mudaram desde a última execução"""
+        config = {'num_perm': self.hasher.num_perm, 'shingle_size': self.hasher.shingle_size,
+                  'seed': self.hasher.seed, 'normalization': self.hasher.NORMALIZATION,
+                  'bands': self.bands, 'rows': self.rows}
+        stored = {key: int(value) for key, value in self.conn.execute("SELECT key, value FROM lsh_config")}
+        if stored == config:
+            return
+        
+        self.conn.execute("BEGIN IMMEDIATE")
+        try:
+            same_signatures = all(stored.get(key) == config[key]
+                                  for key in ('num_perm', 'shingle_size', 'seed', 'normalization'))
+            self.conn.execute("DELETE FROM job_lsh")
+            if not same_signatures:
+                # Outra função de hash ou normalização: as assinaturas e os grupos
+                # são recalculados do zero
+                self.conn.execute("DELETE FROM job_minhash")
+            else:
+                # Só o limiar mudou: remonta os baldes a partir das assinaturas salvas
+                rows = self.conn.execute('''
+                    SELECT m.job_id, m.signature, j.title, j.company FROM job_minhash m JOIN jobs j ON j.id = m.job_id
+                ''').fetchall()
+                for job_id, signature, title, company in rows:
+                    self._add_buckets(job_id, self._band_keys(self._load(signature), self._scope(title, company)))
+            self.conn.execute("DELETE FROM lsh_config")
+            self.conn.executemany("INSERT INTO lsh_config (key, value) VALUES (?, ?)",
+                                  [(key, str(value)) for key, value in config.items()])
+            self.conn.execute("COMMIT")
+        except BaseException:
+            self.conn.execute("ROLLBACK")
+            raise
+    
+    def _load(self, blob):
+        signature = array('I')
+        signature.frombytes(blob)
+        return signature
+    
+    def _scope(self, title, company):
+        """Parte fixa da chave dos baldes: empresa normalizada e nível do título"""
+        return f"{self.hasher.normalize(company)}|{self.hasher.level(title)}"
+    
+    def _band_keys(self, signature, scope):
+        """(faixa, balde) de cada faixa da assinatura; o balde inclui o escopo (empresa e nível)"""
+        keys = []
+        for band in range(self.bands):
+            chunk = signature[band * self.rows:(band + 1) * self.rows]
+            digest = hashlib.blake2b(scope.encode('utf-8') + chunk.tobytes(), digest_size=8).digest()
+            keys.append((band, int.from_bytes(digest, 'big', signed=True)))
+        return keys
+    
+    def _add_buckets(self, job_id, keys):
+        self.conn.executemany("INSERT OR IGNORE INTO job_lsh (band, bucket, job_id) VALUES (?, ?, ?)",
+                              [(band, bucket, job_id) for band, bucket in keys])
+    
+    def similarity(self, a, b):
+        """Jaccard estimado entre duas assinaturas"""
+        return sum(map(operator.eq, a, b)) / len(a)
+    
+    def _candidates(self, signature, keys, exclude=None):
+        """Vagas que dividem algum balde (keys) com a assinatura: [(id, grupo, similaridade)]"""
+        ids = set()
+        for band, bucket in keys:
+            ids.update(row[0] for row in self.conn.execute(
+                "SELECT job_id FROM job_lsh WHERE band = ? AND bucket = ?", (band, bucket)))
+        ids.discard(exclude)
+        
+        matches = []
+        for job_id in ids:
+            row = self.conn.execute("SELECT cluster_id, signature FROM job_minhash WHERE job_id = ?",
+                                    (job_id,)).fetchone()
+            if row:
+                score = self.similarity(signature, self._load(row[1]))
+                if score >= self.threshold:
+                    matches.append((job_id, row[0], score))
+        return sorted(matches, key=lambda match: (-match[2], match[0]))
+    
+    def query(self, title, company):
+        """Vagas já indexadas parecidas com o título/empresa: [(job_id, similaridade)]"""
+        signature = self.hasher.signature(title)
+        keys = self._band_keys(signature, self._scope(title, company))
+        return [(job_id, score) for job_id, _, score in self._candidates(signature, keys)]
+    
+    def index_pending(self, batch_size=1000):
+        """
+        Indexa as vagas que ainda não têm assinatura (as inseridas desde a
+        última chamada; na primeira, todas), em transações de batch_size.
+        Retorna quantas vagas foram indexadas.
+        """
+        indexed = 0
+        while True:
+            last_id = self.conn.execute("SELECT COALESCE(MAX(job_id), 0) FROM job_minhash").fetchone()[0]
+            rows = self.conn.execute(
+                "SELECT id, title, company FROM jobs WHERE id > ? ORDER BY id LIMIT ?", (last_id, batch_size)
+            ).fetchall()
+            if not rows:
+                return indexed
+            
+            self.conn.execute("BEGIN IMMEDIATE")
+            try:
+                for job_id, title, company in rows:
+                    signature = self.hasher.signature(title)
+                    keys = self._band_keys(signature, self._scope(title, company))
+                    matches = self._candidates(signature, keys, exclude=job_id)
+                    cluster_id = matches[0][1] if matches else job_id
+                    self.conn.execute("INSERT INTO job_minhash (job_id, cluster_id, signature) VALUES (?, ?, ?)",
+                                      (job_id, cluster_id, signature.tobytes()))
+                    self._add_buckets(job_id, keys)
+                self.conn.execute("COMMIT")
+            except BaseException:
+                self.conn.execute("ROLLBACK")
+                raise
+            indexed += len(rows)
+    
+    def clusters(self, min_size=2, limit=20):
+        """Maiores grupos de quase-duplicatas: [(cluster_id, [(id, title, company, link), ...])]"""
+        groups = self.conn.execute('''
+            SELECT cluster_id FROM job_minhash GROUP BY cluster_id
+            HAVING COUNT(*) >= ? ORDER BY COUNT(*) DESC, cluster_id LIMIT ?
+        ''', (min_size, limit)).fetchall()
+        
+        result = []
+        for (cluster_id,) in groups:
+            jobs = self.conn.execute('''
+                SELECT j.id, j.title, j.company, j.link FROM job_minhash m JOIN jobs j ON j.id = m.job_id
+                WHERE m.cluster_id = ? ORDER BY j.id
+            ''', (cluster_id,)).fetchall()
+            result.append((cluster_id, jobs))
+        return result
+    
+    def clear(self):
+        self.conn.execute("DELETE FROM job_minhash")
+        self.conn.execute("DELETE FROM job_lsh")
@@ -0,0 +1,1466 @@
+"""
+Pipeline comum a todos os sites de vagas (baixar → extrair → filtrar →
+descartar repetidas → gravar em lote): a interface dos sites
+(SourceAdapter), o JobPipeline com os modos serial, concorrente e com
+vários processos, e as métricas de cada execução.
+"""
+import requests
+import sqlite3
+import hashlib
+import json
+import logging
+import re
+from datetime import datetime, timezone
+import os
+import sys
+import threading
+import time
+from concurrent.futures import FIRST_COMPLETED, ProcessPoolExecutor, ThreadPoolExecutor, as_completed, wait
+from urllib.parse import urlsplit
+
+try:
+    from .http_client import FetchedPage, HttpClient, ResponseCache, TokenBucket
+    from .job_search import fts_query, rank_window, ranked_search_sql
+    from .job_store import SQLiteJobStore, job_hash
+    from .near_duplicates import NearDuplicateIndex
+except ImportError:
+    # Executado como script (python scrapers/vagas_scraper.py), fora do pacote
+    from http_client import FetchedPage, HttpClient, ResponseCache, TokenBucket
+    from job_search import fts_query, rank_window, ranked_search_sql
+    from job_store import SQLiteJobStore, job_hash
+    from near_duplicates import NearDuplicateIndex
+
+# Mensagens da coleta: avisos e erros (verbosity 0), andamento por página (1)
+# e uma linha por vaga (2)
+logger = logging.getLogger("vagas_scraper")
+VERBOSITY_LEVELS = {0: logging.WARNING, 1: logging.INFO, 2: logging.DEBUG}
+
+
+class ConsoleHandler(logging.StreamHandler):
+    """Escreve as mensagens no sys.stdout do momento, como print (inclusive redirecionado)"""
+    
+    def emit(self, record):
+        self.stream = sys.stdout
+        super().emit(record)
+
+
+def configure_logging(verbosity):
+    """Ajusta o nível do logger do scraper e, se o programa não configurou o logging, manda para o console"""
+    logger.setLevel(VERBOSITY_LEVELS[max(0, min(2, verbosity))])
+    if not logger.handlers and not logging.getLogger().handlers:
+        handler = ConsoleHandler()
+        handler.setFormatter(logging.Formatter('%(message)s'))
+        logger.addHandler(handler)
+
+
+class KeywordMatcher:
+    """
+    Casador de palavras-chave compilado uma única vez.
+    
+    Junta todas as palavras-chave em uma só regex com alternância, mantendo
+    as regras de contains_keywords: palavras de 1-2 caracteres ("TI", "IA")
+    exigem limite de palavra (\\b); as maiores não podem estar coladas em
+    letras ou números.
+    """
+    
+    def __init__(self, keywords):
+        self.keywords = []
+        for keyword in keywords:
+            keyword = keyword.lower().strip()
+            if keyword and keyword not in self.keywords:
+                self.keywords.append(keyword)
+        
+        # As mais longas primeiro, para "analista de dados" vencer "dados"
+        short = sorted((k for k in self.keywords if len(k) <= 2), key=len, reverse=True)
+        long = sorted((k for k in self.keywords if len(k) > 2), key=len, reverse=True)
+        
+        parts = []
+        if short:
+            parts.append(r'\b(?:' + '|'.join(map(re.escape, short)) + r')\b')
+        if long:
+            parts.append(r'(?<!\w)(?:' + '|'.join(map(re.escape, long)) + r')(?!\w)')
+        
+        self.pattern = re.compile('|'.join(parts)) if parts else None
+    
+    def search(self, text):
+        """Retorna a palavra-chave encontrada no texto (ou None)"""
+        if not text or self.pattern is None:
+            return None
+        
+        match = self.pattern.search(text.lower())
+        # O trecho casado é a própria palavra-chave, já em minúsculas
+        return match.group(0) if match else None
+
+
+def clean_text(text):
+    """Limpa e normaliza textos"""
+    if not text:
+        return ""
+    return re.sub(r'\s+', ' ', text.strip())
+
+
+class SourceAdapter:
+    """
+    Interface de um site de vagas para o JobPipeline
+    (baixar → extrair → filtrar → descartar repetidas → gravar em lote).
+    
+    Uma subclasse define name (gravado na coluna source), search_url(),
+    listing_blocks() e extract(). Os ids das vagas devem crescer com a
+    data de publicação para a parada do modo incremental; um site sem
+    ids devolve None e é sempre percorrido até a última página pedida.
+    """
+    
+    name = None
+    
+    def search_url(self, keyword, page):
+        """URL da página de resultados da palavra-chave"""
+        raise NotImplementedError
+    
+    def search_urls(self, keyword, pages):
+        """URLs das páginas 1..pages da busca pela palavra-chave"""
+        return [self.search_url(keyword, page) for page in range(1, pages + 1)]
+    
+    def listing_blocks(self, content):
+        """Separa os blocos de vaga dos bytes da página de resultados"""
+        raise NotImplementedError
+    
+    def extract(self, block):
+        """Extrai (id, título, empresa, link) de um bloco de vaga"""
+        raise NotImplementedError
+    
+    def watermark_key(self, keyword):
+        """Chave da marca d'água da busca na tabela crawl_watermarks"""
+        return f"{self.name}:{keyword}"
+    
+    def parse_detail(self, content):
+        """
+        Extrai os campos da página de detalhe de uma vaga: dicionário com
+        description, location, seniority, salary e posted_at (None quando a
+        página não tiver o campo). Sites sem parser de detalhe devolvem None.
+        """
+        return None
+
+
+class RunMetrics:
+    """
+    Instrumentação de uma execução: tempo gasto em cada etapa (somado entre
+    threads e processos), bytes baixados, respostas por código HTTP e vagas
+    extraídas das páginas.
+    """
+    
+    # dedup: vagas repetidas na execução e geração dos hashes;
+    # db_write: consulta aos hashes já gravados e inserção em lote
+    STAGES = ('fetch', 'parse', 'filter', 'dedup', 'db_write')
+    
+    def __init__(self):
+        self.timings = dict.fromkeys(self.STAGES, 0.0)
+        self.bytes_downloaded = 0
+        self.status_codes = {}
+        self.listings = 0
+        self.started = time.perf_counter()
+        self._lock = threading.Lock()
+    
+    def add_time(self, stage, seconds):
+        with self._lock:
+            self.timings[stage] += seconds
+    
+    def add_download(self, size):
+        with self._lock:
+            self.bytes_downloaded += size
+    
+    def add_status_codes(self, counts):
+        with self._lock:
+            for code, count in counts.items():
+                self.status_codes[code] = self.status_codes.get(code, 0) + count
+    
+    def merge(self, other):
+        """Soma as métricas devolvidas por um processo do pool (RunMetrics.snapshot)"""
+        with self._lock:
+            for stage, seconds in other['timings'].items():
+                self.timings[stage] += seconds
+            self.bytes_downloaded += other['bytes_downloaded']
+            self.listings += other['listings']
+        self.add_status_codes(other['status_codes'])
+    
+    def snapshot(self):
+        """Métricas em tipos simples (para devolver entre processos)"""
+        with self._lock:
+            return {'timings': dict(self.timings), 'bytes_downloaded': self.bytes_downloaded,
+                    'status_codes': dict(self.status_codes), 'listings': self.listings}
+    
+    def summary(self, pages):
+        """Dicionário 'metrics' do resultado de scrape()"""
+        elapsed = time.perf_counter() - self.started
+        return {
+            'elapsed': round(elapsed, 6),
+            'timings': {stage: round(seconds, 6) for stage, seconds in self.timings.items()},
+            'bytes_downloaded': self.bytes_downloaded,
+            'status_codes': {str(code): count for code, count in sorted(self.status_codes.items())},
+            'listings': self.listings,
+            'pages_per_s': round(pages / elapsed, 2) if elapsed else 0.0,
+            'jobs_per_s': round(self.listings / elapsed, 2) if elapsed else 0.0
+        }
+
+
+def write_metrics(path, result, sources):
+    """
+    Grava o resultado de uma execução: uma linha JSON acrescentada ao arquivo
+    ou, se ele terminar em .prom, o formato texto do Prometheus (sobrescrito
+    a cada execução, para o textfile collector do node_exporter).
+    """
+    metrics = result['metrics']
+    
+    if not path.endswith('.prom'):
+        line = {'timestamp': datetime.now(timezone.utc).isoformat(timespec='seconds'),
+                'sources': sources}
+        line.update(result)
+        with open(path, 'a', encoding='utf-8') as file:
+            file.write(json.dumps(line, ensure_ascii=False) + '\n')
+        return
+    
+    labels = f'sources="{",".join(sources)}"'
+    lines = [
+        '# HELP vagas_scraper_stage_seconds Tempo gasto em cada etapa na última coleta',
+        '# TYPE vagas_scraper_stage_seconds gauge'
+    ]
+    lines += [f'vagas_scraper_stage_seconds{{{labels},stage="{stage}"}} {seconds}'
+              for stage, seconds in metrics['timings'].items()]
+    lines += ['# HELP vagas_scraper_http_responses Respostas HTTP por código na última coleta',
+              '# TYPE vagas_scraper_http_responses gauge']
+    lines += [f'vagas_scraper_http_responses{{{labels},code="{code}"}} {count}'
+              for code, count in metrics['status_codes'].items()]
+    
+    gauges = [
+        ('run_seconds', metrics['elapsed'], 'Duração da última coleta'),
+        ('bytes_downloaded', metrics['bytes_downloaded'], 'Bytes baixados na última coleta'),
+        ('pages_per_second', metrics['pages_per_s'], 'Páginas processadas por segundo'),
+        ('jobs_per_second', metrics['jobs_per_s'], 'Vagas extraídas por segundo'),
+    ] + [
+        (name, result[name], f'Contador {name} da última coleta')
+        for name in ('saved', 'duplicates', 'errors', 'filtered', 'pages', 'early_stops',
+                     'skipped_listings', 'cache_hits', 'total')
+    ]
+    for name, value, help_text in gauges:
+        lines += [f'# HELP vagas_scraper_{name} {help_text}',
+                  f'# TYPE vagas_scraper_{name} gauge',
+                  f'vagas_scraper_{name}{{{labels}}} {value}']
+    
+    # Escreve em um arquivo temporário e troca, para o coletor nunca ler pela metade
+    tmp_path = path + '.tmp'
+    with open(tmp_path, 'w', encoding='utf-8') as file:
+        file.write('\n'.join(lines) + '\n')
+    os.replace(tmp_path, path)
+
+# Estado de cada processo do pool de scrape_parallel (montado por _init_crawl_worker)
+_crawl_worker = {}
+
+
+def _init_crawl_worker(keywords, http_options):
+    """Prepara a sessão HTTP e o casador de palavras-chave do processo"""
+    _crawl_worker['http'] = HttpClient(**http_options)
+    _crawl_worker['matcher'] = KeywordMatcher(keywords)
+
+
+def crawl_keyword(adapter, keyword, page_urls, watermark=None):
+    """
+    Baixa e extrai as páginas (número, URL) de uma busca (roda nos processos do pool).
+    
+    Não acessa o banco: devolve um resultado compacto para o processo que
+    grava. Cada página vira (página, vagas, erros), com vagas em tuplas
+    (id, título, empresa, link, passou_no_filtro, hash) e vagas None quando
+    o download falhou. Para na página vazia ou, com marca d'água, na primeira
+    página só com vagas já vistas (mesma regra de JobPipeline._page_done).
+    """
+    http = _crawl_worker['http']
+    matcher = _crawl_worker['matcher']
+    retries_before = http.retries
+    status_before = dict(http.status_counts)
+    metrics = RunMetrics()
+    clock = time.perf_counter
+    
+    pages = []
+    for page, url in page_urls:
+        listings = []
+        errors = []
+        try:
+            started = clock()
+            try:
+                r = http.get(url)
+            finally:
+                metrics.add_time('fetch', clock() - started)
+            r.raise_for_status()
+            content = r.content
+            metrics.add_download(len(content))
+            
+            started = clock()
+            blocks = adapter.listing_blocks(content)
+            metrics.add_time('parse', clock() - started)
+        except Exception as e:
+            pages.append((page, None, [f"Erro na página {page} de '{keyword}': {e}"]))
+            continue
+        
+        parse_time = filter_time = hash_time = 0.0
+        for block in blocks:
+            try:
+                started = clock()
+                listing_id, title, company, link = adapter.extract(block)
+                extracted = clock()
+                matched = matcher.search(title) is not None
+                filtered = clock()
+                hash_value = job_hash(title, company, adapter.name) if matched else None
+                hash_time += clock() - filtered
+                filter_time += filtered - extracted
+                parse_time += extracted - started
+                listings.append((listing_id, title, company, link, matched, hash_value))
+            except Exception as e:
+                errors.append(f"Erro ao processar vaga: {e}")
+        
+        metrics.add_time('parse', parse_time)
+        metrics.add_time('filter', filter_time)
+        metrics.add_time('dedup', hash_time)
+        metrics.listings += len(listings)
+        pages.append((page, listings, errors))
+        
+        page_ids = [listing[0] for listing in listings]
+        if not page_ids or (watermark and None not in page_ids and max(page_ids) <= watermark):
+            break
+    
+    metrics.add_status_codes({code: count - status_before.get(code, 0)
+                              for code, count in http.status_counts.items()
+                              if count != status_before.get(code, 0)})
+    return {'keyword': keyword, 'pages': pages, 'retries': http.retries - retries_before,
+            'metrics': metrics.snapshot()}
+
+
+class JobPipeline:
+    """Coleta de vagas dos sites registrados (SourceAdapter), com banco, sessão HTTP e cache compartilhados"""
+    
+    def __init__(self, db_path="jobs.db", http_client=None, cache_dir=None, sources=None, verbosity=None,
+                 metrics_file=None, near_duplicate_threshold=0.8, resume_max_age=12 * 3600):
+        """
+        Args:
+            sources: sites de vagas (SourceAdapter) da coleta; outros podem ser
+                registrados depois com add_source
+            verbosity: mensagens da coleta (0 = só avisos e o resumo, 1 = andamento
+                por página, 2 = uma linha por vaga); None (padrão) deixa o logging
+                como o programa configurou
+            metrics_file: arquivo onde cada execução grava suas métricas
+                (linhas JSON, ou formato do Prometheus se terminar em .prom)
+            near_duplicate_threshold: similaridade mínima (0 a 1) entre títulos da
+                mesma empresa para agrupar vagas como quase-duplicatas; None desliga
+            resume_max_age: idade máxima (s) de uma coleta interrompida para que
+                resume=True a retome; mais antiga, a coleta começa do zero (as
+                páginas dela já estariam desatualizadas); None = sem limite
+        """
+        self.db_path = db_path
+        
+        # Conexão única com o banco, reaproveitada durante toda a execução
+        self.store = SQLiteJobStore(db_path)
+        
+        # Sessão HTTP reaproveitada por todas as páginas
+        self.http = http_client or HttpClient()
+        
+        # Sites de vagas conhecidos, por nome
+        self.sources = {}
+        for adapter in sources or []:
+            self.add_source(adapter)
+        
+        # Cache em disco das páginas de busca (desligado se cache_dir for None)
+        self.cache = ResponseCache(cache_dir) if cache_dir else None
+        
+        # Controle de requisições simultâneas por host (usado no modo concorrente)
+        self._per_host_limit = 1
+        self._host_semaphores = {}
+        self._host_lock = threading.Lock()
+        
+        # Vagas (site, id) já vistas na execução atual e maior id visto por busca
+        self._incremental = False
+        self._seen_listings = set()
+        self._run_watermarks = {}
+        
+        # Execução atual no diário de coletas (crawl_runs)
+        self._crawl_run = None
+        self.resume_max_age = resume_max_age
+        
+        # Regex única das palavras-chave, compilada uma vez por lista
+        self._matcher = None
+        self._matcher_key = None
+        
+        # Tempos por etapa e contagens HTTP da execução atual
+        self._metrics = RunMetrics()
+        self._status_before = {}
+        self.metrics_file = metrics_file
+        
+        # Índice MinHash/LSH de quase-duplicatas (atualizado no fim de cada coleta)
+        self.near_duplicates = None
+        if near_duplicate_threshold is not None:
+            self.near_duplicates = NearDuplicateIndex(self.store.conn, near_duplicate_threshold)
+        if verbosity is not None:
+            configure_logging(verbosity)
+    
+    def init_database(self):
+        """Inicializa o banco de dados SQLite"""
+        self.store.init_schema()
+    
+    def add_source(self, adapter):
+        """Registra um site de vagas (SourceAdapter) para as próximas coletas"""
+        self.sources[adapter.name] = adapter
+    
+    def generate_job_hash(self, title, company, source):
+        """Gera um hash único baseado no título, empresa e fonte (veja job_hash: no banco ficam só 16 dígitos)"""
+        return job_hash(title, company, source)
+    
+    def job_exists(self, job_hash):
+        """Verifica se a vaga já existe no banco"""
+        return self.store.is_known(job_hash)
+    
+    def insert_job(self, source, title, company, link=None):
+        """Insere uma nova vaga no banco (só se não existir)"""
+        return self.insert_jobs([(source, title, company, link)])[0]
+    
+    def insert_jobs(self, jobs):
+        """
+        Insere várias vagas (source, title, company, link) em uma só transação.
+        
+        Retorna uma lista com True (vaga nova) ou False (duplicata) para cada vaga.
+        """
+        records = [
+            (source, title, company, link, self.generate_job_hash(title, company, source))
+            for source, title, company, link in jobs
+        ]
+        return self.store.insert_many(records)
+    
+    def get_jobs_count(self, source=None):
+        """Retorna o número de vagas no banco (lido da tabela de estatísticas)"""
+        cursor = self.store.conn.cursor()
+        
+        if source:
+            cursor.execute("SELECT count FROM stats_by_source WHERE source = ?", (source,))
+            row = cursor.fetchone()
+            return row[0] if row else 0
+        
+        cursor.execute("SELECT COALESCE(SUM(count), 0) FROM stats_by_source")
+        return cursor.fetchone()[0]
+    
+    def clean_text(self, text):
+        """Limpa e normaliza textos"""
+        return clean_text(text)
+    
+    def contains_keywords(self, text, keywords):
+        """Verifica se o texto contém pelo menos uma das palavras-chave como palavras completas"""
+        return self.match_keyword(text, keywords) is not None
+    
+    def match_keyword(self, text, keywords):
+        """Retorna qual palavra-chave aparece no texto como palavra completa (ou None)"""
+        if not text or not keywords:
+            return None
+        
+        return self._keyword_matcher(keywords).search(text)
+    
+    def _keyword_matcher(self, keywords):
+        """Reaproveita o KeywordMatcher enquanto a lista de palavras-chave for a mesma"""
+        if isinstance(keywords, str):
+            keywords = [keywords]
+        
+        key = tuple(keywords)
+        if self._matcher is None or self._matcher_key != key:
+            self._matcher = KeywordMatcher(keywords)
+            self._matcher_key = key
+        return self._matcher
+    
+    def _host_semaphore(self, url):
+        """Retorna o semáforo que limita as requisições simultâneas ao host da URL"""
+        host = urlsplit(url).netloc
+        with self._host_lock:
+            if host not in self._host_semaphores:
+                self._host_semaphores[host] = threading.BoundedSemaphore(self._per_host_limit)
+            return self._host_semaphores[host]
+    
+    def _fetch_page(self, url, filter_key=None):
+        """
+        Baixa uma página de resultados respeitando o limite por host.
+        
+        Com o cache ativo, envia If-None-Match/If-Modified-Since; se o servidor
+        responder 304 ou o corpo for idêntico ao do cache, a página volta com
+        content=None (não muda desde a última coleta). filter_key vem de
+        _filter_key: se a página foi processada com outro filtro, o cache é
+        ignorado e ela é baixada e processada de novo.
+        """
+        cached = self.cache.get(url) if self.cache else None
+        if cached and cached.get('filter_key') != filter_key:
+            cached = None
+        headers = {}
+        if cached:
+            if cached.get('etag'):
+                headers['If-None-Match'] = cached['etag']
+            if cached.get('last_modified'):
+                headers['If-Modified-Since'] = cached['last_modified']
+        
+        with self._host_semaphore(url):
+            started = time.perf_counter()
+            try:
+                r = self.http.get(url, headers=headers)
+            finally:
+                self._metrics.add_time('fetch', time.perf_counter() - started)
+        
+        if cached and r.status_code == 304:
+            return FetchedPage(url, None, cached.get('etag'), cached.get('last_modified'),
+                               cached['content_hash'], True, filter_key)
+        
+        r.raise_for_status()
+        
+        # Bytes crus: o parser detecta a codificação sem uma cópia decodificada
+        content = r.content
+        self._metrics.add_download(len(content))
+        content_hash = hashlib.sha1(content).hexdigest() if self.cache else None
+        etag = r.headers.get('ETag')
+        last_modified = r.headers.get('Last-Modified')
+        
+        if cached and content_hash == cached['content_hash']:
+            # Corpo igual, mas o servidor pode ter mudado os validadores: sem
+            # isso, as próximas requisições mandariam os antigos e nunca dariam 304
+            if etag != cached.get('etag') or last_modified != cached.get('last_modified'):
+                self.cache.put(url, content_hash, etag, last_modified, filter_key)
+            return FetchedPage(url, None, etag, last_modified, content_hash, False, filter_key)
+        
+        return FetchedPage(url, content, etag, last_modified, content_hash, False, filter_key)
+    
+    def _filter_key(self, adapter, keywords):
+        """Hash do site e das palavras-chave do filtro, guardado no cache junto com a página"""
+        return hashlib.sha1('\n'.join([adapter.name] + sorted(keywords)).encode('utf-8')).hexdigest()
+    
+    def _handle_page(self, fetched, adapter, keyword, page, keywords, stats, watermark):
+        """Processa uma página baixada (ou reaproveita o cache); retorna True se a busca deve parar"""
+        before = dict(stats)
+        if self.cache:
+            if fetched.content is None:
+                stats['cache_hits'] += 1
+                if fetched.not_modified:
+                    stats['not_modified'] += 1
+                self.cache.touch(fetched.url)
+                logger.info("    💾 Página %s sem alterações desde a última coleta", page)
+                return self._commit_page(adapter, keyword, page, None, keywords, stats, watermark, before)
+            stats['cache_misses'] += 1
+        
+        listings = self._parse_page(fetched.content, adapter, page, stats)
+        stop = self._commit_page(adapter, keyword, page, listings, keywords, stats, watermark, before)
+        
+        # Só entra no cache depois de gravada: se algo falhar, a página
+        # não é dada como "sem alterações" na próxima coleta
+        if self.cache:
+            self.cache.put(fetched.url, fetched.content_hash, fetched.etag, fetched.last_modified,
+                           fetched.filter_key)
+        
+        return stop
+    
+    def _commit_page(self, adapter, keyword, page, listings, keywords, stats, watermark, before):
+        """Grava as vagas da página e a registra no diário de coletas numa só transação; retorna True se a busca para"""
+        try:
+            with self.store.transaction():
+                page_ids = None
+                if listings is not None:
+                    page_ids = self._apply_listings(listings, adapter.name, keywords, stats)
+                stop = self._page_done(adapter, keyword, page, page_ids, watermark, stats)
+                
+                counters = {key: stats[key] - before[key] for key in stats if stats[key] != before[key]}
+                self.store.journal_page(self._crawl_run, adapter.name, keyword, page, 'done', counters,
+                                        [i for i in page_ids or [] if i is not None], stop)
+                committed = time.perf_counter()
+        except BaseException:
+            stats.update(before)
+            raise
+        
+        self._metrics.add_time('db_write', time.perf_counter() - committed)
+        return stop
+    
+    def _journal_failure(self, adapter, keyword, page, error):
+        """Marca no diário a página que falhou (ela é baixada de novo ao retomar a coleta)"""
+        try:
+            self.store.journal_page(self._crawl_run, adapter.name, keyword, page, 'failed',
+                                    {'errors': 1}, error=str(error))
+        except sqlite3.Error as e:
+            logger.warning("    ⚠️ Não foi possível registrar a falha no diário: %s", e)
+    
+    def normalize_keywords(self, keywords):
+        """Normaliza (minúsculas, espaços) e remove palavras-chave repetidas, mantendo a ordem"""
+        normalized = []
+        seen = set()
+        for keyword in keywords:
+            keyword = re.sub(r'\s+', ' ', keyword.strip().lower())
+            if keyword and keyword not in seen:
+                seen.add(keyword)
+                normalized.append(keyword)
+        return normalized
+    
+    def _parse_page(self, content, adapter, page, stats):
+        """
+        Faz o parsing de uma página de resultados.
+        
+        Retorna as vagas no formato de _apply_listings (ainda sem filtro e
+        hash); lista vazia se a página não tem vagas.
+        """
+        started = time.perf_counter()
+        resultados = adapter.listing_blocks(content)
+        
+        if not resultados:
+            self._metrics.add_time('parse', time.perf_counter() - started)
+            logger.info("    ℹ️ Nenhuma vaga encontrada na página %s", page)
+            return []
+        
+        listings = []
+        for vaga in resultados:
+            try:
+                listings.append(adapter.extract(vaga) + (None, None))
+            except Exception as e:
+                stats['errors'] += 1
+                logger.warning("    ❌ Erro ao processar vaga: %s", e)
+        
+        self._metrics.add_time('parse', time.perf_counter() - started)
+        self._metrics.listings += len(listings)
+        return listings
+    
+    def _apply_listings(self, listings, source, keywords, stats):
+        """
+        Filtra e salva as vagas extraídas de uma página.
+        
+        Cada vaga é (id, título, empresa, link, passou_no_filtro, hash); os dois
+        últimos vêm None quando ainda não foram calculados (no modo com vários
+        processos eles chegam prontos dos workers). Retorna os ids da página.
+        """
+        clock = time.perf_counter
+        started = clock()
+        filter_time = 0.0
+        # Sem verbosity 2, as linhas por vaga nem chegam a ser formatadas
+        log_jobs = logger.isEnabledFor(logging.DEBUG)
+        
+        page_ids = []
+        candidates = []
+        for listing_id, title, company, link, matched, hash_value in listings:
+            # A mesma vaga aparece em várias buscas: só processa na primeira vez
+            page_ids.append(listing_id)
+            if listing_id is not None:
+                if (source, listing_id) in self._seen_listings:
+                    stats['skipped_listings'] += 1
+                    continue
+                self._seen_listings.add((source, listing_id))
+            
+            # Pula vagas sem informações essenciais
+            if title == "Não encontrado" or company == "Não informado":
+                continue
+            
+            # 🔍 FILTRO: Verifica se contém alguma palavra-chave no título
+            if matched is None:
+                filter_started = clock()
+                matched = self.contains_keywords(title, keywords)
+                filter_time += clock() - filter_started
+            if not matched:
+                stats['filtered'] += 1
+                if log_jobs:
+                    logger.debug("    🚫 Filtrada: %s - %s", title, company)
+                continue
+            
+            candidates.append((source, title, company, link,
+                               hash_value or self.generate_job_hash(title, company, source)))
+        
+        # Grava as vagas que passaram pelo filtro em uma única transação
+        write_started = clock()
+        inserted = self.store.insert_many(candidates)
+        self._metrics.add_time('db_write', clock() - write_started)
+        self._metrics.add_time('filter', filter_time)
+        self._metrics.add_time('dedup', write_started - started - filter_time)
+        
+        for (source, title, company, link, _), is_new in zip(candidates, inserted):
+            if is_new:
+                stats['saved'] += 1
+                if log_jobs:
+                    logger.debug("    ✅ Nova vaga: %s - %s", title, company)
+            else:
+                stats['duplicates'] += 1
+                if log_jobs:
+                    logger.debug("    ⚠️ Duplicata: %s - %s", title, company)
+        
+        return page_ids
+    
+    def _page_done(self, adapter, keyword, page, page_ids, watermark, stats):
+        """
+        Registra uma página processada e decide se a busca da palavra-chave acaba nela.
+        
+        Para quando a página vem sem vagas (fim dos resultados) ou, no modo
+        incremental, quando todas as vagas dela têm id até a marca d'água da
+        palavra-chave (os resultados vêm dos mais novos para os mais antigos)
+        ou quando ela não mudou desde a última coleta (page_ids None).
+        """
+        stats['pages'] += 1
+        
+        if page_ids is None:
+            if self._incremental:
+                logger.info("    ⏹️ Página %s sem alterações: encerrando '%s'", page, keyword)
+                stats['early_stops'] += 1
+                return True
+            return False
+        
+        known_ids = [i for i in page_ids if i is not None]
+        if known_ids:
+            key = adapter.watermark_key(keyword)
+            self._run_watermarks[key] = max(self._run_watermarks.get(key, 0), max(known_ids))
+        
+        if not page_ids:
+            logger.info("    ⏹️ Fim dos resultados para '%s' na página %s", keyword, page)
+            stats['early_stops'] += 1
+            return True
+        
+        if watermark and len(known_ids) == len(page_ids) and max(known_ids) <= watermark:
+            logger.info("    ⏹️ Página %s só tem vagas já vistas: encerrando '%s'", page, keyword)
+            stats['early_stops'] += 1
+            return True
+        
+        return False
+    
+    def scrape(self, keywords, pages=1, concurrency=1, per_host_limit=None, incremental=False, sources=None,
+               resume=False):
+        """
+        Coleta vagas de um ou mais sites com filtros por palavras-chave.
+        
+        Args:
+            keywords: string ou lista de palavras-chave para filtrar
+            pages: número de páginas para percorrer em cada busca
+            concurrency: número máximo de páginas baixadas ao mesmo tempo (1 = modo serial)
+            per_host_limit: máximo de requisições simultâneas por host (padrão: igual a concurrency)
+            incremental: para de paginar uma busca na primeira página só com vagas
+                já vistas em execuções anteriores
+            sources: nomes dos sites (de self.sources) a percorrer; padrão: todos
+            resume: retoma a última coleta interrompida com os mesmos parâmetros
+                (se não for mais antiga que resume_max_age)
+        """
+        adapters = self._select_sources(sources)
+        run = self._start_run(keywords, pages, incremental, adapters, resume)
+        if run is None:
+            return self._run_result(self._new_stats(), 0)
+        keywords, plans, stats, watermarks = run
+        
+        concurrency = max(1, int(concurrency))
+        self._per_host_limit = max(1, int(per_host_limit or concurrency))
+        self._host_semaphores = {}
+        self.http.resize_pool(self._per_host_limit)
+        retries_before = self.http.retries
+        
+        if concurrency == 1:
+            self._scrape_serial(plans, keywords, stats, watermarks)
+        else:
+            logger.info("[%s] Modo concorrente: %s download(s) simultâneo(s), %s por host",
+                        self._label(adapters), concurrency, self._per_host_limit)
+            self._scrape_concurrent(plans, keywords, stats, watermarks, concurrency)
+        
+        if self.cache:
+            self.cache.evict()
+        
+        return self._finish_run(keywords, plans, pages, stats, self.http.retries - retries_before, adapters)
+    
+    def scrape_parallel(self, keywords, pages=1, workers=4, incremental=False, sources=None, resume=False):
+        """
+        Coleta vagas com o download e o parsing espalhados em vários processos.
+        
+        As buscas (site e palavra-chave) são distribuídas entre os processos de
+        um ProcessPoolExecutor; cada processo baixa, faz o parsing, filtra e
+        gera os hashes das páginas das suas buscas e devolve lotes compactos.
+        Só este processo acessa o banco: ele descarta as vagas já vistas, grava
+        os lotes e soma os contadores, que ficam iguais aos de scrape().
+        O cache HTTP (cache_dir) não é usado neste modo.
+        
+        Args:
+            keywords: string ou lista de palavras-chave para filtrar
+            pages: número de páginas para percorrer em cada busca
+            workers: número de processos
+            incremental: para de paginar uma busca na primeira página só com vagas
+                já vistas em execuções anteriores
+            sources: nomes dos sites (de self.sources) a percorrer; padrão: todos
+            resume: retoma a última coleta não terminada com os mesmos parâmetros,
+                pulando as páginas já gravadas (veja scrape)
+        """
+        adapters = self._select_sources(sources)
+        run = self._start_run(keywords, pages, incremental, adapters, resume)
+        if run is None:
+            return self._run_result(self._new_stats(), 0)
+        keywords, plans, stats, watermarks = run
+        
+        # Buscas já concluídas em uma execução anterior não vão para o pool
+        for _, keyword, page_urls, adapter in plans:
+            if not page_urls:
+                self._finish_keyword(adapter, keyword)
+        pending_plans = [plan for plan in plans if plan[2]]
+        
+        workers = max(1, min(int(workers), len(pending_plans) or 1))
+        logger.info("[%s] Modo multiprocesso: %s processo(s)", self._label(adapters), workers)
+        
+        # Cada processo tem sua sessão; o limite de taxa é dividido entre eles
+        http_options = {
+            'pool_size': 1,
+            'max_retries': self.http.max_retries,
+            'backoff_factor': self.http.backoff_factor,
+            'max_backoff': self.http.max_backoff,
+            'rate_limit': self.http.rate_limit / workers if self.http.rate_limit else None,
+            'burst': self.http.burst,
+            'timeout': self.http.timeout
+        }
+        retries = 0
+        
+        with ProcessPoolExecutor(max_workers=workers, initializer=_init_crawl_worker,
+                                 initargs=(keywords, http_options)) as executor:
+            futures = {
+                executor.submit(crawl_keyword, adapter, keyword, page_urls,
+                                watermarks.get(adapter.watermark_key(keyword))): (keyword_index, keyword, adapter)
+                for keyword_index, keyword, page_urls, adapter in pending_plans
+            }
+            
+            # Grava cada busca assim que o processo dela termina
+            for future in as_completed(futures):
+                keyword_index, keyword, adapter = futures[future]
+                logger.info("\n🔍 [%s/%s] Resultados de: '%s' (%s)", keyword_index, len(keywords),
+                            keyword, adapter.name)
+                
+                try:
+                    result = future.result()
+                except Exception as e:
+                    logger.warning("    ⚠️ Erro inesperado na busca '%s': %s", keyword, e)
+                    stats['errors'] += 1
+                    continue
+                
+                retries += result['retries']
+                self._metrics.merge(result['metrics'])
+                self._merge_keyword_result(result, adapter, keywords, stats,
+                                           watermarks.get(adapter.watermark_key(keyword)))
+        
+        return self._finish_run(keywords, plans, pages, stats, retries, adapters)
+    
+    def _merge_keyword_result(self, result, adapter, keywords, stats, watermark):
+        """Grava as páginas devolvidas por crawl_keyword e soma os contadores"""
+        keyword = result['keyword']
+        
+        for page, listings, errors in result['pages']:
+            logger.info("  📄 Página %s...", page)
+            for error in errors:
+                logger.warning("    ❌ %s", error)
+            
+            if listings is None:
+                # Download falhou
+                stats['errors'] += len(errors)
+                self._journal_failure(adapter, keyword, page, errors[0])
+                continue
+            
+            if not listings:
+                logger.info("    ℹ️ Nenhuma vaga encontrada na página %s", page)
+            before = dict(stats)
+            stats['errors'] += len(errors)
+            if self._commit_page(adapter, keyword, page, listings, keywords, stats, watermark, before):
+                break
+        
+        self._finish_keyword(adapter, keyword)
+    
+    def _select_sources(self, sources):
+        """Adaptadores dos sites pedidos (todos os registrados se sources for None)"""
+        if sources is None:
+            return list(self.sources.values())
+        if not sources:
+            raise ValueError("Nenhum site de vagas informado em sources")
+        
+        unknown = [name for name in sources if name not in self.sources]
+        if unknown:
+            raise ValueError(f"Site(s) de vagas não registrado(s): {', '.join(unknown)}")
+        return [self.sources[name] for name in sources]
+    
+    def _label(self, adapters):
+        """Nomes dos sites de uma execução, para as mensagens"""
+        return ', '.join(adapter.name for adapter in adapters)
+    
+    def _new_stats(self):
+        """Contadores zerados de uma execução"""
+        return {'saved': 0, 'duplicates': 0, 'errors': 0, 'filtered': 0,
+                'skipped_fetches': 0, 'skipped_listings': 0, 'pages': 0, 'early_stops': 0,
+                'cache_hits': 0, 'cache_misses': 0, 'not_modified': 0, 'resumed_pages': 0}
+    
+    def _start_run(self, keywords, pages, incremental, adapters, resume=False):
+        """Abre a execução no diário de coletas e monta as buscas; retorna (keywords, plans, stats, watermarks) ou None"""
+        # Converte keywords para lista se for string
+        if isinstance(keywords, str):
+            keywords = [keywords]
+        
+        # Remove espaços, converte para minúsculo e descarta repetidas ("TI"/"ti")
+        raw_count = len([k for k in keywords if k.strip()])
+        keywords = self.normalize_keywords(keywords)
+        
+        if not keywords:
+            print("❌ Nenhuma palavra-chave válida fornecida!")
+            return None
+        
+        stats = self._new_stats()
+        self._metrics = RunMetrics()
+        self._status_before = dict(self.http.status_counts)
+        self._incremental = incremental
+        self._seen_listings = set()
+        self._run_watermarks = {}
+        self._keyword_matcher(keywords)
+        
+        label = self._label(adapters)
+        logger.info("[%s] Iniciando scraping com filtros: %s", label, ', '.join(keywords))
+        logger.info("[%s] Fazendo busca para cada palavra-chave - %s página(s) cada", label, pages)
+        
+        # Monta as buscas (site, palavra-chave e URLs das páginas), sem repetir
+        # buscas que geram a mesma URL
+        signature = json.dumps({'sources': [adapter.name for adapter in adapters], 'keywords': keywords,
+                                'pages': pages, 'incremental': incremental}, ensure_ascii=False)
+        self._crawl_run, units = self.store.start_crawl_run(signature, resume, self.resume_max_age)
+        done = self._resume_units(units, stats)
+        if units:
+            logger.info("[%s] Retomando a coleta anterior: %s página(s) já gravada(s)", label, len(units))
+        
+        plans = []
+        search_urls = set()
+        for adapter in adapters:
+            for keyword_index, keyword in enumerate(keywords, 1):
+                first_url = adapter.search_url(keyword, 1)
+                if first_url in search_urls:
+                    continue
+                search_urls.add(first_url)
+                
+                page_urls = []
+                for page, url in enumerate(adapter.search_urls(keyword, pages), 1):
+                    stop = done.get((adapter.name, keyword, page))
+                    if stop:
+                        break
+                    if stop is None:
+                        page_urls.append((page, url))
+                plans.append((keyword_index, keyword, page_urls, adapter))
+        
+        stats['skipped_fetches'] = (raw_count * len(adapters) - len(plans)) * pages
+        watermarks = self.store.get_watermarks() if incremental else {}
+        
+        if incremental:
+            logger.info("[%s] Modo incremental: %s busca(s) com marca d'água", label, len(watermarks))
+        
+        return keywords, plans, stats, watermarks
+    
+    def _resume_units(self, units, stats):
+        """
+        Soma ao estado da execução as páginas concluídas de uma coleta retomada.
+        
+        Retorna {(site, palavra-chave, página): parou_a_busca}.
+        """
+        done = {}
+        for source, keyword, page, stop, counters, listing_ids in units:
+            done[(source, keyword, page)] = stop
+            for key, value in counters.items():
+                stats[key] += value
+            
+            # Vagas e marcas d'água das páginas gravadas, como se elas tivessem
+            # acabado de ser processadas
+            self._seen_listings.update((source, listing_id) for listing_id in listing_ids)
+            if listing_ids and source in self.sources:
+                key = self.sources[source].watermark_key(keyword)
+                self._run_watermarks[key] = max(self._run_watermarks.get(key, 0), max(listing_ids))
+        
+        stats['resumed_pages'] = len(units)
+        return done
+    
+    def _finish_run(self, keywords, plans, pages, stats, retries, adapters):
+        """Imprime o resumo final da execução e monta o dicionário de resultado"""
+        totals = {adapter.name: self.get_jobs_count(adapter.name) for adapter in adapters}
+        
+        self._metrics.add_status_codes({code: count - self._status_before.get(code, 0)
+                                        for code, count in self.http.status_counts.items()
+                                        if count != self._status_before.get(code, 0)})
+        # Páginas retomadas do diário não contam na vazão desta execução
+        metrics = self._metrics.summary(stats['pages'] - stats['resumed_pages'])
+        
+        print(f"\n📊 [{self._label(adapters)}] Resumo Final:")
+        print(f"  • Palavras-chave usadas: {', '.join(keywords)}")
+        print(f"  • Vagas novas salvas: {stats['saved']}")
+        print(f"  • Duplicatas ignoradas: {stats['duplicates']}")
+        print(f"  • Vagas filtradas (sem palavra-chave): {stats['filtered']}")
+        print(f"  • Erros encontrados: {stats['errors']}")
+        print(f"  • Novas tentativas de download: {retries}")
+        print(f"  • Páginas processadas: {stats['pages']} de {len(plans) * pages}")
+        print(f"  • Buscas encerradas antes da última página: {stats['early_stops']}")
+        if stats['resumed_pages']:
+            print(f"  • Páginas retomadas da coleta interrompida (não baixadas de novo): {stats['resumed_pages']}")
+        print(f"  • Páginas não baixadas (buscas repetidas): {stats['skipped_fetches']}")
+        print(f"  • Vagas repetidas entre buscas (não reprocessadas): {stats['skipped_listings']}")
+        if self.cache:
+            print(f"  • Cache HTTP: {stats['cache_hits']} página(s) sem alterações "
+                  f"({stats['not_modified']} via 304), {stats['cache_misses']} baixada(s) de novo")
+        for name, total in totals.items():
+            print(f"  • Total de vagas no banco ({name}): {total}")
+        print(f"  • Tempo total: {metrics['elapsed']:.2f}s ({metrics['pages_per_s']} páginas/s, "
+              f"{metrics['jobs_per_s']} vagas/s, {metrics['bytes_downloaded'] / 1e6:.1f} MB baixados)")
+        print("  • Tempo por etapa: " + ", ".join(
+            f"{stage} {seconds:.2f}s" for stage, seconds in metrics['timings'].items()))
+        if self.near_duplicates:
+            indexed = self.near_duplicates.index_pending()
+            print(f"  • Vagas indexadas para quase-duplicatas: {indexed}")
+        
+        self.store.finish_crawl_run(self._crawl_run)
+        
+        result = self._run_result(stats, sum(totals.values()), metrics)
+        if self.metrics_file:
+            write_metrics(self.metrics_file, result, [adapter.name for adapter in adapters])
+        return result
+    
+    def _run_result(self, stats, total_jobs, metrics=None):
+        """Dicionário de resultado de scrape() (métricas de tempo e HTTP em 'metrics')"""
+        return {
+            'saved': stats['saved'],
+            'duplicates': stats['duplicates'],
+            'errors': stats['errors'],
+            'filtered': stats['filtered'],
+            'total': total_jobs,
+            'skipped_fetches': stats['skipped_fetches'],
+            'skipped_listings': stats['skipped_listings'],
+            'pages': stats['pages'],
+            'early_stops': stats['early_stops'],
+            'cache_hits': stats['cache_hits'],
+            'cache_misses': stats['cache_misses'],
+            'not_modified': stats['not_modified'],
+            'resumed_pages': stats['resumed_pages'],
+            'metrics': metrics or RunMetrics().summary(0)
+        }
+    
+    def _finish_keyword(self, adapter, keyword):
+        """Grava a marca d'água (maior id de vaga visto) da busca"""
+        key = adapter.watermark_key(keyword)
+        if key in self._run_watermarks:
+            self.store.update_watermark(key, self._run_watermarks[key])
+    
+    def _scrape_serial(self, plans, keywords, stats, watermarks):
+        """Percorre as páginas uma a uma (comportamento original)"""
+        # 🔄 BUSCA POR CADA PALAVRA-CHAVE
+        for keyword_index, keyword, page_urls, adapter in plans:
+            logger.info("\n🔍 [%s/%s] Buscando por: '%s' (%s)", keyword_index, len(keywords), keyword, adapter.name)
+            watermark = watermarks.get(adapter.watermark_key(keyword))
+            filter_key = self._filter_key(adapter, keywords)
+            
+            for page, url in page_urls:
+                try:
+                    logger.info("  📄 Página %s...", page)
+                    fetched = self._fetch_page(url, filter_key)
+                    if self._handle_page(fetched, adapter, keyword, page, keywords, stats, watermark):
+                        break
+                
+                except requests.RequestException as e:
+                    logger.warning("    🌐 Erro na página %s: %s", page, e)
+                    stats['errors'] += 1
+                    self._journal_failure(adapter, keyword, page, e)
+                
+                except Exception as e:
+                    logger.warning("    ⚠️ Erro inesperado na página %s: %s", page, e)
+                    stats['errors'] += 1
+                    self._journal_failure(adapter, keyword, page, e)
+            
+            self._finish_keyword(adapter, keyword)
+    
+    def _scrape_concurrent(self, plans, keywords, stats, watermarks, concurrency):
+        """
+        Baixa as páginas em paralelo com um pool de threads.
+        
+        Só o download acontece nas threads; o parsing e a escrita no banco
+        ficam na thread principal, conforme cada página termina de chegar,
+        então uma página lenta não segura as outras. As páginas de uma mesma
+        busca são processadas em ordem (as que chegam antes esperam), para
+        que a parada antecipada e os contadores sejam os do modo serial.
+        Buscas de sites diferentes andam juntas, cada host com seu limite.
+        """
+        # Páginas de cada busca em andamento ao mesmo tempo
+        lookahead = max(1, -(-concurrency // len(plans)))
+        
+        # next_submit, next_process e ready usam a posição em page_urls (ao
+        # retomar uma coleta, a busca pode não começar na página 1)
+        crawls = [
+            {'index': keyword_index, 'keyword': keyword, 'page_urls': page_urls, 'adapter': adapter,
+             'filter_key': self._filter_key(adapter, keywords),
+             'next_submit': 0, 'next_process': 0, 'ready': {}, 'done': False}
+            for keyword_index, keyword, page_urls, adapter in plans
+        ]
+        
+        with ThreadPoolExecutor(max_workers=concurrency) as executor:
+            pending = {}
+            
+            def submit_more(crawl):
+                while (not crawl['done'] and crawl['next_submit'] < len(crawl['page_urls'])
+                       and crawl['next_submit'] - crawl['next_process'] < lookahead):
+                    position = crawl['next_submit']
+                    future = executor.submit(self._fetch_page, crawl['page_urls'][position][1], crawl['filter_key'])
+                    pending[future] = (crawl, position)
+                    crawl['next_submit'] += 1
+            
+            for crawl in crawls:
+                if not crawl['page_urls']:
+                    # Busca já concluída em uma execução anterior
+                    crawl['done'] = True
+                    self._finish_keyword(crawl['adapter'], crawl['keyword'])
+                submit_more(crawl)
+            
+            while pending:
+                finished, _ = wait(pending, return_when=FIRST_COMPLETED)
+                
+                for future in finished:
+                    crawl, position = pending.pop(future)
+                    if crawl['done']:
+                        continue  # a busca já parou: descarta a página
+                    crawl['ready'][position] = future
+                    
+                    while not crawl['done'] and crawl['next_process'] in crawl['ready']:
+                        self._process_ready_page(crawl, keywords, stats, watermarks)
+                    
+                    submit_more(crawl)
+    
+    def _process_ready_page(self, crawl, keywords, stats, watermarks):
+        """Processa a próxima página (em ordem) de uma busca do modo concorrente"""
+        keyword = crawl['keyword']
+        adapter = crawl['adapter']
+        position = crawl['next_process']
+        page = crawl['page_urls'][position][0]
+        future = crawl['ready'].pop(position)
+        crawl['next_process'] += 1
+        stop = False
+        
+        try:
+            fetched = future.result()
+            logger.info("  📄 [%s/%s] '%s' (%s) - Página %s", crawl['index'], len(keywords), keyword,
+                        adapter.name, page)
+            stop = self._handle_page(fetched, adapter, keyword, page, keywords, stats,
+                                     watermarks.get(adapter.watermark_key(keyword)))
+        
+        except requests.RequestException as e:
+            logger.warning("    🌐 Erro na página %s de '%s': %s", page, keyword, e)
+            stats['errors'] += 1
+            self._journal_failure(adapter, keyword, page, e)
+        
+        except Exception as e:
+            logger.warning("    ⚠️ Erro inesperado na página %s de '%s': %s", page, keyword, e)
+            stats['errors'] += 1
+            self._journal_failure(adapter, keyword, page, e)
+        
+        if stop or crawl['next_process'] >= len(crawl['page_urls']):
+            crawl['done'] = True
+            crawl['ready'].clear()
+            self._finish_keyword(adapter, keyword)
+    
+    def enrich_details(self, concurrency=4, limit=None, max_attempts=3, batch_size=50, rate_limit=2.0):
+        """
+        Baixa as páginas de detalhe das vagas na fila (job_details pendentes).
+        
+        Só as vagas inseridas desde que a tabela existe entram na fila, e
+        uma vaga já enriquecida nunca é baixada de novo. O download usa um
+        pool de threads com no máximo 2 x concurrency páginas em andamento;
+        o parsing e a gravação (em lotes de batch_size) ficam nesta thread.
+        Se a execução for interrompida, as vagas que faltaram continuam
+        pendentes e são retomadas na próxima chamada. Uma página em que nenhum
+        campo foi encontrado (layout diferente do esperado) conta como falha
+        e volta para a fila, em vez de marcar a vaga como enriquecida.
+        
+        Args:
+            concurrency: downloads simultâneos (também o limite por host)
+            limit: máximo de vagas processadas nesta chamada (None = toda a fila)
+            max_attempts: tentativas por vaga antes de desistir (status 'failed')
+            batch_size: páginas gravadas por transação
+            rate_limit: páginas de detalhe por segundo por host, quando o
+                HttpClient não tem limite próprio (None = sem limite)
+        """
+        concurrency = max(1, int(concurrency))
+        self._per_host_limit = concurrency
+        self._host_semaphores = {}
+        self.http.resize_pool(concurrency)
+        
+        stats = {'enriched': 0, 'failed': 0, 'empty': 0, 'gone': 0, 'unsupported': 0, 'skipped': 0}
+        done, failed = [], []
+        
+        # Um token bucket por host (o do HttpClient, se houver, já vale para tudo)
+        buckets = {}
+        if self.http.rate_limit:
+            rate_limit = None
+        started = time.perf_counter()
+        
+        def flush():
+            if done or failed:
+                self.store.save_details(done, failed, max_attempts)
+                done.clear()
+                failed.clear()
+        
+        def handle(job_id, adapter, future):
+            try:
+                status_code, content = future.result()
+                if status_code in (404, 410):
+                    failed.append((job_id, 'gone', f"HTTP {status_code}"))
+                    stats['gone'] += 1
+                    return
+                details = adapter.parse_detail(content)
+            except Exception as e:
+                failed.append((job_id, None, str(e)))
+                stats['failed'] += 1
+                logger.warning("    ❌ Erro no detalhe da vaga %s: %s", job_id, e)
+                return
+            
+            if details is None:
+                failed.append((job_id, 'unsupported', None))
+                stats['unsupported'] += 1
+                return
+            
+            if not any(details.values()):
+                # Nenhum seletor casou: provavelmente o layout da página mudou
+                failed.append((job_id, None, "nenhum campo encontrado na página de detalhe"))
+                stats['empty'] += 1
+                logger.warning("    ❌ Detalhe da vaga %s sem nenhum campo reconhecido", job_id)
+                return
+            
+            done.append((job_id, details.get('description'), details.get('location'),
+                         details.get('seniority'), details.get('salary'), details.get('posted_at')))
+            stats['enriched'] += 1
+            logger.debug("    📝 Detalhes da vaga %s: %s", job_id, details.get('location'))
+        
+        logger.info("📝 Enriquecendo vagas novas com a página de detalhe (%s download(s) simultâneo(s))",
+                    concurrency)
+        
+        with ThreadPoolExecutor(max_workers=concurrency) as executor:
+            in_flight = {}
+            for job_id, source, link in self.store.iter_pending_details(limit):
+                adapter = self.sources.get(source)
+                if adapter is None:
+                    # Site não registrado neste scraper: fica na fila para quem tiver o adaptador
+                    stats['skipped'] += 1
+                    continue
+                if type(adapter).parse_detail is SourceAdapter.parse_detail:
+                    failed.append((job_id, 'unsupported', None))
+                    stats['unsupported'] += 1
+                    continue
+                
+                # Fila limitada: espera alguma página terminar antes de pedir mais
+                while len(in_flight) >= 2 * concurrency:
+                    finished, _ = wait(in_flight, return_when=FIRST_COMPLETED)
+                    for future in finished:
+                        handle(*in_flight.pop(future), future)
+                    if len(done) + len(failed) >= batch_size:
+                        flush()
+                
+                bucket = None
+                if rate_limit:
+                    host = urlsplit(link).netloc
+                    if host not in buckets:
+                        buckets[host] = TokenBucket(rate_limit)
+                    bucket = buckets[host]
+                in_flight[executor.submit(self._fetch_detail, link, bucket)] = (job_id, adapter)
+            
+            while in_flight:
+                finished, _ = wait(in_flight, return_when=FIRST_COMPLETED)
+                for future in finished:
+                    handle(*in_flight.pop(future), future)
+                if len(done) + len(failed) >= batch_size:
+                    flush()
+        
+        flush()
+        stats['elapsed'] = round(time.perf_counter() - started, 3)
+        print(f"📝 Detalhes: {stats['enriched']} vaga(s) enriquecida(s), {stats['failed']} erro(s), "
+              f"{stats['empty']} sem campos reconhecidos, {stats['gone']} removida(s) do site, {stats['unsupported']} sem parser ({stats['elapsed']}s)")
+        return stats
+    
+    def _fetch_detail(self, url, bucket=None):
+        """Baixa uma página de detalhe respeitando o limite por host; devolve (status, bytes)"""
+        if bucket:
+            bucket.acquire()
+        with self._host_semaphore(url):
+            r = self.http.get(url)
+        if r.status_code not in (404, 410):
+            r.raise_for_status()
+        return r.status_code, r.content
+    
+    EXPORT_COLUMNS = ['source', 'title', 'company', 'link', 'created_at']
+    
+    def _iter_export_chunks(self, chunk_size=5000):
+        """Percorre as vagas (mais recentes primeiro) em blocos de chunk_size linhas"""
+        cursor = self.store.conn.cursor()
+        
+        cursor.execute('''
+            SELECT source, title, company, link, created_at 
+            FROM jobs 
+            ORDER BY created_at DESC
+        ''')
+        
+        while True:
+            rows = cursor.fetchmany(chunk_size)
+            if not rows:
+                break
+            yield rows
+    
+    def export_to_csv(self, filename="vagas_export.csv", chunk_size=5000):
+        """Exporta todas as vagas para CSV, em blocos (memória constante)"""
+        import csv
+        
+        total = 0
+        with open(filename, 'w', newline='', encoding='utf-8') as file:
+            writer = csv.writer(file)
+            writer.writerow(['Fonte', 'Título', 'Empresa', 'Link', 'Data'])
+            for rows in self._iter_export_chunks(chunk_size):
+                writer.writerows(rows)
+                total += len(rows)
+        
+        print(f"📄 Dados exportados para {filename} ({total} vagas)")
+        return total
+    
+    def export_to_jsonl(self, filename="vagas_export.jsonl", chunk_size=5000):
+        """Exporta todas as vagas para JSON Lines (um objeto por linha), em blocos"""
+        total = 0
+        with open(filename, 'w', encoding='utf-8') as file:
+            for rows in self._iter_export_chunks(chunk_size):
+                file.writelines(
+                    json.dumps(dict(zip(self.EXPORT_COLUMNS, row)), ensure_ascii=False) + '\n'
+                    for row in rows
+                )
+                total += len(rows)
+        
+        print(f"📄 Dados exportados para {filename} ({total} vagas)")
+        return total
+    
+    def export_to_parquet(self, filename="vagas_export.parquet", chunk_size=50000):
+        """Exporta todas as vagas para Parquet (um row group por bloco); requer pyarrow"""
+        try:
+            import pyarrow as pa
+            import pyarrow.parquet as pq
+        except ImportError:
+            print("❌ Para exportar Parquet, instale: pip install pyarrow")
+            return 0
+        
+        schema = pa.schema([(column, pa.string()) for column in self.EXPORT_COLUMNS])
+        total = 0
+        with pq.ParquetWriter(filename, schema) as writer:
+            for rows in self._iter_export_chunks(chunk_size):
+                columns = [list(column) for column in zip(*rows)]
+                writer.write_table(pa.Table.from_arrays(columns, schema=schema))
+                total += len(rows)
+        
+        print(f"📄 Dados exportados para {filename} ({total} vagas)")
+        return total
+    
+    def export_incremental(self, filename="vagas_export.csv", rotate_daily=False, chunk_size=5000):
+        """
+        Exporta só as vagas adicionadas desde a exportação anterior para o mesmo arquivo
+        
+        A marca d'água (último id exportado) fica na tabela export_state. Na
+        primeira vez o arquivo é escrito do zero com todas as vagas; depois, as
+        novas são acrescentadas ao fim. O formato sai da extensão (.csv ou .jsonl).
+        
+        Args:
+            filename: arquivo de destino (também identifica a marca d'água)
+            rotate_daily: grava em um arquivo por dia (ex.: vagas_2025-09-03.csv)
+            chunk_size: vagas lidas do banco por vez
+        """
+        import csv
+        
+        base, ext = os.path.splitext(filename)
+        if ext not in ('.csv', '.jsonl'):
+            print(f"❌ Formato não suportado para exportação incremental: {ext}")
+            return 0
+        
+        last_id = self.store.get_export_watermark(filename)
+        target = f"{base}_{datetime.now():%Y-%m-%d}{ext}" if rotate_daily else filename
+        
+        # Sem marca d'água (primeira exportação), o arquivo é reescrito por inteiro
+        mode = 'a' if last_id is not None else 'w'
+        new_file = mode == 'w' or not os.path.exists(target) or os.path.getsize(target) == 0
+        
+        cursor = self.store.conn.cursor()
+        cursor.execute('''
+            SELECT id, source, title, company, link, created_at
+            FROM jobs
+            WHERE id > ?
+            ORDER BY id
+        ''', (last_id or 0,))
+        
+        total = 0
+        with open(target, mode, newline='', encoding='utf-8') as file:
+            writer = csv.writer(file) if ext == '.csv' else None
+            if writer and new_file:
+                writer.writerow(['Fonte', 'Título', 'Empresa', 'Link', 'Data'])
+            
+            while True:
+                rows = cursor.fetchmany(chunk_size)
+                if not rows:
+                    break
+                
+                if writer:
+                    writer.writerows(row[1:] for row in rows)
+                else:
+                    file.writelines(
+                        json.dumps(dict(zip(self.EXPORT_COLUMNS, row[1:])), ensure_ascii=False) + '\n'
+                        for row in rows
+                    )
+                last_id = rows[-1][0]
+                total += len(rows)
+        
+        # A marca d'água só avança depois que o arquivo foi gravado
+        if last_id is not None:
+            self.store.set_export_watermark(filename, last_id, total)
+        
+        print(f"📄 {total} vaga(s) nova(s) exportada(s) para {target}")
+        return total
+    
+    def search_jobs(self, keyword, source=None, limit=None, offset=0):
+        """
+        Busca vagas por palavra-chave no título ou na empresa
+        
+        Usa o índice FTS5 (sem diferença de acentos/maiúsculas, cada palavra
+        como prefixo) e ordena por relevância (bm25) entre as SEARCH_RANK_WINDOW
+        vagas mais recentes que casam, para o tempo não crescer com a tabela.
+        Termos com símbolos ("c++", "c#") caem na busca com LIKE.
+        
+        Args:
+            keyword: texto a buscar
+            source: filtra por fonte (opcional)
+            limit: máximo de resultados (None = todos)
+            offset: quantos resultados pular (paginação)
+        """
+        cursor = self.store.conn.cursor()
+        match = fts_query(keyword)
+        
+        if match:
+            query = ranked_search_sql("SELECT jobs.*", source)
+            params = [match] + ([source] if source else []) + [rank_window(limit, offset)]
+        else:
+            query = "SELECT * FROM jobs WHERE (title LIKE ? OR company LIKE ?)"
+            params = [f"%{keyword}%", f"%{keyword}%"]
+            
+            if source:
+                query += " AND source = ?"
+                params.append(source)
+            
+            query += " ORDER BY created_at DESC LIMIT ? OFFSET ?"
+        
+        params += [limit if limit is not None else -1, offset]
+        
+        cursor.execute(query, params)
+        return cursor.fetchall()
+    
+    def find_near_duplicates(self, title, company):
+        """Vagas já coletadas com título parecido na mesma empresa: [(job_id, similaridade)]"""
+        if not self.near_duplicates:
+            return []
+        self.near_duplicates.index_pending()
+        return self.near_duplicates.query(title, company)
+    
+    def near_duplicate_clusters(self, min_size=2, limit=20):
+        """Grupos de vagas quase-duplicadas, dos maiores para os menores"""
+        if not self.near_duplicates:
+            return []
+        self.near_duplicates.index_pending()
+        return self.near_duplicates.clusters(min_size, limit)
+    
+    def clear_database(self):
+        """Limpa todas as vagas do banco (útil para testes)"""
+        self.store.clear()
+        if self.near_duplicates:
+            self.near_duplicates.clear()
+        if self.cache:
+            self.cache.clear()
+        
+        print("🗑️ Banco de dados limpo!")
+    
+    def close(self):
+        """Fecha a conexão com o banco e as conexões HTTP"""
+        self.store.close()
+        self.http.close()
@@ -0,0 +1,130 @@
+"""
+Modo daemon (CrawlScheduler): recoleta cada palavra-chave no seu próprio
+intervalo, ajustado pelas vagas novas que ela vem trazendo.
+"""
+from datetime import datetime, timezone
+import threading
+import time
+
+
+class CrawlScheduler:
+    """
+    Modo daemon: recoleta cada palavra-chave no seu próprio intervalo.
+    
+    Depois de cada coleta (incremental) o intervalo da palavra-chave é
+    ajustado pela média móvel de vagas novas que ela trouxe nas últimas
+    execuções: acima da meta (target_new_jobs) ele encurta, abaixo alonga,
+    e sem nenhuma vaga nova dobra, sempre entre min_interval e max_interval.
+    A agenda fica na tabela crawl_schedule, então um daemon reiniciado
+    continua de onde parou.
+    """
+    
+    TIME_FORMAT = '%Y-%m-%d %H:%M:%S'
+    
+    def __init__(self, scraper, keywords, pages=10, concurrency=1, sources=None,
+                 initial_interval=3600, min_interval=900, max_interval=86400,
+                 target_new_jobs=5, smoothing=0.5):
+        """
+        Args:
+            scraper: JobPipeline (ou JobScraper) usado nas coletas (e cujo banco guarda a agenda)
+            keywords: palavras-chave agendadas
+            pages, concurrency, sources: repassados a JobPipeline.scrape
+            initial_interval: intervalo (s) de uma palavra-chave nova na agenda
+            min_interval / max_interval: limites (s) do intervalo adaptativo
+            target_new_jobs: vagas novas por coleta que mantêm o intervalo
+            smoothing: peso da última coleta na média móvel de vagas novas
+        """
+        self.scraper = scraper
+        self.keywords = scraper.normalize_keywords([keywords] if isinstance(keywords, str) else keywords)
+        self.pages = pages
+        self.concurrency = concurrency
+        self.sources = sources
+        self.initial_interval = initial_interval
+        self.min_interval = min_interval
+        self.max_interval = max_interval
+        self.target_new_jobs = target_new_jobs
+        self.smoothing = smoothing
+        self._stop = threading.Event()
+    
+    def _timestamp(self, epoch):
+        return datetime.fromtimestamp(epoch, timezone.utc).strftime(self.TIME_FORMAT)
+    
+    def _epoch(self, timestamp):
+        return datetime.strptime(timestamp, self.TIME_FORMAT).replace(tzinfo=timezone.utc).timestamp()
+    
+    def next_interval(self, interval, avg_new_jobs):
+        """Novo intervalo: proporcional à meta de vagas novas, no máximo dobrando ou caindo pela metade"""
+        if avg_new_jobs <= 0:
+            factor = 2.0
+        else:
+            factor = min(2.0, max(0.5, self.target_new_jobs / avg_new_jobs))
+        return min(self.max_interval, max(self.min_interval, interval * factor))
+    
+    def due_keywords(self, now=None):
+        """Palavras-chave cuja próxima coleta já chegou, das mais atrasadas para as mais recentes"""
+        now = time.time() if now is None else now
+        schedule = self.scraper.store.get_schedule()
+        
+        due = []
+        for index, keyword in enumerate(self.keywords):
+            entry = schedule.get(keyword)
+            next_run = self._epoch(entry['next_run_at']) if entry else 0.0
+            if next_run <= now:
+                due.append((next_run, index, keyword))
+        return [keyword for _, _, keyword in sorted(due)]
+    
+    def seconds_until_next(self, now=None):
+        """Segundos até a próxima palavra-chave vencer (0 se alguma já venceu)"""
+        now = time.time() if now is None else now
+        schedule = self.scraper.store.get_schedule()
+        
+        next_runs = [self._epoch(schedule[k]['next_run_at']) if k in schedule else now for k in self.keywords]
+        return max(0.0, min(next_runs) - now) if next_runs else None
+    
+    def run_keyword(self, keyword):
+        """Coleta uma palavra-chave e reagenda conforme as vagas novas que ela trouxe"""
+        entry = self.scraper.store.get_schedule().get(keyword)
+        interval = entry['interval_seconds'] if entry else self.initial_interval
+        
+        result = self.scraper.scrape([keyword], pages=self.pages, concurrency=self.concurrency,
+                                     incremental=True, sources=self.sources)
+        new_jobs = result['saved']
+        
+        if entry and entry['runs']:
+            avg_new_jobs = self.smoothing * new_jobs + (1 - self.smoothing) * entry['avg_new_jobs']
+        else:
+            avg_new_jobs = float(new_jobs)
+        interval = self.next_interval(interval, avg_new_jobs)
+        
+        next_run_at = self._timestamp(time.time() + interval)
+        self.scraper.store.save_schedule(keyword, interval, next_run_at, avg_new_jobs, new_jobs)
+        print(f"🗓️ '{keyword}': {new_jobs} vaga(s) nova(s) (média {avg_new_jobs:.1f}); "
+              f"próxima coleta em {interval / 60:.0f} min ({next_run_at} UTC)")
+        return result
+    
+    def run_once(self):
+        """Coleta todas as palavras-chave vencidas; retorna {palavra-chave: resultado}"""
+        results = {}
+        for keyword in self.due_keywords():
+            if self._stop.is_set():
+                break
+            results[keyword] = self.run_keyword(keyword)
+        return results
+    
+    def run_forever(self, max_sleep=60):
+        """Laço do daemon: coleta o que venceu e dorme até a próxima; Ctrl+C ou stop() encerram"""
+        print(f"🗓️ Agendador iniciado com {len(self.keywords)} palavra(s)-chave")
+        try:
+            while not self._stop.is_set():
+                self.run_once()
+                wait_for = self.seconds_until_next()
+                if wait_for is None:
+                    break
+                self._stop.wait(min(max_sleep, max(1.0, wait_for)))
+        except KeyboardInterrupt:
+            pass
+        print("🗓️ Agendador encerrado (a agenda fica salva no banco)")
+    
+    def stop(self):
+        """Pede para o laço de run_forever terminar depois da coleta em andamento"""
+        self._stop.set()
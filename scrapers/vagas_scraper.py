@@ -1,327 +1,240 @@
-import requests
-from bs4 import BeautifulSoup
-import sqlite3
-import hashlib
+from bs4 import BeautifulSoup, SoupStrainer
+import argparse
 import re
-from datetime import datetime
-import os
+import sys
 
-class JobScraper:
-    def __init__(self, db_path="jobs.db"):
-        self.db_path = db_path
-        self.init_database()
-    
-    def init_database(self):
-        """Inicializa o banco de dados SQLite"""
-        conn = sqlite3.connect(self.db_path)
-        cursor = conn.cursor()
-        
-        cursor.execute('''
-            CREATE TABLE IF NOT EXISTS jobs (
-                id INTEGER PRIMARY KEY AUTOINCREMENT,
-                source TEXT NOT NULL,
-                title TEXT NOT NULL,
-                company TEXT NOT NULL,
-                link TEXT,
-                job_hash TEXT UNIQUE NOT NULL,
-                created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
-                updated_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
-            )
-        ''')
-        
-        # Índice para busca rápida por hash
-        cursor.execute('''
-            CREATE INDEX IF NOT EXISTS idx_job_hash ON jobs(job_hash)
-        ''')
-        
-        conn.commit()
-        conn.close()
-    
-    def generate_job_hash(self, title, company, source):
-        """Gera um hash único baseado no título, empresa e fonte"""
-        # Normaliza os textos para evitar duplicatas por diferenças mínimas
-        normalized_title = re.sub(r'\s+', ' ', title.lower().strip())
-        normalized_company = re.sub(r'\s+', ' ', company.lower().strip())
-        
-        hash_input = f"{source}:{normalized_title}:{normalized_company}"
-        return hashlib.md5(hash_input.encode('utf-8')).hexdigest()
+try:
+    from .pipeline import JobPipeline, SourceAdapter, clean_text, configure_logging
+    from .scheduler import CrawlScheduler
+except ImportError:
+    # Executado como script (python scrapers/vagas_scraper.py), fora do pacote
+    from pipeline import JobPipeline, SourceAdapter, clean_text, configure_logging
+    from scheduler import CrawlScheduler
+
+# lxml é opcional: quando instalado, o parsing das páginas fica bem mais rápido
+try:
+    import lxml  # noqa: F401
+    DEFAULT_HTML_PARSER = "lxml"
+except ImportError:
+    DEFAULT_HTML_PARSER = "html.parser"
+
+# Palavras-chave padrão: Dados e Programação
+DEFAULT_KEYWORDS = [
+    # Programação Geral
+    "programador", "desenvolvedor", "TI", "tecnologia", "it", "IT", "ti", "tecnologia da informação",
+    "sistemas", "engenheiro de software", "dados", "inteligência de dados", "data",
     
-    def job_exists(self, job_hash):
-        """Verifica se a vaga já existe no banco"""
-        conn = sqlite3.connect(self.db_path)
-        cursor = conn.cursor()
-        
-        cursor.execute("SELECT id FROM jobs WHERE job_hash = ?", (job_hash,))
-        exists = cursor.fetchone() is not None
-        
-        conn.close()
-        return exists
+    # Linguagens de Programação
+    "python", "java", "javascript", "c++", "c#", "react", "angular", "node", "laravel", "django",
     
-    def insert_job(self, source, title, company, link=None):
-        """Insere uma nova vaga no banco (só se não existir)"""
-        job_hash = self.generate_job_hash(title, company, source)
-        
-        if self.job_exists(job_hash):
-            return False  # Vaga já existe
-        
-        conn = sqlite3.connect(self.db_path)
-        cursor = conn.cursor()
-        
-        try:
-            cursor.execute('''
-                INSERT INTO jobs (source, title, company, link, job_hash)
-                VALUES (?, ?, ?, ?, ?)
-            ''', (source, title, company, link, job_hash))
-            
-            conn.commit()
-            return True  # Vaga inserida com sucesso
-        except sqlite3.IntegrityError:
-            return False  # Erro de duplicata (não deveria acontecer)
-        finally:
-            conn.close()
-    
-    def get_jobs_count(self, source=None):
-        """Retorna o número de vagas no banco"""
-        conn = sqlite3.connect(self.db_path)
-        cursor = conn.cursor()
-        
-        if source:
-            cursor.execute("SELECT COUNT(*) FROM jobs WHERE source = ?", (source,))
-        else:
-            cursor.execute("SELECT COUNT(*) FROM jobs")
-        
-        count = cursor.fetchone()[0]
-        conn.close()
-        return count
-    
-    def clean_text(self, text):
-        """Limpa e normaliza textos"""
-        if not text:
-            return ""
-        return re.sub(r'\s+', ' ', text.strip())
-    
-    def contains_keywords(self, text, keywords):
-        """Verifica se o texto contém pelo menos uma das palavras-chave como palavras completas"""
-        if not text or not keywords:
-            return False
+    # Áreas de Desenvolvimento
+    "full stack", "backend", "frontend", "mobile",
+    
+    # Data Science & Analytics
+    "data scientist", "cientista de dados", "analista de dados", 
+    "data analyst", "engenheiro de dados", "data engineer",
+    "machine learning", "ml", "deep learning", "ai", 
+    "inteligência artificial", "big data", "analytics",
+    "analista de sistemas", "business intelligence", "bi", "BI",
+    
+    # Bancos de Dados
+    "sql", "postgresql", "mysql", "mongodb", "nosql",
+    "database", "dba", "data warehouse", "snowflake",
+    
+    # Cloud & DevOps (relacionado a dados)
+    "devops", "cloud", "aws", "azure", "gcp", "google cloud", "docker", "kubernetes"
+]
+
+
+class ListingParser:
+    """
+    Parser das páginas de resultados.
+    
+    Usa o backend mais rápido disponível (lxml ou html.parser) e um
+    SoupStrainer para montar só os blocos "informacoes-header", em vez da
+    árvore da página inteira. Recebe os bytes da resposta, sem decodificar antes.
+    """
+    
+    def __init__(self, backend=None):
+        self.backend = backend or DEFAULT_HTML_PARSER
+        self.strainer = SoupStrainer("div", class_="informacoes-header")
+    
+    def parse(self, content):
+        """Retorna os blocos de vaga (div.informacoes-header) da página"""
+        soup = BeautifulSoup(content, self.backend, parse_only=self.strainer)
+        return soup.find_all("div", class_="informacoes-header")
+
+
+def extract_listing(vaga, base_url):
+    """
+    Extrai (id, título, empresa, link) de um bloco div.informacoes-header.
+    
+    O id é o número do link /vagas/vNNNNN (None se não houver); título e
+    empresa ausentes voltam como "Não encontrado" / "Não informado".
+    """
+    title_tag = vaga.find("a", class_="link-detalhes-vaga")
+    company_tag = vaga.find("span", class_="emprVaga")
+    href = title_tag.get("href") if title_tag else None
+    
+    match = re.search(r'/vagas/v(\d+)', href) if href else None
+    listing_id = int(match.group(1)) if match else None
+    title = clean_text(title_tag.get_text()) if title_tag else "Não encontrado"
+    company = clean_text(company_tag.get_text()) if company_tag else "Não informado"
+    link = base_url + href if href else None
+    
+    return listing_id, title, company, link
+
+
+class VagasComAdapter(SourceAdapter):
+    """Páginas de busca do Vagas.com (/vagas-de-<termo>?pagina=<n>)"""
+    
+    name = "Vagas.com"
+    
+    def __init__(self, base_url="https://www.vagas.com.br", html_parser=None):
+        self.base_url = base_url.rstrip('/')
+        self.parser = ListingParser(html_parser)
+    
+    def search_url(self, keyword, page):
+        return f"{self.base_url}/vagas-de-{keyword.replace(' ', '-')}?pagina={page}"
+    
+    def listing_blocks(self, content):
+        return self.parser.parse(content)
+    
+    def extract(self, block):
+        return extract_listing(block, self.base_url)
+    
+    # Blocos da página /vagas/vNNNNN/... com os campos de detalhe
+    DETAIL_SELECTORS = {
+        'description': '.job-description__text',
+        'location': '.info-localizacao',
+        'seniority': '.job-hierarchylist__item--level',
+        'salary': '.info-salario',
+        'posted_at': '.job-breadcrumb__item--published',
+    }
+    DETAIL_STRAINER = SoupStrainer(class_=re.compile(r'^(job-|info-)'))
+    
+    def parse_detail(self, content):
+        soup = BeautifulSoup(content, self.parser.backend, parse_only=self.DETAIL_STRAINER)
         
-        text_lower = text.lower()
+        details = {}
+        for field, selector in self.DETAIL_SELECTORS.items():
+            tag = soup.select_one(selector)
+            details[field] = clean_text(tag.get_text(" ")) if tag else None
         
-        for keyword in keywords:
-            keyword_lower = keyword.lower().strip()
-            
-            # Para palavras de 1-2 caracteres (como "TI", "IA"), usa busca mais rigorosa
-            if len(keyword_lower) <= 2:
-                # Usa regex para buscar palavra completa com delimitadores
-                pattern = r'\b' + re.escape(keyword_lower) + r'\b'
-                if re.search(pattern, text_lower):
-                    return True
-            else:
-                # Para palavras maiores, mantém a busca simples mas com espaços
-                # Verifica se a palavra aparece isolada ou com espaços/pontuação
-                pattern = r'(?<!\w)' + re.escape(keyword_lower) + r'(?!\w)'
-                if re.search(pattern, text_lower):
-                    return True
+        # "Publicada em 17/10/2026" -> "2026-10-17"
+        if details['posted_at']:
+            match = re.search(r'(\d{2})/(\d{2})/(\d{4})', details['posted_at'])
+            details['posted_at'] = f"{match.group(3)}-{match.group(2)}-{match.group(1)}" if match else None
         
-        return False
+        return details
+
+
+class JobScraper(JobPipeline):
+    """JobPipeline com o Vagas.com sempre entre os sites da coleta"""
     
-    def scrape_vagas(self, keywords, pages=1):
+    def __init__(self, db_path="jobs.db", base_url="https://www.vagas.com.br", http_client=None,
+                 html_parser=None, cache_dir=None, sources=None, **options):
+        """
+        Args:
+            base_url: endereço do Vagas.com (um stub local, nos benchmarks)
+            html_parser: "lxml" ou "html.parser" (padrão: o mais rápido disponível)
+            sources: outros sites (SourceAdapter) coletados junto com o Vagas.com
+            options: repassados a JobPipeline (verbosity, metrics_file,
+                near_duplicate_threshold, resume_max_age)
+        """
+        self.base_url = base_url.rstrip('/')
+        vagas = VagasComAdapter(self.base_url, html_parser)
+        super().__init__(db_path, http_client, cache_dir, [vagas] + list(sources or []), **options)
+        self.parser = vagas.parser
+    
+    def scrape_vagas(self, keywords, pages=1, concurrency=1, per_host_limit=None, incremental=False,
+                     resume=False):
         """
         Scraper do Vagas.com com filtros por palavras-chave
         
         Args:
             keywords: string ou lista de palavras-chave para filtrar
             pages: número de páginas para percorrer
+            concurrency: número máximo de páginas baixadas ao mesmo tempo (1 = modo serial)
+            per_host_limit: máximo de requisições simultâneas por host (padrão: igual a concurrency)
+            incremental: para de paginar uma palavra-chave na primeira página só com vagas
+                já vistas em execuções anteriores
+            resume: retoma a última coleta interrompida com os mesmos parâmetros,
+                pulando as páginas já gravadas (veja scrape)
         """
-        # Converte keywords para lista se for string
-        if isinstance(keywords, str):
-            keywords = [keywords]
-        
-        # Remove espaços e converte para minúsculo
-        keywords = [k.strip().lower() for k in keywords if k.strip()]
-        
-        if not keywords:
-            print("❌ Nenhuma palavra-chave válida fornecida!")
-            return {'saved': 0, 'duplicates': 0, 'errors': 0, 'filtered': 0, 'total': 0}
-        
-        saved = 0
-        duplicates = 0
-        errors = 0
-        filtered_out = 0
-        
-        print(f"[Vagas.com] Iniciando scraping com filtros: {', '.join(keywords)}")
-        print(f"[Vagas.com] Fazendo busca para cada palavra-chave - {pages} página(s) cada")
-        
-        # 🔄 BUSCA POR CADA PALAVRA-CHAVE
-        for keyword_index, keyword in enumerate(keywords, 1):
-            search_term = keyword.replace(' ', '-')
-            print(f"\n🔍 [{keyword_index}/{len(keywords)}] Buscando por: '{keyword}'")
-            
-            for page in range(1, pages + 1):
-                try:
-                    url = f"https://www.vagas.com.br/vagas-de-{search_term}?pagina={page}"
-                    print(f"  📄 Página {page}...")
-                    
-                    headers = {
-                        'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36'
-                    }
-                    
-                    r = requests.get(url, headers=headers, timeout=10)
-                    r.raise_for_status()
-                    
-                    soup = BeautifulSoup(r.text, "html.parser")
-                    resultados = soup.find_all("div", class_="informacoes-header")
-                    
-                    if not resultados:
-                        print(f"    ℹ️ Nenhuma vaga encontrada na página {page}")
-                        continue
-                    
-                    for vaga in resultados:
-                        try:
-                            title_tag = vaga.find("a", class_="link-detalhes-vaga")
-                            company_tag = vaga.find("span", class_="emprVaga")
-                            
-                            title = self.clean_text(title_tag.get_text()) if title_tag else "Não encontrado"
-                            company = self.clean_text(company_tag.get_text()) if company_tag else "Não informado"
-                            link = "https://www.vagas.com.br" + title_tag["href"] if title_tag and title_tag.get("href") else None
-                            
-                            # Pula vagas sem informações essenciais
-                            if title == "Não encontrado" or company == "Não informado":
-                                continue
-                            
-                            # 🔍 FILTRO: Verifica se contém alguma palavra-chave no título
-                            if not self.contains_keywords(title, keywords):
-                                filtered_out += 1
-                                print(f"    🚫 Filtrada: {title} - {company}")
-                                continue
-                            
-                            # Tenta inserir a vaga (só passa pelo filtro)
-                            if self.insert_job("Vagas.com", title, company, link):
-                                saved += 1
-                                print(f"    ✅ Nova vaga: {title} - {company}")
-                            else:
-                                duplicates += 1
-                                print(f"    ⚠️ Duplicata: {title} - {company}")
-                        
-                        except Exception as e:
-                            errors += 1
-                            print(f"    ❌ Erro ao processar vaga: {e}")
-                
-                except requests.RequestException as e:
-                    print(f"    🌐 Erro na página {page}: {e}")
-                    errors += 1
-                
-                except Exception as e:
-                    print(f"    ⚠️ Erro inesperado na página {page}: {e}")
-                    errors += 1
-        
-        total_jobs = self.get_jobs_count("Vagas.com")
-        
-        print(f"\n📊 [Vagas.com] Resumo Final:")
-        print(f"  • Palavras-chave usadas: {', '.join(keywords)}")
-        print(f"  • Vagas novas salvas: {saved}")
-        print(f"  • Duplicatas ignoradas: {duplicates}")
-        print(f"  • Vagas filtradas (sem palavra-chave): {filtered_out}")
-        print(f"  • Erros encontrados: {errors}")
-        print(f"  • Total de vagas no banco (Vagas.com): {total_jobs}")
-        
-        return {
-            'saved': saved,
-            'duplicates': duplicates,
-            'errors': errors,
-            'filtered': filtered_out,
-            'total': total_jobs
-        }
-    
-    def export_to_csv(self, filename="vagas_export.csv"):
-        """Exporta todas as vagas para CSV"""
-        import csv
-        
-        conn = sqlite3.connect(self.db_path)
-        cursor = conn.cursor()
-        
-        cursor.execute('''
-            SELECT source, title, company, link, created_at 
-            FROM jobs 
-            ORDER BY created_at DESC
-        ''')
-        
-        rows = cursor.fetchall()
-        conn.close()
-        
-        with open(filename, 'w', newline='', encoding='utf-8') as file:
-            writer = csv.writer(file)
-            writer.writerow(['Fonte', 'Título', 'Empresa', 'Link', 'Data'])
-            writer.writerows(rows)
-        
-        print(f"📄 Dados exportados para {filename}")
-    
-    def search_jobs(self, keyword, source=None):
-        """Busca vagas por palavra-chave"""
-        conn = sqlite3.connect(self.db_path)
-        cursor = conn.cursor()
-        
-        query = "SELECT * FROM jobs WHERE (title LIKE ? OR company LIKE ?)"
-        params = [f"%{keyword}%", f"%{keyword}%"]
-        
-        if source:
-            query += " AND source = ?"
-            params.append(source)
-        
-        query += " ORDER BY created_at DESC"
-        
-        cursor.execute(query, params)
-        results = cursor.fetchall()
-        conn.close()
-        
-        return results
+        return self.scrape(keywords, pages, concurrency, per_host_limit, incremental,
+                           sources=[VagasComAdapter.name], resume=resume)
     
-    def clear_database(self):
-        """Limpa todas as vagas do banco (útil para testes)"""
-        conn = sqlite3.connect(self.db_path)
-        cursor = conn.cursor()
-        
-        cursor.execute("DELETE FROM jobs")
-        conn.commit()
-        conn.close()
+    def scrape_vagas_parallel(self, keywords, pages=1, workers=4, incremental=False, resume=False):
+        """
+        Scraper do Vagas.com com o download e o parsing espalhados em vários processos.
         
-        print("🗑️ Banco de dados limpo!")
+        Args:
+            keywords: string ou lista de palavras-chave para filtrar
+            pages: número de páginas para percorrer
+            workers: número de processos
+            incremental: para de paginar uma palavra-chave na primeira página só com vagas
+                já vistas em execuções anteriores
+            resume: retoma a última coleta interrompida com os mesmos parâmetros,
+                pulando as páginas já gravadas (veja scrape)
+        """
+        return self.scrape_parallel(keywords, pages, workers, incremental, sources=[VagasComAdapter.name],
+                                    resume=resume)
 
 # -------- Exemplo de uso --------
 if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Coleta vagas de Dados e Programação do Vagas.com")
+    parser.add_argument('--daemon', action='store_true',
+                        help="recoleta cada palavra-chave no seu próprio intervalo até Ctrl+C")
+    parser.add_argument('--pages', type=int, default=10, help="páginas por busca (padrão: 10)")
+    parser.add_argument('--concurrency', type=int, default=8,
+                        help="downloads simultâneos no modo daemon (padrão: 8)")
+    parser.add_argument('--verbosity', type=int, choices=(0, 1, 2), default=2,
+                        help="0 = só avisos e o resumo, 1 = andamento por página, 2 = uma linha por vaga (padrão)")
+    args = parser.parse_args()
+    configure_logging(args.verbosity)
+    
     # Inicializa o scraper
+    # (metrics_file="metricas.jsonl"
+    # guarda os tempos por etapa de cada execução; near_duplicate_threshold=0.7 agrupa
+    # como quase-duplicatas títulos menos parecidos da mesma empresa)
     scraper = JobScraper()
+    keywords = DEFAULT_KEYWORDS
+    
+    if args.daemon:
+        # Daemon que recoleta cada palavra-chave no seu próprio intervalo, mais vezes
+        # as que trazem vagas novas (Ctrl+C encerra; a agenda fica no banco)
+        CrawlScheduler(scraper, keywords, pages=args.pages, concurrency=args.concurrency).run_forever()
+        scraper.close()
+        sys.exit(0)
     
     # Opção 1: Uma palavra-chave
     # result = scraper.scrape_vagas("programador", pages=3)
     
     # Opção 2: Múltiplas palavras-chave focadas em Dados e Programação
-    keywords = [
-        # Programação Geral
-        "programador", "desenvolvedor", "TI", "tecnologia", "it", "IT", "ti", "tecnologia da informação",
-        "sistemas", "engenheiro de software", "dados", "inteligência de dados", "data",
-        
-        # Linguagens de Programação
-        "python", "java", "javascript", "c++", "c#", "react", "angular", "node", "laravel", "django",
-        
-        # Áreas de Desenvolvimento
-        "full stack", "backend", "frontend", "mobile",
-        
-        # Data Science & Analytics
-        "data scientist", "cientista de dados", "analista de dados", 
-        "data analyst", "engenheiro de dados", "data engineer",
-        "machine learning", "ml", "deep learning", "ai", 
-        "inteligência artificial", "big data", "analytics",
-        "analista de sistemas", "business intelligence", "bi", "BI",
-        
-        # Bancos de Dados
-        "sql", "postgresql", "mysql", "mongodb", "nosql",
-        "database", "dba", "data warehouse", "snowflake",
-        
-        # Cloud & DevOps (relacionado a dados)
-        "devops", "cloud", "aws", "azure", "gcp", "google cloud", "docker", "kubernetes"
-    ]
-    result = scraper.scrape_vagas(keywords, pages=10)
+    # (resume=True: se a coleta anterior caiu no meio há menos de 12 h, continua de
+    # onde ela parou; a idade máxima é o resume_max_age do JobScraper)
+    result = scraper.scrape_vagas(keywords, pages=args.pages, resume=True)
+    
+    # Opção 3: Recoleta diária, parando cada busca na primeira página já conhecida
+    # (com JobScraper(cache_dir="http_cache"), páginas sem alterações nem são processadas)
+    # result = scraper.scrape_vagas(keywords, pages=10, concurrency=8, incremental=True)
+    
+    # Opção 4: Coletas grandes, com o parsing espalhado em vários processos
+    # result = scraper.scrape_vagas_parallel(keywords, pages=10, workers=4)
+    
+    # Opção 5: Vários sites na mesma coleta (JobScraper(sources=[OutroSiteAdapter()]),
+    # com OutroSiteAdapter sendo uma subclasse de SourceAdapter)
+    # result = scraper.scrape(keywords, pages=10, concurrency=8)
+    
+    # Opção 6: Daemon com agenda por palavra-chave: python scrapers/vagas_scraper.py --daemon
+    
+    # Busca a página de detalhe (descrição, local, nível, salário, data) das vagas novas
+    # (opcional: uma requisição a mais por vaga, limitada a rate_limit páginas por segundo)
+    # scraper.enrich_details(concurrency=4, rate_limit=2.0)
+    
+    # Exporta para CSV só as vagas novas desde a última exportação (opcional)
+    # (use scraper.export_to_csv("minhas_vagas.csv") para reescrever o arquivo inteiro)
+    scraper.export_incremental("minhas_vagas.csv")
     
-    # Exporta para CSV (opcional)
-    scraper.export_to_csv("minhas_vagas.csv")
\ No newline at end of file
+    scraper.close()